@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Electron应用扫描结果的列式二进制格式读取
+
+find_electron_apps.py --columnar-file 导出的文件按字段分列存储，每列有固定类型，
+应用名称、版本、路径等字符串统一放在去重后的字符串表中。文件通过 mmap 打开，
+只读取用到的列，不需要解析整个文件。
+
+文件布局（小端序）：
+- 文件头: 魔数 b'EACF'、格式版本、保留字段、行数、列数、字符串数、字符串表偏移
+- 列目录: 每列的名称（字符串表序号）、类型、是否包含空值、数据偏移、数据长度
+- 列数据: 每列按 8 字节对齐；包含空值的列先存一段有效位图（1 表示有值），再存定长数值
+- 字符串表: (字符串数 + 1) 个 uint32 偏移，之后是 UTF-8 编码的字符串内容
+"""
+
+import array
+import json
+import mmap
+import struct
+import sys
+
+COLUMNAR_MAGIC = b'EACF'
+COLUMNAR_SCHEMA_VERSION = 1
+COLUMNAR_HEADER = struct.Struct('<4sHHIIIQ')   # 魔数、格式版本、保留、行数、列数、字符串数、字符串表偏移
+COLUMNAR_COLUMN = struct.Struct('<IBB2xQQ')    # 列名序号、类型、是否有空值、数据偏移、数据长度
+
+# 列类型 -> 每个值的 array 类型码
+COLUMN_BOOL = 1     # uint8
+COLUMN_INT = 2      # int64
+COLUMN_FLOAT = 3    # float64
+COLUMN_STRING = 4   # uint32 字符串表序号
+COLUMN_JSON = 5     # uint32 字符串表序号，内容为 JSON 编码的值（如按角色汇总的字典）
+COLUMN_TYPECODES = {
+    COLUMN_BOOL: 'B',
+    COLUMN_INT: 'q',
+    COLUMN_FLOAT: 'd',
+    COLUMN_STRING: 'I',
+    COLUMN_JSON: 'I',
+}
+
+
+def is_columnar_file(path):
+    """判断文件是否为列式导出文件（只读取文件开头的魔数）"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(COLUMNAR_MAGIC)) == COLUMNAR_MAGIC
+    except OSError:
+        return False
+
+
+class ColumnarFile:
+    """列式导出文件的只读视图"""
+
+    def __init__(self, path):
+        """
+        参数:
+            path: 列式导出文件路径
+
+        异常:
+            ValueError: 文件不是列式导出文件、格式版本比当前读取代码更新，或文件被截断、损坏
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._read_layout()
+        except (struct.error, IndexError, OverflowError) as e:
+            self._mm.close()
+            raise ValueError(f"列式导出文件已损坏: {path} ({e})") from e
+        except ValueError:
+            self._mm.close()
+            raise
+
+    def _read_layout(self):
+        """读取并校验文件头、字符串表和列目录，所有偏移都必须落在文件范围内"""
+        size = len(self._mm)
+        if size < COLUMNAR_HEADER.size:
+            raise ValueError(f"文件过短，不是列式导出文件: {self.path}")
+        magic, version, _, rows, columns, string_count, string_offset = COLUMNAR_HEADER.unpack_from(self._mm, 0)
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f"不是列式导出文件: {self.path}")
+        if version > COLUMNAR_SCHEMA_VERSION:
+            raise ValueError(f"不支持的列式格式版本 {version}（当前支持到 {COLUMNAR_SCHEMA_VERSION}）")
+
+        directory_end = COLUMNAR_HEADER.size + columns * COLUMNAR_COLUMN.size
+        string_base = string_offset + (string_count + 1) * 4
+        if directory_end > size or string_offset < directory_end or string_base > size:
+            raise ValueError(f"列式导出文件已截断: {self.path}")
+
+        self.version = version
+        self.rows = rows
+        self._string_count = string_count
+        self._string_base = string_base
+        self._string_offsets = self._array('I', string_offset, (string_count + 1) * 4)
+        self._strings = {}
+        offsets = self._string_offsets
+        if offsets[0] != 0 or string_base + offsets[-1] > size or \
+                any(offsets[i] > offsets[i + 1] for i in range(string_count)):
+            raise ValueError(f"列式导出文件的字符串表已损坏: {self.path}")
+
+        self._columns = {}
+        position = COLUMNAR_HEADER.size
+        for _ in range(columns):
+            name_id, column_type, has_nulls, offset, length = COLUMNAR_COLUMN.unpack_from(self._mm, position)
+            typecode = COLUMN_TYPECODES.get(column_type)
+            if typecode is None:
+                raise ValueError(f"列式导出文件包含未知的列类型 {column_type}: {self.path}")
+            # 列数据至少要容纳有效位图（按 8 字节对齐）和 行数 × 值宽度 的数值
+            needed = rows * array.array(typecode).itemsize
+            if has_nulls:
+                needed += ((rows + 7) // 8 + 7) & ~7
+            if length < needed or offset < directory_end or offset + length > string_offset:
+                raise ValueError(f"列式导出文件的列数据越界: {self.path}")
+            self._columns[self.string(name_id)] = (column_type, bool(has_nulls), offset, length)
+            position += COLUMNAR_COLUMN.size
+
+    @property
+    def columns(self):
+        """按写入顺序返回所有列名"""
+        return list(self._columns)
+
+    def _array(self, typecode, offset, length):
+        """把文件中的一段定长数值复制为 array，并转换为本机字节序"""
+        values = array.array(typecode)
+        values.frombytes(self._mm[offset:offset + length])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def string(self, index):
+        """按序号读取字符串表中的字符串，读取过的字符串会被缓存"""
+        value = self._strings.get(index)
+        if value is None:
+            if index >= self._string_count:
+                raise ValueError(f"字符串序号 {index} 超出字符串表范围: {self.path}")
+            start = self._string_base + self._string_offsets[index]
+            end = self._string_base + self._string_offsets[index + 1]
+            value = self._strings[index] = self._mm[start:end].decode('utf-8')
+        return value
+
+    def column(self, name):
+        """
+        读取一列
+
+        参数:
+            name: 列名
+
+        返回:
+            list: 该列每一行的值，空值为 None
+        """
+        column_type, has_nulls, offset, _ = self._columns[name]
+        valid = None
+        if has_nulls:
+            bitmap_size = (self.rows + 7) // 8
+            valid = self._mm[offset:offset + bitmap_size]
+            offset += (bitmap_size + 7) & ~7
+
+        # 列数据末尾按 8 字节补齐，只读取 行数 × 值宽度 的部分
+        typecode = COLUMN_TYPECODES[column_type]
+        values = self._array(typecode, offset, self.rows * array.array(typecode).itemsize).tolist()
+        if column_type == COLUMN_BOOL:
+            values = [bool(value) for value in values]
+        elif column_type == COLUMN_STRING:
+            values = [self.string(value) for value in values]
+        elif column_type == COLUMN_JSON:
+            values = [json.loads(self.string(value)) for value in values]
+
+        if valid is not None:
+            values = [value if valid[row >> 3] & (1 << (row & 7)) else None for row, value in enumerate(values)]
+        return values
+
+    def records(self, columns=None):
+        """
+        按行组装记录
+
+        参数:
+            columns: 只读取这些列，默认读取全部列
+
+        返回:
+            list: 与 JSON 导出相同结构的字典列表；某行原本没有的字段为 None
+        """
+        names = list(columns) if columns is not None else self.columns
+        data = [self.column(name) for name in names]
+        return [dict(zip(names, row)) for row in zip(*data)] if names else [{} for _ in range(self.rows)]
+
+    def close(self):
+        """关闭文件映射"""
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def load_columnar(path, columns=None):
+    """
+    读取列式导出文件中的全部记录
+
+    参数:
+        path: 列式导出文件路径
+        columns: 只读取这些列，默认读取全部列
+
+    返回:
+        list: 应用信息字典列表
+    """
+    with ColumnarFile(path) as data:
+        return data.records(columns)
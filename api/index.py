@@ -12,6 +12,12 @@ from flask import Flask, request, jsonify, render_template, send_from_directory
 from werkzeug.utils import secure_filename
 import tempfile
 
+try:
+    from columnar import is_columnar_file, load_columnar
+except ImportError:
+    # 作为 api 包的模块导入时
+    from .columnar import is_columnar_file, load_columnar
+
 app = Flask(__name__)
 
 # 默认演示数据文件路径
@@ -94,6 +100,13 @@ def init_demo_data():
         with open(DEMO_DATA_FILE, 'w', encoding='utf-8') as f:
             json.dump(demo_data, f, ensure_ascii=False, indent=2)
 
+# 读取数据文件（JSON 或列式导出文件）
+def read_data_file(path):
+    if is_columnar_file(path):
+        return load_columnar(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 # 读取JSON数据
 def load_data():
     # 优先使用用户上传的数据，否则使用演示数据
@@ -103,9 +116,8 @@ def load_data():
         json_file = DEMO_DATA_FILE
     
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        return read_data_file(json_file)
+    except (FileNotFoundError, ValueError):
         if json_file != DEMO_DATA_FILE:
             # 如果用户文件有问题，尝试使用演示数据
             try:
@@ -156,6 +168,11 @@ def memory_chart():
         'avg_memory': sum(memory_values) / len(memory_values) if memory_values else 0,
     }
     
+    # 使用 --pss 导出的数据同时提供 PSS 和 USS（未采集到的应用为 null）
+    for field, key in (('memory_pss_mb', 'pss_usage'), ('memory_uss_mb', 'uss_usage')):
+        if any(app.get(field) is not None for app in running_apps):
+            chart_data[key] = [app.get(field) for app in running_apps]
+    
     return jsonify(chart_data)
 
 # API路由 - 获取CPU使用图表数据
@@ -247,20 +264,19 @@ def upload_file():
     if file.filename == '':
         return jsonify({"error": "没有选择文件"}), 400
         
-    if file and file.filename.endswith('.json'):
+    if file and file.filename.endswith(('.json', '.eac')):
         filename = secure_filename(file.filename)
         file.save(USER_DATA_FILE)
         
-        # 验证JSON格式
+        # 验证文件格式（JSON 或列式导出文件）
         try:
-            with open(USER_DATA_FILE, 'r', encoding='utf-8') as f:
-                json.load(f)
+            read_data_file(USER_DATA_FILE)
             return jsonify({"message": "文件上传成功"}), 200
-        except json.JSONDecodeError:
+        except ValueError:
             os.remove(USER_DATA_FILE)
-            return jsonify({"error": "无效的JSON格式"}), 400
+            return jsonify({"error": "无效的JSON或列式文件格式"}), 400
     
-    return jsonify({"error": "只允许上传JSON文件"}), 400
+    return jsonify({"error": "只允许上传JSON或列式导出（.eac）文件"}), 400
 
 # 初始化演示数据
 init_demo_data()
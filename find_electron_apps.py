@@ -40,16 +40,31 @@
 9. 设置多线程处理：
    python find_electron_apps.py --workers 16
 
+10. 合并多台机器的导出结果，生成机群汇总：
+   python find_electron_apps.py merge exports/ -o fleet.json
+
 常用参数说明：
 --------------
 --memory       : 分析内存使用情况
 --performance  : 分析CPU使用率和能耗
 --ratio        : 显示内存/大小比例
+--pss          : 采集 PSS/USS，按比例分摊共享内存
 --sort         : 结果排序方式（name, size, version, memory, cpu）
 --top          : 只显示前N个应用
 --directories  : 要扫描的目录，默认为系统应用目录
+--max-depth    : 查找应用包的最大目录深度
+--exclude      : 跳过匹配通配符的目录
 --json-file    : 导出结果到指定的JSON文件
+--ndjson-file  : 扫描过程中逐条写入结果的NDJSON文件（分析内存、性能或监控时，结束后再写入补充后的结果）
+--export-index : 导出时额外写入排序索引
+--columnar-file: 导出为列式二进制文件
 --workers      : 同时处理的最大线程数量
+--executor     : 执行方式（thread, process, hybrid）
+--cpu-mode     : CPU采样方式（interval 共享采样间隔，delta 零等待）
+--no-cache     : 不使用增量扫描缓存
+--probe-report : 显示各检测探针的命中率和耗时
+--telemetry    : 显示各扫描阶段的耗时和最慢的应用
+--monitor      : 扫描完成后持续监控应用的内存和CPU
 
 更多详细参数请使用 --help 参数查看。
 """
@@ -57,15 +72,33 @@
 import os
 import sys
 import argparse
+import array
+import asyncio
+import bisect
+import contextlib
+import fnmatch
 import platform
 import plistlib
+import queue
 import subprocess
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import time
 import re
 import json
+import locale
+import mmap
+import multiprocessing
+import shlex
 import shutil
+import signal
+import sqlite3
+import struct
+import threading
+
+# 列式导出格式的常量与读取端共用同一份定义
+from api.columnar import (COLUMNAR_MAGIC, COLUMNAR_SCHEMA_VERSION, COLUMNAR_HEADER, COLUMNAR_COLUMN,
+                          COLUMN_BOOL, COLUMN_INT, COLUMN_FLOAT, COLUMN_STRING, COLUMN_JSON)
 
 # 平台检测
 IS_WINDOWS = platform.system() == 'Windows'
@@ -78,10 +111,12 @@ try:
     HAS_PSUTIL = True
 except ImportError:
     HAS_PSUTIL = False
-    print("提示: 未安装 psutil 库，某些性能分析功能将受限。")
-    print("      可以通过运行以下命令安装它: pip install psutil")
-    print("      如果使用 conda 环境，可以运行: conda install psutil")
-    print("-" * 80)
+    # 进程池的子进程会重新导入本模块，只在主进程中提示，避免与进度条交错输出
+    if multiprocessing.current_process().name == 'MainProcess':
+        print("提示: 未安装 psutil 库，某些性能分析功能将受限。")
+        print("      可以通过运行以下命令安装它: pip install psutil")
+        print("      如果使用 conda 环境，可以运行: conda install psutil")
+        print("-" * 80)
 
 # 默认扫描目录
 if IS_WINDOWS:
@@ -104,6 +139,28 @@ else:  # Linux或其他系统
         os.path.expanduser('~/.local/share/applications'),
     ]
 
+# 计算目录大小时的并行参数
+SIZE_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+SIZE_FANOUT_DEPTH = 3
+HAS_ST_BLOCKS = hasattr(os.stat_result, 'st_blocks')
+_size_executor = None
+_size_executor_lock = threading.Lock()
+
+# Linux 上进程信息的来源目录（可指向构造的 proc 目录树用于测试）
+PROC_ROOT = '/proc'
+
+# 是否采集按比例分摊共享内存后的 PSS 和进程独占的 USS
+COLLECT_PSS = False
+
+# 增量扫描缓存的默认位置
+if IS_WINDOWS:
+    DEFAULT_CACHE_DIR = os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'electron_apps')
+elif IS_MACOS:
+    DEFAULT_CACHE_DIR = os.path.expanduser('~/Library/Caches/electron_apps')
+else:
+    DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'electron_apps')
+DEFAULT_CACHE_FILE = os.path.join(DEFAULT_CACHE_DIR, 'scan_cache.json')
+
 # Electron 应用的特征标记
 ELECTRON_MARKERS_MACOS = [
     'Electron Framework.framework',
@@ -123,11 +180,504 @@ ELECTRON_MARKERS_WINDOWS = [
 # 根据平台选择标记
 ELECTRON_MARKERS = ELECTRON_MARKERS_MACOS if IS_MACOS else ELECTRON_MARKERS_WINDOWS
 
+# 已知的 Electron 应用目录名称（小写）
+WINDOWS_KNOWN_ELECTRON_APPS = [
+    'visual studio code', 'vscode', 'code',  # VSCode
+    'slack',                                  # Slack
+    'discord',                                # Discord
+    'figma',                                  # Figma
+    'microsoft teams',                        # Microsoft Teams
+    'postman',                                # Postman
+    'notion',                                 # Notion
+    'obsidian',                               # Obsidian
+    'spotify',                                # Spotify
+    'whatsapp',                               # WhatsApp
+    'zoom',                                   # Zoom
+    'cursor',                                 # Cursor Editor
+    'vscodium',                               # VSCodium
+]
+
+# 可执行文件中的 Electron 特征字符串
+EXE_ELECTRON_MARKERS = (b'Electron', b'electron.asar', b'app.asar')
+
+# 在二进制文件中查找特征字符串时每次读取的块大小，以及每个文件最多读取的字节数（None 表示不限制）
+MARKER_CHUNK_SIZE = 1024 * 1024
+MARKER_BYTE_BUDGET = None
+
 # 存储结果的全局变量
 electron_apps = []
 apps_count = 0
 processed_count = 0
 
+# 外部命令的超时（秒），按命令名区分；sudo 按其后的实际命令计算
+COMMAND_TIMEOUTS = {
+    'wmic': 3,
+    'powermetrics': 3,
+    'top': 5,
+    'strings': 10,
+    'ps': 10,
+    'tasklist': 10,
+}
+DEFAULT_COMMAND_TIMEOUT = 10
+
+# 同时运行的外部命令数量上限，可通过命令行参数修改
+MAX_SUBPROCESSES = max(2, min(8, os.cpu_count() or 1))
+
+class CommandRunner:
+    """
+    异步外部命令执行层
+
+    在一个后台线程的 asyncio 事件循环中运行所有外部命令，扫描线程通过 run() 同步等待结果：
+    - 用信号量限制同时运行的子进程数量
+    - 按命令名使用不同的超时，超时的子进程会被杀掉（POSIX 上连同它启动的整个进程组）
+    - 正在运行的相同命令只启动一次，结果由所有调用方共享
+    - 设置扫描截止时间后，到期时取消所有未完成的命令，之后的命令直接超时
+    """
+
+    def __init__(self, max_concurrent=None, timeouts=None):
+        """
+        参数:
+            max_concurrent: 同时运行的子进程数量上限，默认为 MAX_SUBPROCESSES
+            timeouts: 覆盖 COMMAND_TIMEOUTS 中的超时设置
+        """
+        self.max_concurrent = max_concurrent or MAX_SUBPROCESSES
+        self.timeouts = dict(COMMAND_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.started = 0
+        self.deduplicated = 0
+        self.timed_out = 0
+        self.cancelled = 0
+
+        self._inflight = {}
+        self._deadline = None
+        self._semaphore = None
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,), name='command-runner', daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run_loop(self, ready):
+        """后台线程：运行事件循环"""
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def timeout_for(self, cmd):
+        """返回命令对应的超时时间"""
+        name = os.path.splitext(os.path.basename(cmd[0]))[0].lower()
+        if name == 'sudo' and len(cmd) > 1:
+            name = os.path.splitext(os.path.basename(cmd[1]))[0].lower()
+        return self.timeouts.get(name, DEFAULT_COMMAND_TIMEOUT)
+
+    def run(self, cmd, timeout=None):
+        """
+        运行外部命令并等待结果
+
+        参数:
+            cmd: 命令及参数列表
+            timeout: 超时时间（秒），为 None 时按命令名从 timeouts 中选择
+
+        返回:
+            subprocess.CompletedProcess: 命令结果，stdout 和 stderr 为文本
+
+        异常:
+            subprocess.TimeoutExpired: 命令超时，或因扫描截止时间到期被取消
+            OSError: 命令不存在或无法启动
+        """
+        cmd = [str(arg) for arg in cmd]
+        if timeout is None:
+            timeout = self.timeout_for(cmd)
+        future = asyncio.run_coroutine_threadsafe(self._submit(tuple(cmd), timeout), self._loop)
+        returncode, stdout, stderr = future.result()
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    def set_deadline(self, seconds):
+        """
+        设置扫描截止时间
+
+        参数:
+            seconds: 从现在起的秒数，到期后取消所有未完成的命令
+        """
+        # 截止时间立即生效（remaining 可以马上读到），取消回调交给事件循环线程登记
+        self._deadline = self._loop.time() + seconds
+        self._loop.call_soon_threadsafe(self._loop.call_at, self._deadline, self._cancel_inflight)
+
+    def remaining(self):
+        """距截止时间的剩余秒数，没有设置截止时间时返回 None"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - self._loop.time())
+
+    def _cancel_inflight(self):
+        """截止时间到期：取消所有未完成的命令"""
+        for task in list(self._inflight.values()):
+            task.cancel()
+
+    async def _submit(self, key, timeout):
+        """合并相同的正在运行的命令"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._loop.create_task(self._execute(key, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None)
+                                   if self._inflight.get(key) is done else None)
+        else:
+            self.deduplicated += 1
+
+        try:
+            # shield: 单个调用方被取消时不影响共享同一命令的其他调用方
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise subprocess.TimeoutExpired(list(key), timeout)
+
+    async def _execute(self, key, timeout):
+        """在信号量限制下启动子进程并等待输出"""
+        if self._deadline is not None and self._loop.time() >= self._deadline:
+            self.cancelled += 1
+            raise subprocess.TimeoutExpired(list(key), 0)
+
+        async with self._semaphore:
+            # 子进程单独成组，超时时连同它的子进程一起杀掉；否则继承了输出管道的孙进程会让等待一直阻塞
+            proc = await asyncio.create_subprocess_exec(*key, stdin=asyncio.subprocess.DEVNULL,
+                                                        stdout=asyncio.subprocess.PIPE,
+                                                        stderr=asyncio.subprocess.PIPE,
+                                                        start_new_session=not IS_WINDOWS)
+            self.started += 1
+
+            limit = timeout
+            if self._deadline is not None:
+                limit = min(limit, max(0.0, self._deadline - self._loop.time()))
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), limit)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                try:
+                    if IS_WINDOWS:
+                        proc.kill()
+                    else:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timed_out += 1
+                    raise subprocess.TimeoutExpired(list(key), timeout)
+                self.cancelled += 1
+                raise
+
+        return proc.returncode, self._decode(stdout), self._decode(stderr)
+
+    @staticmethod
+    def _decode(data):
+        """按系统默认编码把输出解码为文本（与 subprocess 的 text=True 一致）"""
+        text = data.decode(locale.getpreferredencoding(False), errors='replace')
+        return text.replace('\r\n', '\n')
+
+    def close(self):
+        """停止事件循环"""
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+_command_runner = None
+_command_runner_lock = threading.Lock()
+
+def get_command_runner():
+    """返回进程内共享的 CommandRunner，首次调用时创建"""
+    global _command_runner
+    with _command_runner_lock:
+        if _command_runner is None:
+            _command_runner = CommandRunner()
+        return _command_runner
+
+def run_command(cmd, timeout=None):
+    """
+    通过共享的 CommandRunner 运行外部命令
+
+    参数:
+        cmd: 命令及参数列表
+        timeout: 超时时间（秒），为 None 时按命令名选择
+
+    返回:
+        subprocess.CompletedProcess: 命令结果
+    """
+    return get_command_runner().run(cmd, timeout)
+
+_marker_patterns = {}
+
+def _marker_pattern(markers):
+    """把多个特征字符串编译为一个正则表达式，只需一次扫描即可同时查找"""
+    pattern = _marker_patterns.get(markers)
+    if pattern is None:
+        pattern = re.compile(b'|'.join(re.escape(marker) for marker in markers))
+        _marker_patterns[markers] = pattern
+    return pattern
+
+def find_markers_in_file(path, markers, byte_budget=None, chunk_size=MARKER_CHUNK_SIZE):
+    """
+    在文件中流式查找多个特征字符串
+
+    按固定大小分块读取，相邻块之间保留 (最长特征长度 - 1) 字节的重叠，
+    保证跨块的特征也能被找到。找到第一个特征后立即停止，内存占用与文件大小无关。
+
+    参数:
+        path: 文件路径
+        markers: 要查找的特征字符串（bytes）序列
+        byte_budget: 最多读取的字节数，None 表示读取整个文件
+        chunk_size: 每次读取的块大小
+
+    返回:
+        bytes or None: 找到的第一个特征字符串，没有找到时返回 None
+    """
+    markers = tuple(markers)
+    pattern = _marker_pattern(markers)
+    overlap = max(len(marker) for marker in markers) - 1
+    bytes_read = 0
+    tail = b''
+
+    with open(path, 'rb') as f:
+        while True:
+            size = chunk_size
+            if byte_budget is not None:
+                size = min(size, byte_budget - bytes_read)
+                if size <= 0:
+                    break
+
+            chunk = f.read(size)
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+
+            buffer = tail + chunk
+            match = pattern.search(buffer)
+            if match:
+                return match.group(0)
+            tail = buffer[-overlap:] if overlap > 0 else b''
+
+    return None
+
+class DetectionProbe:
+    """
+    单个 Electron 检测探针
+
+    每个探针声明自己的相对开销，并记录调用次数、命中次数、判定次数和累计耗时。
+    探针抛出的异常按未命中处理。
+    """
+
+    def __init__(self, name, cost, check):
+        """
+        参数:
+            name: 探针名称
+            cost: 相对开销，数值越小越先执行
+            check: 检测函数，接收应用路径，命中时返回 True
+        """
+        self.name = name
+        self.cost = cost
+        self.check = check
+        self.calls = 0
+        self.hits = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self._lock = threading.Lock()
+
+    def run(self, app_path):
+        """执行探针并记录耗时和命中情况"""
+        start = time.perf_counter()
+        hit = False
+        error = False
+        try:
+            hit = bool(self.check(app_path))
+        except Exception:
+            error = True
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.calls += 1
+            self.total_time += elapsed
+            if hit:
+                self.hits += 1
+            if error:
+                self.errors += 1
+        return hit
+
+    def counters(self):
+        """返回 (调用次数, 命中次数, 错误次数, 累计耗时) 计数"""
+        with self._lock:
+            return (self.calls, self.hits, self.errors, self.total_time)
+
+    def add(self, calls, hits, errors, total_time):
+        """累加在其他进程中执行得到的计数"""
+        with self._lock:
+            self.calls += calls
+            self.hits += hits
+            self.errors += errors
+            self.total_time += total_time
+
+    def stats(self, decided_total=0):
+        """
+        返回探针的统计信息
+
+        参数:
+            decided_total: 整条探针链判定为 Electron 的应用总数，用于计算判定占比
+
+        返回:
+            dict: 探针统计
+        """
+        with self._lock:
+            return {
+                'name': self.name,
+                'cost': self.cost,
+                'calls': self.calls,
+                'hits': self.hits,
+                'errors': self.errors,
+                'hit_rate': self.hits / self.calls if self.calls else 0.0,
+                'decided_share': self.hits / decided_total if decided_total else 0.0,
+                'avg_ms': self.total_time / self.calls * 1000 if self.calls else 0.0,
+                'total_ms': self.total_time * 1000,
+            }
+
+class ProbeChain:
+    """
+    按开销从低到高执行的检测探针链
+
+    第一个命中的探针即判定应用为 Electron 应用，后面更昂贵的探针不再执行。
+    因为命中即停止，每个探针的命中次数也就是它判定的应用数。
+    """
+
+    def __init__(self, name, probes):
+        """
+        参数:
+            name: 探针链名称（通常是平台名）
+            probes: DetectionProbe 列表，会按 cost 排序
+        """
+        self.name = name
+        self.probes = sorted(probes, key=lambda probe: probe.cost)
+
+    def detect(self, app_path):
+        """
+        依次执行探针
+
+        参数:
+            app_path: 应用路径
+
+        返回:
+            bool: 任一探针命中时返回 True
+        """
+        for probe in self.probes:
+            if probe.run(app_path):
+                return True
+        return False
+
+    def counters(self):
+        """返回各探针的计数列表，与 self.probes 顺序一致"""
+        return [probe.counters() for probe in self.probes]
+
+    def merge(self, deltas):
+        """
+        合并在其他进程中执行探针得到的计数增量
+
+        参数:
+            deltas: 与 self.probes 顺序一致的 (调用次数, 命中次数, 错误次数, 累计耗时) 列表
+        """
+        for probe, delta in zip(self.probes, deltas):
+            probe.add(*delta)
+
+    def report(self):
+        """
+        生成探针统计报告
+
+        返回:
+            dict: 包含探针链名称、检测的应用数、判定为 Electron 的应用数和各探针统计
+        """
+        decided = sum(probe.hits for probe in self.probes)
+        checked = self.probes[0].calls if self.probes else 0
+        return {
+            'chain': self.name,
+            'checked': checked,
+            'decided': decided,
+            'probes': [probe.stats(decided) for probe in self.probes],
+        }
+
+def print_probe_report(report):
+    """
+    打印探针统计报告
+
+    参数:
+        report: ProbeChain.report() 的返回值
+    """
+    print(f"\n检测探针统计 ({report['chain']}): 检测 {report['checked']} 个候选，判定 {report['decided']} 个 Electron 应用")
+    print(f"{'探针':<28} {'开销':>4} {'调用':>7} {'命中':>6} {'命中率':>8} {'判定占比':>8} {'平均耗时':>10} {'总耗时':>10}")
+    for probe in report['probes']:
+        print(f"{probe['name']:<28} {probe['cost']:>4} {probe['calls']:>7} {probe['hits']:>6} "
+              f"{probe['hit_rate'] * 100:>7.1f}% {probe['decided_share'] * 100:>7.1f}% "
+              f"{probe['avg_ms']:>8.2f}ms {probe['total_ms']:>8.1f}ms")
+
+def _resolve_windows_app_dir(app_path):
+    """
+    把 Windows 候选路径解析为应用安装目录
+
+    参数:
+        app_path: 候选目录或 .exe 文件路径
+
+    返回:
+        str or None: 应用安装目录，无法确定时返回 None
+    """
+    if os.path.isdir(app_path):
+        return app_path
+    if not app_path.lower().endswith('.exe'):
+        return None
+
+    app_dir = os.path.dirname(app_path)
+    app_name = os.path.splitext(os.path.basename(app_path))[0]
+    # 有些Electron应用将资源文件放在与EXE同名的目录中
+    if os.path.isdir(os.path.join(app_dir, app_name, 'resources')):
+        return os.path.join(app_dir, app_name)
+    # 资源文件直接放在应用目录中
+    if os.path.isdir(os.path.join(app_dir, 'resources')):
+        return app_dir
+    return None
+
+def _probe_windows_known_name(app_path):
+    """已知的 Electron 应用名称"""
+    return os.path.basename(app_path).lower() in WINDOWS_KNOWN_ELECTRON_APPS
+
+def _probe_windows_marker_files(app_path):
+    """应用目录中的 Electron 特征文件"""
+    return any(os.path.exists(os.path.join(app_path, marker)) for marker in ELECTRON_MARKERS_WINDOWS)
+
+def _probe_windows_resources_asar(app_path):
+    """resources 目录中的 app.asar 或 electron.asar"""
+    resources_dir = os.path.join(app_path, 'resources')
+    return os.path.exists(os.path.join(resources_dir, 'app.asar')) or \
+        os.path.exists(os.path.join(resources_dir, 'electron.asar'))
+
+def _probe_windows_locales(app_path):
+    """locales 目录中的 en-US.pak"""
+    return os.path.exists(os.path.join(app_path, 'locales', 'en-US.pak'))
+
+def _probe_windows_exe_markers(app_path):
+    """可执行文件中的 Electron 字符串（分块流式查找，不把整个文件读入内存）"""
+    for exe_file in os.listdir(app_path):
+        if not exe_file.endswith('.exe'):
+            continue
+        try:
+            if find_markers_in_file(os.path.join(app_path, exe_file), EXE_ELECTRON_MARKERS, MARKER_BYTE_BUDGET):
+                return True
+        except (IOError, PermissionError):
+            pass
+    return False
+
+# Windows 检测探针，按开销从低到高执行
+WINDOWS_PROBES = ProbeChain('windows', [
+    DetectionProbe('known_name', 0, _probe_windows_known_name),
+    DetectionProbe('marker_files', 1, _probe_windows_marker_files),
+    DetectionProbe('resources_asar', 1, _probe_windows_resources_asar),
+    DetectionProbe('locales_pak', 1, _probe_windows_locales),
+    DetectionProbe('exe_markers', 10, _probe_windows_exe_markers),
+])
+
 def is_electron_app_windows(app_path):
     """
     检测Windows上的应用是否是基于Electron的应用
@@ -139,89 +689,335 @@ def is_electron_app_windows(app_path):
         bool: 如果是Electron应用则返回True，否则返回False
     """
     try:
-        # 检查应用是否是目录
-        if not os.path.isdir(app_path):
-            # 如果是.exe文件，检查同名目录
-            if app_path.lower().endswith('.exe'):
-                app_dir = os.path.dirname(app_path)
-                app_name = os.path.splitext(os.path.basename(app_path))[0]
-                # 有些Electron应用将资源文件放在与EXE同名的目录中
-                resources_dir = os.path.join(app_dir, app_name, 'resources')
-                if os.path.isdir(resources_dir):
-                    app_path = os.path.join(app_dir, app_name)
-                else:
-                    # 资源文件直接放在应用目录中
-                    resources_dir = os.path.join(app_dir, 'resources')
-                    if os.path.isdir(resources_dir):
-                        app_path = app_dir
-                    else:
-                        return False
-            else:
-                return False
-        
-        # 特殊情况处理：已知的Electron应用
-        app_name = os.path.basename(app_path).lower()
-        known_electron_apps = [
-            'visual studio code', 'vscode', 'code',  # VSCode
-            'slack',                                  # Slack
-            'discord',                                # Discord
-            'figma',                                  # Figma
-            'microsoft teams',                        # Microsoft Teams
-            'postman',                                # Postman
-            'notion',                                 # Notion
-            'obsidian',                               # Obsidian
-            'spotify',                                # Spotify
-            'whatsapp',                               # WhatsApp
-            'zoom',                                   # Zoom
-            'cursor',                                 # Cursor Editor
-            'vscodium',                               # VSCodium
-        ]
-        
-        # 如果应用名称在已知Electron应用列表中，直接返回True
-        if app_name in known_electron_apps:
-            return True
-        
-        # 检查是否包含Electron特征标记
-        for marker in ELECTRON_MARKERS_WINDOWS:
-            marker_path = os.path.join(app_path, marker)
-            if os.path.exists(marker_path):
-                return True
-        
-        # 检查资源目录
-        resources_dir = os.path.join(app_path, 'resources')
-        if os.path.isdir(resources_dir):
-            # 检查asar文件
-            if os.path.exists(os.path.join(resources_dir, 'app.asar')) or \
-               os.path.exists(os.path.join(resources_dir, 'electron.asar')):
-                return True
-        
-        # 检查locales目录
-        locales_dir = os.path.join(app_path, 'locales')
-        if os.path.isdir(locales_dir):
-            if os.path.exists(os.path.join(locales_dir, 'en-US.pak')):
-                return True
-        
-        # 检查可执行文件是否包含Electron字符串
-        exe_files = [f for f in os.listdir(app_path) if f.endswith('.exe')]
-        for exe_file in exe_files:
-            try:
-                exe_path = os.path.join(app_path, exe_file)
-                with open(exe_path, 'rb') as f:
-                    content = f.read()
-                    if b'Electron' in content or b'electron.asar' in content or b'app.asar' in content:
-                        return True
-            except (IOError, PermissionError):
-                pass
-        
-        return False
+        app_dir = _resolve_windows_app_dir(app_path)
+        if app_dir is None:
+            return False
+        return WINDOWS_PROBES.detect(app_dir)
     except Exception as e:
         print(f"检查应用 {app_path} 时出错: {str(e)}")
         return False
 
+# Linux 上 Electron 应用安装目录中的特征文件
+LINUX_ELECTRON_MARKERS = ('chrome_100_percent.pak', 'libffmpeg.so', 'v8_context_snapshot.bin')
+
+# .desktop 文件 Exec 字段中的占位符
+DESKTOP_FIELD_CODES = {'%f', '%F', '%u', '%U', '%d', '%D', '%n', '%N', '%i', '%c', '%k', '%v', '%m'}
+
+# Linux 上由 .desktop 文件得到的 安装目录 -> 应用显示名称
+linux_app_names = {}
+
+# Linux 上 安装目录 -> (启动器解析出的主程序路径, .desktop 文件路径)，用于计算应用的缓存指纹
+linux_app_launchers = {}
+
+def parse_desktop_file(desktop_path):
+    """
+    解析 .desktop 文件的 [Desktop Entry] 部分
+
+    参数:
+        desktop_path: .desktop 文件路径
+
+    返回:
+        dict or None: 包含 Name、Exec、TryExec 等键的字典，不是应用类型的条目返回 None
+    """
+    entry = {}
+    in_entry = False
+    try:
+        with open(desktop_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('['):
+                    in_entry = line == '[Desktop Entry]'
+                    continue
+                if in_entry and '=' in line:
+                    key, value = line.split('=', 1)
+                    key = key.strip()
+                    # 只保留未本地化的键
+                    if '[' not in key:
+                        entry[key] = value.strip()
+    except OSError:
+        return None
+
+    if entry.get('Type', 'Application') != 'Application' or entry.get('Hidden', '').lower() == 'true':
+        return None
+    return entry
+
+def _desktop_command(entry):
+    """从 .desktop 条目中取出要执行的程序（优先 TryExec）"""
+    if entry.get('TryExec'):
+        return entry['TryExec']
+
+    try:
+        args = shlex.split(entry.get('Exec', ''))
+    except ValueError:
+        return None
+    args = [arg for arg in args if arg not in DESKTOP_FIELD_CODES]
+
+    # 跳过 env VAR=value 前缀
+    if args and os.path.basename(args[0]) == 'env':
+        args = args[1:]
+        while args and '=' in args[0] and not args[0].startswith('/'):
+            args = args[1:]
+    return args[0] if args else None
+
+# 这些目录是许多程序共用的安装前缀，不能作为某个应用的安装目录
+LINUX_SYSTEM_PREFIXES = ('/', '/usr', '/usr/local', '/usr/share', '/opt')
+# 用户目录下的共用前缀（~/bin、~/.local/bin 中包装脚本的上级目录）
+LINUX_HOME_PREFIXES = ('~', '~/.local')
+
+def resolve_executable(command):
+    """
+    把 Exec/TryExec 中的程序通过 PATH 查找并解析符号链接，得到真实的程序文件
+
+    参数:
+        command: 程序名或路径
+
+    返回:
+        str or None: 程序文件路径，无法解析时返回 None
+    """
+    if not command:
+        return None
+    executable = command if os.path.isabs(command) else shutil.which(command)
+    if not executable:
+        return None
+
+    executable = os.path.realpath(executable)
+    if not os.path.isfile(executable):
+        return None
+    return executable
+
+def resolve_install_dir(command):
+    """
+    把 Exec/TryExec 中的程序解析为真实的安装目录
+
+    程序名通过 PATH 查找，再解析符号链接（例如 /usr/bin/code -> /usr/share/code/bin/code），
+    位于 bin 目录下的启动脚本取其上级目录作为安装目录。解析结果是 /usr、用户主目录、~/.local 之类的
+    共用前缀时（例如没有指向应用目录的 /usr/bin 或 ~/.local/bin 包装脚本）视为无法解析。
+
+    参数:
+        command: 程序名或路径
+
+    返回:
+        str or None: 安装目录，无法解析时返回 None
+    """
+    executable = resolve_executable(command)
+    if not executable:
+        return None
+
+    install_dir = os.path.dirname(executable)
+    if os.path.basename(install_dir) in ('bin', 'sbin'):
+        install_dir = os.path.dirname(install_dir)
+    shared_prefixes = set(LINUX_SYSTEM_PREFIXES)
+    shared_prefixes.update(os.path.realpath(os.path.expanduser(prefix)) for prefix in LINUX_HOME_PREFIXES)
+    if install_dir in shared_prefixes:
+        return None
+    return install_dir
+
+def discover_linux_apps(directory, seen_dirs=None):
+    """
+    从目录中的 .desktop 文件发现应用安装目录
+
+    批量解析 .desktop 文件，把每个启动器解析为安装目录，多个启动器指向同一目录时只保留一个。
+
+    参数:
+        directory: 包含 .desktop 文件的目录
+        seen_dirs: 已发现的安装目录集合，用于跨多个扫描目录去重
+
+    返回:
+        list: 新发现的安装目录列表
+    """
+    if seen_dirs is None:
+        seen_dirs = set()
+
+    install_dirs = []
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            if not file_name.endswith('.desktop'):
+                continue
+            desktop_path = os.path.join(root, file_name)
+            entry = parse_desktop_file(desktop_path)
+            if entry is None:
+                continue
+
+            command = _desktop_command(entry)
+            install_dir = resolve_install_dir(command)
+            if not install_dir or install_dir in seen_dirs:
+                continue
+
+            seen_dirs.add(install_dir)
+            install_dirs.append(install_dir)
+            linux_app_launchers[install_dir] = (resolve_executable(command), desktop_path)
+            if entry.get('Name'):
+                linux_app_names[install_dir] = entry['Name']
+
+    return install_dirs
+
+def is_electron_app_linux(app_path):
+    """
+    检测Linux上的安装目录是否是Electron应用
+
+    对目录只做一次 scandir，用得到的文件名批量检查特征文件，
+    只有存在 resources 目录时才额外检查 resources/app.asar。
+
+    参数:
+        app_path: 应用安装目录
+
+    返回:
+        bool: 如果是Electron应用则返回True，否则返回False
+    """
+    try:
+        with os.scandir(app_path) as entries:
+            names = {entry.name for entry in entries}
+    except OSError:
+        return False
+
+    if any(marker in names for marker in LINUX_ELECTRON_MARKERS):
+        return True
+    return 'resources' in names and os.path.isfile(os.path.join(app_path, 'resources', 'app.asar'))
+
+# Linux 检测探针：一次 scandir 已经足够便宜，只需一个探针
+LINUX_PROBES = ProbeChain('linux', [
+    DetectionProbe('install_dir_markers', 1, is_electron_app_linux),
+])
+
+def get_electron_version_linux(app_path):
+    """
+    尝试获取Linux上Electron应用的版本
+
+    参数:
+        app_path: 应用安装目录
+
+    返回:
+        str: 应用的Electron版本，如果无法确定则返回"未知"
+    """
+    try:
+        # 方法1：从 package.json 中获取（包括 app.asar 内的 package.json）
+        version = get_package_electron_version(os.path.join(app_path, 'resources'))
+        if version:
+            return version
+
+        # 方法2：在主程序中查找版本字符串（Electron 把框架静态链接进主程序）
+        binaries = []
+        with os.scandir(app_path) as entries:
+            for entry in entries:
+                if entry.is_file() and '.' not in entry.name and os.access(entry.path, os.X_OK):
+                    binaries.append(entry.path)
+        binaries.sort(key=lambda path: os.path.basename(path).lower() != os.path.basename(app_path).lower())
+
+        version = search_binary_version(binaries, ELECTRON_VERSION_PATTERN)
+        if version:
+            return version
+
+        version = search_binary_version(binaries, CHROME_VERSION_PATTERN)
+        if version:
+            return f"基于 Chrome {version}"
+
+        return "未知"
+    except Exception as e:
+        print(f"获取 {app_path} 的版本时出错: {str(e)}")
+        return "未知"
+
+# macOS 上已知的 Electron 应用包名称（小写）
+MACOS_KNOWN_ELECTRON_APPS = [
+    'visual studio code.app', 'vscode.app', 'code.app',  # VSCode
+    'slack.app',                                          # Slack
+    'discord.app',                                        # Discord
+    'figma.app',                                          # Figma
+    'microsoft teams.app',                                # Microsoft Teams
+    'postman.app',                                        # Postman
+    'notion.app',                                         # Notion
+    'obsidian.app',                                       # Obsidian
+    'spotify.app',                                        # Spotify
+    'whatsapp.app',                                       # WhatsApp
+    'zoom.app',                                           # Zoom
+    'cursor.app',                                         # Cursor Editor
+    'vscodium.app',                                       # VSCodium
+]
+
+# Electron Helper 应用的名称特征
+MACOS_HELPER_PATTERNS = ['Code Helper', 'Electron Helper', 'Helper (Renderer)', 'Helper (GPU)', 'Helper (Plugin)']
+
+def _probe_macos_known_name(app_path):
+    """已知的 Electron 应用名称"""
+    return os.path.basename(app_path).lower() in MACOS_KNOWN_ELECTRON_APPS
+
+def _probe_macos_resources_asar(app_path):
+    """Resources 目录中的 app.asar"""
+    return os.path.exists(os.path.join(app_path, 'Contents', 'Resources', 'app.asar'))
+
+def _probe_macos_electron_icns(app_path):
+    """Resources 目录中的 electron.icns"""
+    return os.path.exists(os.path.join(app_path, 'Contents', 'Resources', 'electron.icns'))
+
+def _probe_macos_electron_framework(app_path):
+    """Frameworks 目录中的 Electron Framework.framework"""
+    return os.path.exists(os.path.join(app_path, 'Contents', 'Frameworks', 'Electron Framework.framework'))
+
+def _probe_macos_helper_apps(app_path):
+    """Frameworks 目录中的 Electron Helper 应用（特别是针对 VSCode 等应用）"""
+    frameworks_dir = os.path.join(app_path, 'Contents', 'Frameworks')
+    if not os.path.isdir(frameworks_dir):
+        return False
+    return any(any(pattern in item for pattern in MACOS_HELPER_PATTERNS) for item in os.listdir(frameworks_dir))
+
+def _probe_macos_info_plist(app_path):
+    """Info.plist 中的 Electron 相关信息"""
+    plist_path = os.path.join(app_path, 'Contents', 'Info.plist')
+    if not os.path.exists(plist_path):
+        return False
+    with open(plist_path, 'rb') as fp:
+        plist_data = plistlib.load(fp)
+
+    # 检查 CFBundleExecutable 是否为 Electron
+    executable = plist_data.get('CFBundleExecutable', '')
+    if executable and ('electron' in executable.lower() or 'nwjs' in executable.lower() or 'code' in executable.lower()):
+        return True
+
+    # 检查 NSPrincipalClass 是否包含 "AtomApplication"
+    principal_class = plist_data.get('NSPrincipalClass', '')
+    if principal_class and ('AtomApplication' in principal_class or 'ElectronApplication' in principal_class):
+        return True
+
+    # 检查 CFBundleDocumentTypes 是否包含 Electron 相关信息
+    for doc_type in plist_data.get('CFBundleDocumentTypes', []):
+        if 'CFBundleTypeName' in doc_type and 'electron' in str(doc_type['CFBundleTypeName']).lower():
+            return True
+    return False
+
+def _probe_macos_libnode(app_path):
+    """Frameworks 目录树中的 libnode.dylib"""
+    frameworks_dir = os.path.join(app_path, 'Contents', 'Frameworks')
+    for _, _, files in os.walk(frameworks_dir):
+        if 'libnode.dylib' in files:
+            return True
+    return False
+
+# macOS 检测探针，按开销从低到高执行
+MACOS_PROBES = ProbeChain('macos', [
+    DetectionProbe('known_name', 0, _probe_macos_known_name),
+    DetectionProbe('resources_asar', 1, _probe_macos_resources_asar),
+    DetectionProbe('electron_icns', 1, _probe_macos_electron_icns),
+    DetectionProbe('electron_framework', 1, _probe_macos_electron_framework),
+    DetectionProbe('helper_apps', 2, _probe_macos_helper_apps),
+    DetectionProbe('info_plist', 3, _probe_macos_info_plist),
+    DetectionProbe('libnode_walk', 10, _probe_macos_libnode),
+])
+
+def get_probe_chain():
+    """返回当前平台使用的检测探针链"""
+    if IS_WINDOWS:
+        return WINDOWS_PROBES
+    if IS_LINUX:
+        return LINUX_PROBES
+    return MACOS_PROBES
+
 def is_electron_app(app_path):
     """
     检测一个应用是否是基于 Electron 的应用
     
+    检测由一组声明了开销的探针组成，从最便宜的开始执行，任一探针命中即返回。
+    
     参数:
         app_path: 应用程序包的路径
         
@@ -231,99 +1027,160 @@ def is_electron_app(app_path):
     # 根据平台选择相应的实现
     if IS_WINDOWS:
         return is_electron_app_windows(app_path)
+    if IS_LINUX:
+        return LINUX_PROBES.detect(app_path)
     
     # macOS实现
     try:
         # 检查应用是否是有效的 .app 包
         if not app_path.endswith('.app') or not os.path.isdir(app_path):
             return False
-        
-        # 特殊情况处理：已知的 Electron 应用
-        app_name = os.path.basename(app_path).lower()
-        known_electron_apps = [
-            'visual studio code.app', 'vscode.app', 'code.app',  # VSCode
-            'slack.app',                                          # Slack
-            'discord.app',                                        # Discord
-            'figma.app',                                          # Figma
-            'microsoft teams.app',                                # Microsoft Teams
-            'postman.app',                                        # Postman
-            'notion.app',                                         # Notion
-            'obsidian.app',                                       # Obsidian
-            'spotify.app',                                        # Spotify
-            'whatsapp.app',                                       # WhatsApp
-            'zoom.app',                                           # Zoom
-            'cursor.app',                                         # Cursor Editor
-            'vscodium.app',                                       # VSCodium
-        ]
-        
-        # 如果应用名称在已知 Electron 应用列表中，直接返回 True
-        if app_name in known_electron_apps:
-            return True
-        
-        # 检查是否包含 Electron 特征标记
-        for marker in ELECTRON_MARKERS_MACOS:
-            # 在 Contents 目录中搜索特征文件
-            contents_dir = os.path.join(app_path, 'Contents')
-            if not os.path.isdir(contents_dir):
-                continue
-                
-            # 检查 Resources 目录
-            resources_dir = os.path.join(contents_dir, 'Resources')
-            if os.path.exists(resources_dir):
-                if marker == 'app.asar' and os.path.exists(os.path.join(resources_dir, 'app.asar')):
-                    return True
-                if marker == 'electron.icns' and os.path.exists(os.path.join(resources_dir, 'electron.icns')):
-                    return True
-            
-            # 检查 Frameworks 目录
-            frameworks_dir = os.path.join(contents_dir, 'Frameworks')
-            if os.path.exists(frameworks_dir):
-                if marker == 'Electron Framework.framework' and os.path.exists(os.path.join(frameworks_dir, 'Electron Framework.framework')):
-                    return True
-                if marker == 'libnode.dylib':
-                    for root, _, files in os.walk(frameworks_dir):
-                        if 'libnode.dylib' in files:
-                            return True
-        
-        # 检查应用是否包含 Electron Helper 进程（特别是针对 VSCode 等应用）
-        helper_patterns = ['Code Helper', 'Electron Helper', 'Helper (Renderer)', 'Helper (GPU)', 'Helper (Plugin)']
-        frameworks_dir = os.path.join(app_path, 'Contents', 'Frameworks')
-        if os.path.exists(frameworks_dir):
-            for item in os.listdir(frameworks_dir):
-                if any(pattern in item for pattern in helper_patterns):
-                    return True
-            
-        # 检查 Info.plist 中是否包含 Electron 相关信息
-        plist_path = os.path.join(app_path, 'Contents', 'Info.plist')
-        if os.path.exists(plist_path):
-            try:
-                with open(plist_path, 'rb') as fp:
-                    plist_data = plistlib.load(fp)
-                    
-                    # 检查 CFBundleExecutable 是否为 Electron
-                    executable = plist_data.get('CFBundleExecutable', '')
-                    if executable and ('electron' in executable.lower() or 'nwjs' in executable.lower() or 'code' in executable.lower()):
-                        return True
-                    
-                    # 检查 NSPrincipalClass 是否包含 "AtomApplication"
-                    principal_class = plist_data.get('NSPrincipalClass', '')
-                    if principal_class and ('AtomApplication' in principal_class or 'ElectronApplication' in principal_class):
-                        return True
-                        
-                    # 检查 CFBundleDocumentTypes 是否包含 Electron 相关信息
-                    doc_types = plist_data.get('CFBundleDocumentTypes', [])
-                    for doc_type in doc_types:
-                        if 'CFBundleTypeName' in doc_type and 'electron' in str(doc_type['CFBundleTypeName']).lower():
-                            return True
-                        
-            except Exception:
-                pass
-                
-        return False
+        return MACOS_PROBES.detect(app_path)
     except Exception as e:
         print(f"检查应用 {app_path} 时出错: {str(e)}")
         return False
 
+# 二进制文件中的版本字符串
+ELECTRON_VERSION_PATTERN = re.compile(rb'Electron/(\d+\.\d+\.\d+)')
+CHROME_VERSION_PATTERN = re.compile(rb'Chrome/(\d+\.\d+\.\d+\.\d+)')
+
+# ASAR 头部的大小上限，防止损坏的文件导致读取过多数据
+ASAR_MAX_HEADER_SIZE = 64 * 1024 * 1024
+
+def read_asar_header(asar_path):
+    """
+    读取 ASAR 归档的 JSON 头部
+
+    ASAR 文件以 Chromium Pickle 格式封装头部：
+    [UInt32 4][UInt32 头部 pickle 大小][UInt32 pickle 负载大小][UInt32 JSON 长度][JSON]，
+    文件数据从 8 + 头部 pickle 大小 处开始。只读取头部，不读取归档中的其他内容。
+
+    参数:
+        asar_path: app.asar 文件路径
+
+    返回:
+        tuple: (头部字典, 文件数据起始偏移)
+
+    异常:
+        ValueError: 文件不是有效的 ASAR 归档
+    """
+    with open(asar_path, 'rb') as f:
+        prefix = f.read(16)
+        if len(prefix) < 16:
+            raise ValueError(f"{asar_path} 不是有效的 ASAR 文件")
+
+        size_pickle_len, header_size, _, json_len = struct.unpack('<4I', prefix)
+        if size_pickle_len != 4 or json_len > header_size or header_size > ASAR_MAX_HEADER_SIZE:
+            raise ValueError(f"{asar_path} 的 ASAR 头部格式不正确")
+
+        header_json = f.read(json_len)
+        if len(header_json) < json_len:
+            raise ValueError(f"{asar_path} 的 ASAR 头部不完整")
+
+    return json.loads(header_json.decode('utf-8')), 8 + header_size
+
+def _find_asar_entry(header, inner_path):
+    """在 ASAR 头部中按路径查找文件条目"""
+    entry = header
+    for part in inner_path.replace('\\', '/').strip('/').split('/'):
+        files = entry.get('files')
+        if not isinstance(files, dict) or part not in files:
+            return None
+        entry = files[part]
+    return entry
+
+def read_asar_file(asar_path, inner_path, max_size=16 * 1024 * 1024):
+    """
+    从 ASAR 归档中读取单个文件，直接定位到文件数据，不解包整个归档
+
+    参数:
+        asar_path: app.asar 文件路径
+        inner_path: 归档内的文件路径，例如 'package.json'
+        max_size: 允许读取的最大文件大小
+
+    返回:
+        bytes or None: 文件内容，文件不存在、过大或只存在于 app.asar.unpacked 中时返回 None
+    """
+    header, data_offset = read_asar_header(asar_path)
+    entry = _find_asar_entry(header, inner_path)
+    if entry is None or 'files' in entry or 'link' in entry:
+        return None
+
+    size = int(entry.get('size', 0))
+    if size > max_size:
+        return None
+
+    if entry.get('unpacked'):
+        unpacked_path = os.path.join(asar_path + '.unpacked', *inner_path.split('/'))
+        with open(unpacked_path, 'rb') as f:
+            return f.read(size)
+
+    with open(asar_path, 'rb') as f:
+        f.seek(data_offset + int(entry['offset']))
+        return f.read(size)
+
+def read_asar_package_json(asar_path):
+    """
+    读取 ASAR 归档根目录下的 package.json
+
+    参数:
+        asar_path: app.asar 文件路径
+
+    返回:
+        dict or None: 解析后的 package.json，无法读取时返回 None
+    """
+    try:
+        content = read_asar_file(asar_path, 'package.json')
+        if content is None:
+            return None
+        return json.loads(content.decode('utf-8'))
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+def _electron_version_from_package(package_data):
+    """从 package.json 的依赖中取出 electron 的版本"""
+    if not isinstance(package_data, dict):
+        return None
+    if 'devDependencies' in package_data and 'electron' in package_data['devDependencies']:
+        return package_data['devDependencies']['electron']
+    if 'dependencies' in package_data and 'electron' in package_data['dependencies']:
+        return package_data['dependencies']['electron']
+    return None
+
+def get_package_electron_version(resources_dir):
+    """
+    从应用资源目录中的 package.json 获取 Electron 版本
+
+    依次检查 app/package.json、app.asar.unpacked/package.json，
+    最后直接从 app.asar 的头部定位并读取其中的 package.json。
+
+    参数:
+        resources_dir: 应用的 resources 目录
+
+    返回:
+        str or None: Electron 版本，无法确定时返回 None
+    """
+    package_json_paths = [
+        os.path.join(resources_dir, 'app', 'package.json'),
+        os.path.join(resources_dir, 'app.asar.unpacked', 'package.json')
+    ]
+
+    for package_path in package_json_paths:
+        if os.path.exists(package_path):
+            try:
+                with open(package_path, 'r', encoding='utf-8') as f:
+                    version = _electron_version_from_package(json.load(f))
+                    if version:
+                        return version
+            except Exception:
+                pass
+
+    asar_path = os.path.join(resources_dir, 'app.asar')
+    if os.path.isfile(asar_path):
+        return _electron_version_from_package(read_asar_package_json(asar_path))
+
+    return None
+
 def get_electron_version_windows(app_path):
     """
     尝试获取Windows上Electron应用的版本
@@ -335,24 +1192,10 @@ def get_electron_version_windows(app_path):
         str: 应用的Electron版本，如果无法确定则返回"未知"
     """
     try:
-        # 方法1：从package.json获取版本信息
-        # 检查可能的package.json位置
-        package_json_paths = [
-            os.path.join(app_path, 'resources', 'app', 'package.json'),
-            os.path.join(app_path, 'resources', 'app.asar.unpacked', 'package.json')
-        ]
-        
-        for package_path in package_json_paths:
-            if os.path.exists(package_path):
-                try:
-                    with open(package_path, 'r', encoding='utf-8') as f:
-                        package_data = json.load(f)
-                        if 'devDependencies' in package_data and 'electron' in package_data['devDependencies']:
-                            return package_data['devDependencies']['electron']
-                        if 'dependencies' in package_data and 'electron' in package_data['dependencies']:
-                            return package_data['dependencies']['electron']
-                except Exception:
-                    pass
+        # 方法1：从package.json获取版本信息（包括 app.asar 内的 package.json）
+        version = get_package_electron_version(os.path.join(app_path, 'resources'))
+        if version:
+            return version
         
         # 方法2：检查可执行文件的版本信息
         # 在Windows上，可以通过检查electron.exe的版本资源获取版本
@@ -363,9 +1206,10 @@ def get_electron_version_windows(app_path):
                     exe_path = os.path.join(app_path, exe_file)
                     if os.path.exists(exe_path):
                         # 使用subprocess执行WMIC命令获取文件版本
-                        cmd = ['wmic', 'datafile', 'where', f'name="{exe_path.replace("\\", "\\\\")}"', 'get', 'Version', '/value']
+                        wmic_path = exe_path.replace('\\', '\\\\')
+                        cmd = ['wmic', 'datafile', 'where', f'name="{wmic_path}"', 'get', 'Version', '/value']
                         try:
-                            result = subprocess.run(cmd, capture_output=True, text=True, timeout=3)
+                            result = run_command(cmd)
                             if result.returncode == 0:
                                 output = result.stdout
                                 version_match = re.search(r'Version=(.+)', output)
@@ -400,6 +1244,32 @@ def get_electron_version_windows(app_path):
         print(f"获取 {app_path} 的版本时出错: {str(e)}")
         return "未知"
 
+def search_binary_version(binary_paths, pattern):
+    """
+    在二进制文件中查找版本字符串
+
+    通过内存映射直接用预编译的字节正则搜索文件内容，不启动 strings 子进程，
+    也不需要把整个文件解码为文本。按顺序检查文件，找到第一个匹配即返回。
+
+    参数:
+        binary_paths: 要检查的二进制文件路径列表
+        pattern: 带一个捕获组的预编译字节正则表达式
+
+    返回:
+        str or None: 匹配到的版本号，没有找到时返回 None
+    """
+    for binary_path in binary_paths:
+        try:
+            with open(binary_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    match = pattern.search(mapped)
+                    if match:
+                        return match.group(1).decode('ascii')
+        except (OSError, ValueError):
+            # 空文件无法映射，无法访问的文件直接跳过
+            continue
+    return None
+
 def get_electron_version(app_path):
     """
     尝试获取 Electron 应用的版本
@@ -413,6 +1283,8 @@ def get_electron_version(app_path):
     # 根据平台选择相应的实现
     if IS_WINDOWS:
         return get_electron_version_windows(app_path)
+    if IS_LINUX:
+        return get_electron_version_linux(app_path)
     
     # macOS实现
     try:
@@ -425,46 +1297,32 @@ def get_electron_version(app_path):
                 if versions:
                     return versions[0]
         
-        # 方法2：从 package.json 中获取
-        resources_dir = os.path.join(app_path, 'Contents', 'Resources')
-        package_json_paths = [
-            os.path.join(resources_dir, 'app', 'package.json'),
-            os.path.join(resources_dir, 'app.asar.unpacked', 'package.json')
-        ]
-        
-        for package_path in package_json_paths:
-            if os.path.exists(package_path):
-                try:
-                    with open(package_path, 'r', encoding='utf-8') as f:
-                        package_data = json.load(f)
-                        if 'devDependencies' in package_data and 'electron' in package_data['devDependencies']:
-                            return package_data['devDependencies']['electron']
-                        if 'dependencies' in package_data and 'electron' in package_data['dependencies']:
-                            return package_data['dependencies']['electron']
-                except Exception:
-                    pass
+        # 方法2：从 package.json 中获取（包括 app.asar 内的 package.json）
+        version = get_package_electron_version(os.path.join(app_path, 'Contents', 'Resources'))
+        if version:
+            return version
         
-        # 方法3：使用 strings 命令在二进制文件中查找版本信息
+        # 方法3：在进程内内存映射二进制文件查找版本信息，优先检查 Electron Framework
         try:
+            binaries = []
+            framework_binary = os.path.join(app_path, 'Contents', 'Frameworks', 'Electron Framework.framework', 'Electron Framework')
+            if os.path.isfile(framework_binary):
+                binaries.append(framework_binary)
+            
             executable_path = os.path.join(app_path, 'Contents', 'MacOS')
             if os.path.exists(executable_path):
                 executable_files = os.listdir(executable_path)
                 if executable_files:
-                    main_executable = os.path.join(executable_path, executable_files[0])
-                    result = subprocess.run(['strings', main_executable], capture_output=True, text=True)
-                    output = result.stdout
-                    
-                    # 使用正则表达式查找版本模式
-                    version_pattern = r'Electron/(\d+\.\d+\.\d+)'
-                    match = re.search(version_pattern, output)
-                    if match:
-                        return match.group(1)
-                    
-                    # 尝试另一种格式
-                    chrome_pattern = r'Chrome/(\d+\.\d+\.\d+\.\d+)'
-                    match = re.search(chrome_pattern, output)
-                    if match:
-                        return f"基于 Chrome {match.group(1)}"
+                    binaries.append(os.path.join(executable_path, executable_files[0]))
+            
+            version = search_binary_version(binaries, ELECTRON_VERSION_PATTERN)
+            if version:
+                return version
+            
+            # 尝试另一种格式
+            version = search_binary_version(binaries, CHROME_VERSION_PATTERN)
+            if version:
+                return f"基于 Chrome {version}"
         except Exception:
             pass
             
@@ -473,650 +1331,3487 @@ def get_electron_version(app_path):
         print(f"获取 {app_path} 的版本时出错: {str(e)}")
         return "未知"
 
-def get_memory_usage_windows(app_path):
+def _path_key(path):
+    """把路径规范化为索引键（统一分隔符、去掉末尾分隔符、忽略大小写）"""
+    return path.replace('\\', '/').rstrip('/').lower()
+
+def _path_roots(path):
     """
-    获取Windows上应用程序的内存使用情况
-    
+    返回路径自身及其所有上级目录的索引键
+
     参数:
-        app_path: 应用程序目录的路径
-        
+        path: 文件或目录路径
+
     返回:
-        dict: 包含内存使用信息的字典，包括总内存、是否运行中等
+        list: 从最上层目录到路径自身的索引键列表（不含文件系统根目录）
     """
-    try:
-        app_name = os.path.basename(app_path)
-        # 如果是.exe文件，提取基本名称
-        if app_name.lower().endswith('.exe'):
-            app_name = os.path.splitext(app_name)[0]
-            
-        # 存储结果
-        memory_info = {
-            'running': False,
-            'memory_mb': 0,
-            'processes': 0,
-            'status': '未运行',
-            'process_details': None
-        }
-        
-        # 如果没有psutil库，无法获取详细的内存信息
-        if not HAS_PSUTIL:
-            # 尝试使用tasklist命令获取进程信息
-            try:
-                cmd = ['tasklist', '/fo', 'csv', '/nh']
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    processes = []
-                    total_memory = 0
-                    
-                    for line in lines:
-                        # 格式: "Image Name","PID","Session Name","Session#","Mem Usage"
-                        if not line.strip():
-                            continue
-                            
-                        parts = line.split(',')
-                        if len(parts) >= 5:
-                            process_name = parts[0].strip('"')
-                            # 检查进程名是否与应用名匹配
-                            if app_name.lower() in process_name.lower():
-                                try:
-                                    pid = int(parts[1].strip('"'))
-                                    mem_str = parts[4].strip('"').replace(',', '').replace(' K', '')
-                                    mem_kb = int(mem_str)
-                                    mem_mb = mem_kb / 1024  # 转换为MB
-                                    
-                                    total_memory += mem_mb
-                                    processes.append({
-                                        'pid': pid,
-                                        'memory_mb': mem_mb,
-                                        'command': process_name
-                                    })
-                                except (ValueError, IndexError):
-                                    continue
-                    
-                    if processes:
-                        memory_info['running'] = True
-                        memory_info['memory_mb'] = total_memory
-                        memory_info['processes'] = len(processes)
-                        memory_info['status'] = f"运行中 ({len(processes)} 进程)"
-                        memory_info['process_details'] = processes
-            except Exception as e:
-                print(f"使用tasklist获取内存信息时出错: {str(e)}")
-                
-            return memory_info
-        
-        # 使用psutil获取进程信息
-        processes = []
-        total_memory = 0
-        
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'exe']):
-            try:
-                # 检查进程的可执行文件路径或名称是否与应用相关
-                proc_info = proc.info
-                
-                # 检查可执行文件路径是否以应用路径开头
-                if proc_info.get('exe') and app_path.lower() in proc_info['exe'].lower():
-                    mem = proc.memory_info().rss / (1024 * 1024)  # 转换为MB
-                    total_memory += mem
-                    processes.append({
-                        'pid': proc.pid,
-                        'memory_mb': mem,
-                        'command': proc_info.get('exe', '')
-                    })
-                # 检查进程名称是否包含应用名
-                elif app_name.lower() in proc_info.get('name', '').lower():
-                    mem = proc.memory_info().rss / (1024 * 1024)  # 转换为MB
-                    total_memory += mem
-                    processes.append({
-                        'pid': proc.pid,
-                        'memory_mb': mem,
-                        'command': proc_info.get('name', '')
-                    })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-                
-        memory_info = {
-            'running': len(processes) > 0,
-            'memory_mb': total_memory,
-            'processes': len(processes),
-            'status': f"运行中 ({len(processes)} 进程)" if len(processes) > 0 else "未运行",
-            'process_details': processes if len(processes) > 0 else None
-        }
-        
-        return memory_info
-    except Exception as e:
-        print(f"获取应用 {app_path} 内存使用情况时出错: {str(e)}")
-        return {
-            'running': False,
-            'memory_mb': 0,
-            'processes': 0,
-            'status': '未知'
-        }
+    key = _path_key(path)
+    parts = key.split('/')
+    roots = []
+    for i in range(2, len(parts) + 1):
+        root = '/'.join(parts[:i])
+        if root:
+            roots.append(root)
+    return roots
 
-def get_memory_usage(app_path):
+def _command_paths(command):
     """
-    获取应用程序的内存使用情况
-    
+    从命令行中提取可能的程序路径（用于无法获取 exe 的情况）
+
     参数:
-        app_path: 应用程序包的路径
-        
+        command: 完整的命令行字符串
+
     返回:
-        dict: 包含内存使用信息的字典，包括总内存、是否运行中等
+        list: 命令行中出现的 .app 包路径以及开头的可执行文件路径
     """
-    # 根据平台选择相应的实现
-    if IS_WINDOWS:
-        return get_memory_usage_windows(app_path)
-    
-    # macOS实现
-    try:
-        app_name = os.path.basename(app_path).replace('.app', '')
-        
-        # 获取应用的进程信息
-        # 使用 ps 命令获取包含应用名称的所有进程
-        cmd = ['ps', '-eo', 'pid,rss,command']
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            return {
-                'running': False,
-                'memory_mb': 0,
-                'processes': 0,
-                'status': '未运行'
-            }
-        
-        # 分析输出以找到匹配的进程
-        lines = result.stdout.strip().split('\n')
-        total_memory = 0
-        processes = []
-        
-        # 查找可能的进程名模式
-        # 1. 直接匹配应用名称
-        # 2. 匹配应用路径
-        # 3. 匹配 Electron Helper 进程
-        app_path_pattern = re.escape(app_path)
-        app_name_pattern = re.escape(app_name)
-        
-        for line in lines[1:]:  # 跳过标题行
-            parts = line.strip().split(None, 2)
-            if len(parts) < 3:
-                continue
-                
-            pid, rss, command = parts
-            
-            # 检查是否是目标应用的进程
-            is_target = False
-            
-            # 检查命令行是否包含应用路径
-            if re.search(app_path_pattern, command, re.IGNORECASE):
-                is_target = True
-            # 检查命令行是否包含应用名称（更宽松的匹配）
-            elif re.search(app_name_pattern, command, re.IGNORECASE):
-                # 排除可能的误匹配（例如，如果应用名是常见词）
-                if not re.search(r'\/Library\/', command) and not re.search(r'\/System\/', command):
-                    is_target = True
-            # 检查是否是 Electron Helper 进程
-            elif 'Electron Helper' in command and app_name_pattern in command:
-                is_target = True
-                
-            if is_target:
-                try:
-                    mem = int(rss) / 1024  # 转换为 MB
-                    total_memory += mem
-                    processes.append({
-                        'pid': pid,
-                        'memory_mb': mem,
-                        'command': command
-                    })
-                except ValueError:
-                    pass
-        
-        return {
-            'running': len(processes) > 0,
-            'memory_mb': total_memory,
-            'processes': len(processes),
-            'status': f"运行中 ({len(processes)} 进程)" if len(processes) > 0 else "未运行",
-            'process_details': processes if len(processes) > 0 else None
-        }
-    except Exception as e:
-        print(f"获取应用 {app_path} 内存使用情况时出错: {str(e)}")
-        return {
-            'running': False,
-            'memory_mb': 0,
-            'processes': 0,
-            'status': '未知'
-        }
+    paths = []
+    # macOS 的 .app 包路径可能包含空格，以 .app 结尾向前找到路径起点
+    for match in re.finditer(r'\.app(?=/|\s|$)', command, re.IGNORECASE):
+        start = -1
+        for i in range(match.start() - 1, -1, -1):
+            if command[i] == '/' and (i == 0 or command[i - 1] in ' ="\''):
+                start = i
+                break
+        if start >= 0:
+            paths.append(command[start:match.end()])
+
+    # 命令行开头的可执行文件路径
+    if command.startswith('/'):
+        paths.append(command.split(None, 1)[0])
+    return paths
 
-def get_process_performance_windows(app_path):
+def _tokenize(text):
+    """把文本拆分为小写词元集合"""
+    return set(re.findall(r'\w+', text.lower()))
+
+def _app_base_name(app_path):
+    """根据平台从应用路径中提取用于进程匹配的应用名称"""
+    app_name = os.path.basename(app_path.rstrip('/\\'))
+    if app_name.lower().endswith('.exe'):
+        return os.path.splitext(app_name)[0]
+    return app_name.replace('.app', '')
+
+# Chromium 用 --type= 参数标记子进程的角色，没有该参数的是主（browser）进程
+CHROMIUM_TYPE_PATTERN = re.compile(r'--type=([\w-]+)')
+
+def chromium_process_role(command):
     """
-    获取Windows上应用程序的性能信息，包括CPU使用率
-    
-    参数:
-        app_path: 应用程序目录的路径
-        
+    根据命令行判断 Electron/Chromium 进程的角色
+
     返回:
-        dict: 包含性能信息的字典，包括CPU使用率等
+        str: --type= 的取值（renderer、gpu-process、utility、zygote 等），没有该参数时为 browser
     """
-    try:
-        app_name = os.path.basename(app_path)
-        # 如果是.exe文件，提取基本名称
-        if app_name.lower().endswith('.exe'):
-            app_name = os.path.splitext(app_name)[0]
-            
-        performance_info = {
-            'cpu_percent': 0,
-            'num_threads': 0,
-            'energy_impact': 'N/A',  # Windows不提供能耗信息
-            'has_performance_data': False
-        }
-        
-        # 如果没有psutil库，无法获取详细的性能信息
-        if not HAS_PSUTIL:
-            return performance_info
-        
-        # 使用psutil获取进程信息
-        pids = []
-        
-        for proc in psutil.process_iter(['pid', 'name', 'exe']):
-            try:
-                # 检查进程的可执行文件路径或名称是否与应用相关
-                proc_info = proc.info
-                
-                # 检查可执行文件路径是否以应用路径开头
-                if proc_info.get('exe') and app_path.lower() in proc_info['exe'].lower():
-                    pids.append(proc.pid)
-                # 检查进程名称是否包含应用名
-                elif app_name.lower() in proc_info.get('name', '').lower():
-                    pids.append(proc.pid)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        if not pids:
-            return performance_info
-        
-        # 获取CPU使用率和线程数
-        total_cpu_percent = 0
-        total_threads = 0
-        
-        for pid in pids:
-            try:
-                proc = psutil.Process(pid)
-                # 获取CPU使用率
-                cpu_percent = proc.cpu_percent(interval=0.1)
-                total_cpu_percent += cpu_percent
-                
-                # 获取线程数
-                total_threads += proc.num_threads()
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        performance_info = {
-            'cpu_percent': total_cpu_percent,
-            'num_threads': total_threads,
-            'energy_impact': 'N/A',  # Windows不提供能耗信息
-            'has_performance_data': len(pids) > 0
-        }
-        
-        return performance_info
-    
-    except Exception as e:
-        print(f"获取应用 {app_path} 性能信息时出错: {str(e)}")
-        return {
-            'cpu_percent': 0,
-            'num_threads': 0,
-            'energy_impact': 'N/A',
-            'has_performance_data': False
-        }
+    match = CHROMIUM_TYPE_PATTERN.search(command)
+    return match.group(1) if match else 'browser'
 
-def get_process_performance(app_path):
+def _parse_ps_time(value):
     """
-    获取应用程序的性能信息，包括 CPU 使用率和能耗情况
-    
-    参数:
-        app_path: 应用程序包的路径
-        
+    解析 ps 输出的累计 CPU 时间
+
+    支持 Linux 的 [DD-]HH:MM:SS 格式和 macOS 的 M:SS.ss 格式
+
     返回:
-        dict: 包含性能信息的字典，包括 CPU 使用率、能耗等
+        float or None: 累计 CPU 时间（秒），无法解析时返回 None
     """
-    # 根据平台选择相应的实现
-    if IS_WINDOWS:
-        return get_process_performance_windows(app_path)
-    
-    # macOS实现
     try:
-        app_name = os.path.basename(app_path).replace('.app', '')
-        
-        performance_info = {
-            'cpu_percent': 0,
-            'num_threads': 0,
-            'energy_impact': 'N/A',
-            'has_performance_data': False
-        }
-        
-        # 获取进程信息
-        pids = []
-        
-        # 使用 ps 命令获取包含应用名称的所有进程
-        cmd = ['ps', '-eo', 'pid,command']
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            return performance_info
-        
-        # 分析输出以找到匹配的进程
-        lines = result.stdout.strip().split('\n')
-        app_path_pattern = re.escape(app_path)
-        app_name_pattern = re.escape(app_name)
-        
-        for line in lines[1:]:  # 跳过标题行
-            parts = line.strip().split(None, 1)
-            if len(parts) < 2:
-                continue
-                
-            pid, command = parts
+        days = 0
+        if '-' in value:
+            day_part, value = value.split('-', 1)
+            days = int(day_part)
+        seconds = 0.0
+        for part in value.split(':'):
+            seconds = seconds * 60 + float(part)
+        return days * 86400 + seconds
+    except ValueError:
+        return None
+
+PSUTIL_PROCESS_ATTRS = ['pid', 'ppid', 'name', 'exe', 'cmdline', 'memory_info', 'num_threads', 'cpu_times']
+
+def _psutil_attrs():
+    """返回需要 psutil 读取的进程属性，开启 PSS 采集时额外读取 memory_full_info"""
+    if COLLECT_PSS:
+        return PSUTIL_PROCESS_ATTRS + ['memory_full_info']
+    return PSUTIL_PROCESS_ATTRS
+
+def _psutil_record(info):
+    """把 psutil 的进程属性字典转换为进程记录"""
+    name = info.get('name') or ''
+    exe = info.get('exe') or ''
+    cmdline = info.get('cmdline')
+    mem = info.get('memory_info')
+    cpu = info.get('cpu_times')
+    # memory_full_info 在所有平台上提供 uss，只有 Linux 提供 pss；无权访问时为 None
+    full = info.get('memory_full_info')
+    return {
+        'pid': info['pid'],
+        'ppid': info.get('ppid') or 0,
+        'name': name,
+        'exe': exe,
+        'command': ' '.join(cmdline) if cmdline else (exe or name),
+        'rss': mem.rss if mem else 0,
+        'pss': getattr(full, 'pss', None),
+        'uss': getattr(full, 'uss', None),
+        'num_threads': info.get('num_threads') or 0,
+        'cpu_time': cpu.user + cpu.system if cpu else None,
+    }
+
+def _psutil_process_record(pid):
+    """使用 psutil 读取单个进程的记录，进程已退出或无权访问时返回 None"""
+    try:
+        return _psutil_record(psutil.Process(pid).as_dict(_psutil_attrs()))
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+def _collect_processes_psutil():
+    """使用 psutil 一次性采集所有进程的信息"""
+    processes = []
+    for proc in psutil.process_iter(_psutil_attrs()):
+        try:
+            info = proc.info
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+        processes.append(_psutil_record(info))
+    return processes
+
+def _collect_processes_ps():
+    """使用一次 ps 命令采集所有进程的信息（macOS/Linux，无 psutil 时使用）"""
+    processes = []
+    cmd = ['ps', '-eo', 'pid,ppid,rss,time,command']
+    result = run_command(cmd)
+    if result.returncode != 0:
+        return processes
+
+    for line in result.stdout.strip().split('\n')[1:]:  # 跳过标题行
+        parts = line.strip().split(None, 4)
+        if len(parts) < 5:
+            continue
+
+        pid, ppid, rss, cpu_time, command = parts
+        try:
+            processes.append({
+                'pid': int(pid),
+                'ppid': int(ppid),
+                'name': os.path.basename(command.split(' -', 1)[0].strip()),
+                'exe': '',
+                'command': command,
+                'rss': int(rss) * 1024,  # ps 输出的 RSS 单位为 KB
+                'pss': None,
+                'uss': None,
+                'num_threads': 0,
+                'cpu_time': _parse_ps_time(cpu_time),
+            })
+        except ValueError:
+            continue
+    return processes
+
+def _collect_processes_tasklist():
+    """使用一次 tasklist 命令采集所有进程的信息（Windows，无 psutil 时使用）"""
+    import csv
+
+    processes = []
+    cmd = ['tasklist', '/fo', 'csv', '/nh']
+    result = run_command(cmd)
+    if result.returncode != 0:
+        return processes
+
+    # 格式: "Image Name","PID","Session Name","Session#","Mem Usage"
+    for parts in csv.reader(result.stdout.strip().split('\n')):
+        if len(parts) < 5:
+            continue
+        try:
+            mem_kb = int(re.sub(r'\D', '', parts[4]) or 0)
+            processes.append({
+                'pid': int(parts[1]),
+                'ppid': 0,
+                'name': parts[0],
+                'exe': '',
+                'command': parts[0],
+                'rss': mem_kb * 1024,
+                'pss': None,
+                'uss': None,
+                'num_threads': 0,
+                'cpu_time': None,
+            })
+        except ValueError:
+            continue
+    return processes
+
+class ProcFSCollector:
+    """
+    直接读取 /proc 的进程信息采集器（Linux）
+
+    每个进程在一次采集中只读取 stat、statm 和 cmdline 各一次（外加 exe 符号链接），
+    不启动 ps 子进程，也不逐个属性调用 psutil。proc 根目录可以配置，
+    便于用构造的 proc 目录树做测试和基准测试。
+
+    开启 proportional 时额外读取 smaps_rollup 得到 PSS 和 USS。smaps_rollup 由内核汇总成十几行，
+    读取开销与 statm 同一量级；不会读取按映射逐段列出、大小随映射数量增长的 smaps。
+    """
+
+    def __init__(self, proc_root='/proc', clk_tck=None, page_size=None, proportional=False):
+        """
+        参数:
+            proc_root: proc 文件系统的根目录
+            clk_tck: 每秒时钟滴答数，默认读取系统配置
+            page_size: 内存页大小（字节），默认读取系统配置
+            proportional: 是否读取 smaps_rollup 采集 PSS 和 USS
+        """
+        self.proc_root = proc_root
+        self.proportional = proportional
+        self.clk_tck = clk_tck or os.sysconf('SC_CLK_TCK')
+        self.page_size = page_size or os.sysconf('SC_PAGE_SIZE')
+
+    def pids(self):
+        """列出 proc 根目录下的所有进程ID"""
+        try:
+            with os.scandir(self.proc_root) as entries:
+                return [int(entry.name) for entry in entries if entry.name.isdigit()]
+        except OSError:
+            return []
+
+    def _read(self, pid, name):
+        """读取 /proc/[pid]/name 的全部内容"""
+        with open(os.path.join(self.proc_root, str(pid), name), 'rb') as f:
+            return f.read()
+
+    def _parse_stat(self, data):
+        """
+        解析 /proc/[pid]/stat
+
+        进程名可能包含空格和括号，因此以最后一个 ')' 为界拆分。
+
+        返回:
+            tuple: (进程名, 父进程ID, 累计CPU时间（秒）, 线程数)
+        """
+        open_paren = data.index(b'(')
+        close_paren = data.rindex(b')')
+        name = data[open_paren + 1:close_paren].decode('utf-8', 'replace')
+        # 字段从第 3 个（state）开始：ppid 为第 4 个，utime/stime 为第 14/15 个，num_threads 为第 20 个
+        fields = data[close_paren + 2:].split()
+        ppid = int(fields[1])
+        cpu_time = (int(fields[11]) + int(fields[12])) / self.clk_tck
+        num_threads = int(fields[17])
+        return name, ppid, cpu_time, num_threads
+
+    def read_smaps_rollup(self, pid):
+        """
+        读取 /proc/[pid]/smaps_rollup，获取进程的 PSS 和 USS
+
+        USS 为 Private_Clean 与 Private_Dirty 之和。内核早于 4.14 时没有 smaps_rollup，
+        其他用户的进程通常也无权读取，这两种情况都返回 None。
+
+        返回:
+            tuple or None: (PSS 字节数, USS 字节数)
+        """
+        try:
+            data = self._read(pid, 'smaps_rollup')
+        except OSError:
+            return None
+
+        pss = None
+        uss = 0
+        try:
+            for line in data.split(b'\n'):
+                # Pss_Anon、Pss_File 等细分字段以 "Pss_" 开头，不会与 "Pss:" 混淆
+                if line.startswith(b'Pss:'):
+                    pss = int(line.split()[1]) * 1024
+                elif line.startswith((b'Private_Clean:', b'Private_Dirty:')):
+                    uss += int(line.split()[1]) * 1024
+        except (ValueError, IndexError):
+            return None
+        if pss is None:
+            return None  # 内核线程的 smaps_rollup 为空
+        return pss, uss
+
+    def read_process(self, pid):
+        """
+        读取单个进程的信息
+
+        返回:
+            dict or None: 与 ProcessSnapshot 兼容的进程记录，进程已退出或无法读取时返回 None
+        """
+        try:
+            name, ppid, cpu_time, num_threads = self._parse_stat(self._read(pid, 'stat'))
+            resident_pages = int(self._read(pid, 'statm').split()[1])
+            cmdline = self._read(pid, 'cmdline')
+        except (OSError, ValueError, IndexError):
+            return None
+
+        try:
+            exe = os.readlink(os.path.join(self.proc_root, str(pid), 'exe'))
+        except OSError:
+            exe = ''
+
+        pss = uss = None
+        if self.proportional:
+            pss, uss = self.read_smaps_rollup(pid) or (None, None)
+
+        command = cmdline.rstrip(b'\0').replace(b'\0', b' ').decode('utf-8', 'replace')
+        return {
+            'pid': pid,
+            'ppid': ppid,
+            'name': name,
+            'exe': exe,
+            'command': command or f'[{name}]',  # 内核线程没有命令行
+            'rss': resident_pages * self.page_size,
+            'pss': pss,
+            'uss': uss,
+            'num_threads': num_threads,
+            'cpu_time': cpu_time,
+        }
+
+    def read_usage(self, pid):
+        """
+        只读取 stat 和 statm，获取单个进程的内存和累计 CPU 时间
+
+        开启 proportional 时内存改为读取 smaps_rollup 中的 PSS，无法读取时退回 RSS。
+
+        返回:
+            tuple or None: (内存字节数, 累计 CPU 时间（秒）)，进程已退出时返回 None
+        """
+        try:
+            cpu_time = self._parse_stat(self._read(pid, 'stat'))[2]
+            if self.proportional:
+                rollup = self.read_smaps_rollup(pid)
+                if rollup is not None:
+                    return rollup[0], cpu_time
+            resident_pages = int(self._read(pid, 'statm').split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+        return resident_pages * self.page_size, cpu_time
+
+    def collect(self):
+        """采集所有进程的信息"""
+        processes = []
+        for pid in self.pids():
+            record = self.read_process(pid)
+            if record is not None:
+                processes.append(record)
+        return processes
+
+    def cpu_times(self, pids):
+        """
+        只读取 stat 获取一组进程的累计 CPU 时间
+
+        返回:
+            dict: 进程ID -> 累计 CPU 时间（秒）
+        """
+        times = {}
+        for pid in pids:
+            try:
+                times[pid] = self._parse_stat(self._read(pid, 'stat'))[2]
+            except (OSError, ValueError, IndexError):
+                continue
+        return times
+
+def get_procfs_collector():
+    """在 Linux 上返回读取 PROC_ROOT 的采集器，其他平台返回 None"""
+    if IS_LINUX and os.path.isdir(PROC_ROOT):
+        return ProcFSCollector(PROC_ROOT, proportional=COLLECT_PSS)
+    return None
+
+def _is_name_char(char):
+    """判断字符是否属于文件名或单词的一部分，用于检查匹配边界"""
+    return char.isalnum() or char in '_.-'
+
+def _process_name_keys(proc):
+    """
+    返回按名称匹配进程时使用的键
+
+    只看进程名和命令行 argv[0] 的文件名（Windows 上只看进程名），统一小写并去掉 .exe 后缀，
+    再按空格取各级前缀（从长到短），例如 Slack Helper (Renderer) 得到
+    slack helper (renderer)、slack helper、slack。命令行中的参数和目录名不参与名称匹配，
+    因此应用 code 不会匹配 ~/code/x、code.py 或 vscode-x。
+
+    macOS/Linux 上 /Library/ 和 /System/ 下的进程（Electron Helper 除外）不参与名称匹配，返回空列表。
+
+    参数:
+        proc: 进程记录
+
+    返回:
+        list: 名称键列表，较长的在前
+    """
+    names = [proc['name']]
+    if not IS_WINDOWS:
+        command = proc['command']
+        if 'Electron Helper' not in command and ('/Library/' in command or '/System/' in command):
+            return []
+        names.append(os.path.basename(command.split(' -', 1)[0].strip()))
+
+    keys = []
+    for name in names:
+        name = name.strip().lower()
+        if name.endswith('.exe'):
+            name = name[:-4]
+        words = name.split()
+        for count in range(len(words), 0, -1):
+            key = ' '.join(words[:count])
+            if key not in keys:
+                keys.append(key)
+    keys.sort(key=len, reverse=True)
+    return keys
+
+class AppProcessMatcher:
+    """
+    多模式进程匹配器
+
+    用所有应用的路径构建一个 Aho-Corasick 自动机。每个进程的可执行文件路径和命令行只扫描一遍，
+    就能同时得到它匹配的全部应用，不再为每个应用单独遍历一次进程表。
+
+    应用名称只与进程名或 argv[0] 的文件名比较（见 _process_name_keys），要求完全相等或是按空格
+    分段的前缀，因此应用 code 不会匹配 Xcode，也不会匹配命令行里提到 code 的 shell 或脚本进程。
+
+    多个应用同时匹配同一进程时按特异性裁决：路径匹配优先于名称匹配，更长（更具体）的路径或名称优先。
+    """
+
+    def __init__(self, app_paths):
+        """
+        参数:
+            app_paths: 所有已检测到的应用路径
+        """
+        self.apps = sorted(set(app_paths))
+        self._patterns = []     # (应用路径, 模式长度)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._names = {}        # 小写应用名称 -> 应用路径
+        for app_path in self.apps:
+            self._add(_path_key(app_path), app_path)
+            self._names.setdefault(_app_base_name(app_path).lower(), app_path)
+        self._build()
+
+    def _add(self, pattern, app_path):
+        """把一个模式加入字典树"""
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(len(self._patterns))
+        self._patterns.append((app_path, len(pattern)))
+
+    def _build(self):
+        """按广度优先顺序计算失配指针，并把失配状态的输出合并进来"""
+        pending = list(self._goto[0].values())  # 第一层状态的失配指针都指向根
+        for state in pending:
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _scan(self, text):
+        """扫描文本，逐个产生 (匹配结束位置, 模式序号)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in out[state]:
+                yield index, pattern
+
+    def match(self, proc):
+        """
+        匹配单个进程
+
+        参数:
+            proc: 进程记录
+
+        返回:
+            tuple: (路径匹配的应用, 名称匹配的应用)，没有匹配时对应项为 None
+        """
+        exe = proc['exe'].replace('\\', '/').lower()
+        command = proc['command'].replace('\\', '/').lower()
+        # 两段文本用 \0 连接，只扫描一遍
+        text = '\0'.join((exe, command))
+        command_start = len(exe) + 1
+        # 已知可执行文件时，只有系统 Electron 运行时（electron /opt/app/app.asar）才按命令行参数中的路径匹配，
+        # 避免 vim、shell 等只是在参数里提到应用路径的进程连同整棵子树被归属给应用
+        command_paths = not exe or os.path.basename(exe).startswith('electron')
+
+        best = None
+        for end, index in self._scan(text):
+            app_path, length = self._patterns[index]
+            start = end - length + 1
+            before = text[start - 1] if start > 0 else '\0'
+            after = text[end + 1] if end + 1 < len(text) else '\0'
+            if _is_name_char(before) or before == '/' or _is_name_char(after):
+                continue
+            if start >= command_start and not command_paths:
+                continue
+            if best is None or length > best[1]:
+                best = (app_path, length)
+
+        name_app = None
+        for key in _process_name_keys(proc):
+            if key in self._names:
+                name_app = self._names[key]
+                break
+
+        return (best[0] if best else None), name_app
+
+class ProcessSnapshot:
+    """
+    进程表快照
+
+    每次扫描只采集一次进程表，并按可执行文件路径、应用包根目录、命令行词元和父进程ID建立索引。
+    之后每个应用的进程查找都是对快照的索引查询，不再为每个应用重新运行 ps 或遍历 psutil。
+    快照建立后只读，可以在多个工作线程之间共享；assign_apps 需要在共享之前调用。
+    """
+
+    def __init__(self, processes, timestamp=None):
+        """
+        参数:
+            processes: 进程记录列表，每条记录是包含 pid、ppid、name、exe、command、
+                       rss、pss、uss（字节，pss/uss 未采集时为 None）、num_threads、cpu_time（秒）的字典
+            timestamp: 采集时间，默认为当前时间
+        """
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.processes = {proc['pid']: proc for proc in processes}
+        self._by_exe = {}
+        self._by_root = {}
+        self._by_token = {}
+        self._children = {}
+        self._assigned = {}
+        for proc in self.processes.values():
+            self._index(proc)
+
+    @classmethod
+    def capture(cls):
+        """
+        采集当前系统的进程表
+
+        返回:
+            ProcessSnapshot: 新的进程快照，采集失败时返回空快照
+        """
+        try:
+            collector = get_procfs_collector()
+            if collector is not None:
+                # Linux 上直接读取 /proc 最快
+                processes = collector.collect()
+            elif HAS_PSUTIL:
+                processes = _collect_processes_psutil()
+            elif IS_WINDOWS:
+                processes = _collect_processes_tasklist()
+            else:
+                processes = _collect_processes_ps()
+        except Exception as e:
+            print(f"采集进程信息时出错: {str(e)}")
+            processes = []
+        return cls(processes)
+
+    def _index(self, proc):
+        """把单个进程加入各个索引，并标记其 Chromium 角色"""
+        pid = proc['pid']
+        proc['role'] = chromium_process_role(proc['command'])
+        if proc['ppid'] and proc['ppid'] != pid:
+            self._children.setdefault(proc['ppid'], []).append(pid)
+
+        paths = []
+        if proc['exe']:
+            self._by_exe.setdefault(_path_key(proc['exe']), set()).add(pid)
+            paths.append(proc['exe'])
+        paths.extend(_command_paths(proc['command']))
+        for path in paths:
+            for root in _path_roots(path):
+                self._by_root.setdefault(root, set()).add(pid)
+
+        for token in _tokenize(proc['name'] + ' ' + proc['command']):
+            self._by_token.setdefault(token, set()).add(pid)
+
+    def __len__(self):
+        return len(self.processes)
+
+    def find_by_exe(self, exe_path):
+        """按可执行文件路径查找进程，返回进程ID集合"""
+        return set(self._by_exe.get(_path_key(exe_path), ()))
+
+    def find_by_root(self, root_path):
+        """查找可执行文件或命令行路径位于指定目录（或应用包）下的进程，返回进程ID集合"""
+        return set(self._by_root.get(_path_key(root_path), ()))
+
+    def find_by_tokens(self, text):
+        """查找命令行包含文本中全部词元的进程，返回进程ID集合"""
+        tokens = _tokenize(text)
+        if not tokens:
+            return set()
+        postings = sorted((self._by_token.get(token, set()) for token in tokens), key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def ancestry(self, pid):
+        """返回进程自身及其全部祖先进程的进程ID集合"""
+        chain = set()
+        while pid in self.processes and pid not in chain:
+            chain.add(pid)
+            pid = self.processes[pid]['ppid']
+        return chain
+
+    def children(self, pid):
+        """返回直接子进程的进程ID列表"""
+        return list(self._children.get(pid, ()))
+
+    def descendants(self, pids):
+        """
+        返回一组进程及其全部后代进程
+
+        参数:
+            pids: 作为根的进程ID
+
+        返回:
+            set: 根进程和所有后代进程的进程ID
+        """
+        result = set()
+        stack = [pid for pid in pids if pid in self.processes]
+        while stack:
+            pid = stack.pop()
+            if pid in result:
+                continue
+            result.add(pid)
+            stack.extend(self._children.get(pid, ()))
+        return result
+
+    def assign_apps(self, app_paths):
+        """
+        一次遍历进程表，把每个进程归属到至多一个应用
+
+        用 AppProcessMatcher 对每个进程只扫描一遍，得到路径匹配和名称匹配的应用。
+        路径匹配的进程是应用的根进程，其余进程归属于最近的根进程祖先，因此整棵进程树归属同一个应用，
+        嵌套在另一个应用进程树中的应用按自己的根进程划分。
+
+        没有任何根进程的应用才使用名称匹配，名称匹配的进程只归属它自己，不带上后代进程；
+        扫描器自身及其祖先进程（运行它的 shell、终端等）不参与名称匹配。
+
+        参数:
+            app_paths: 所有已检测到的应用路径
+
+        返回:
+            dict: 应用路径 -> 按进程ID排序的进程记录列表
+        """
+        matcher = AppProcessMatcher(app_paths)
+        by_path = {}
+        by_name = {}
+        for pid, proc in self.processes.items():
+            path_app, name_app = matcher.match(proc)
+            if path_app is not None:
+                by_path[pid] = path_app
+            elif name_app is not None:
+                by_name[pid] = name_app
+
+        owner = dict(by_path)
+
+        # 沿父进程链向上找到最近的已归属进程，途经的进程一并记下，每个进程只访问一次
+        for pid in self.processes:
+            chain = []
+            visited = set()
+            current = pid
+            while current not in owner and current in self.processes and current not in visited:
+                chain.append(current)
+                visited.add(current)
+                current = self.processes[current]['ppid']
+            app_path = owner.get(current)
+            for item in chain:
+                owner[item] = app_path
+
+        rooted = set(by_path.values())
+        own = self.ancestry(os.getpid())
+        for pid, app_path in by_name.items():
+            if app_path not in rooted and owner.get(pid) is None and pid not in own:
+                owner[pid] = app_path
+
+        assigned = {app_path: [] for app_path in app_paths}
+        for pid in sorted(self.processes):
+            if owner.get(pid) is not None:
+                assigned[owner[pid]].append(self.processes[pid])
+        self._assigned.update(assigned)
+        return assigned
+
+    def find_app_processes(self, app_path, app_name=None):
+        """
+        查找属于指定应用的进程
+
+        应用已经通过 assign_apps 统一归属时直接返回归属结果。
+
+        先按可执行文件（或命令行中的路径）位于应用路径下找到应用的根进程，
+        再通过父进程索引把根进程的整棵进程树归属给应用，命令行中不含应用名称的
+        渲染进程、GPU 进程和工具进程也能被找到。
+
+        只有找不到根进程时（例如 tasklist 不提供父进程和可执行文件路径）才按名称匹配：
+        进程名或 argv[0] 的文件名等于应用名称或以它开头的空格分段（见 _process_name_keys）。
+        名称匹配的进程不带上后代进程，扫描器自身及其祖先进程也不参与名称匹配
+
+        参数:
+            app_path: 应用程序包或目录的路径
+            app_name: 应用名称，默认从路径中提取
+
+        返回:
+            list: 匹配的进程记录，按进程ID排序
+        """
+        if app_path in self._assigned:
+            return list(self._assigned[app_path])
+
+        roots = self.find_by_root(app_path)
+        if roots:
+            return [self.processes[pid] for pid in sorted(self.descendants(roots))]
+
+        if app_name is None:
+            app_name = _app_base_name(app_path)
+
+        matched = set()
+        name_key = app_name.lower()
+
+        own = self.ancestry(os.getpid())
+        for pid in self.find_by_tokens(app_name):
+            if pid not in own and name_key in _process_name_keys(self.processes[pid]):
+                matched.add(pid)
+
+        return [self.processes[pid] for pid in sorted(matched)]
+
+class CpuSampler:
+    """
+    批量 CPU 使用率采样器
+
+    支持两种模式：
+    - interval: 先对所有进程一起建立基准，统一等待一个采样间隔，再一次性读取全部增量，
+                总耗时与应用和进程数量无关
+    - delta:    零等待模式，用当前累计 CPU 时间（utime + stime）与基准快照比较计算使用率
+    """
+
+    MODES = ('interval', 'delta')
+
+    def __init__(self, mode='interval', interval=0.5, baseline=None):
+        """
+        参数:
+            mode: 采样模式，interval 或 delta
+            interval: interval 模式下的共享采样间隔（秒）
+            baseline: delta 模式下作为基准的进程快照（ProcessSnapshot）
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的CPU采样模式: {mode}")
+        self.mode = mode
+        self.interval = interval
+        self.baseline = baseline
+
+    def sample(self, pids):
+        """
+        批量采样一组进程的 CPU 使用率
+
+        参数:
+            pids: 进程ID列表（可包含多个应用的进程）
+
+        返回:
+            dict: 进程ID -> CPU 使用率（100% 表示一个核心满负荷）
+        """
+        pids = sorted(set(pids))
+        if not pids:
+            return {}
+
+        if self.mode == 'delta':
+            baseline = self.baseline
+            if baseline is None:
+                baseline = ProcessSnapshot.capture()
+                time.sleep(self.interval)
+            return self._sample_delta(pids, baseline)
+
+        collector = get_procfs_collector()
+        if collector is not None:
+            before = collector.cpu_times(pids)
+            start = time.time()
+            time.sleep(self.interval)
+            after = collector.cpu_times(pids)
+            return _cpu_percent_from_times(before, after, time.time() - start)
+
+        if HAS_PSUTIL:
+            return self._sample_interval_psutil(pids)
+
+        # 没有 psutil 时，用间隔前后的两次进程快照计算
+        before = ProcessSnapshot.capture()
+        time.sleep(self.interval)
+        return _cpu_percent_between(before, ProcessSnapshot.capture(), pids)
+
+    def _sample_interval_psutil(self, pids):
+        """对所有进程统一建立基准，等待一个间隔后一次性读取"""
+        procs = {}
+        for pid in pids:
+            try:
+                proc = psutil.Process(pid)
+                proc.cpu_percent(interval=None)  # 第一次调用只建立基准
+                procs[pid] = proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+        time.sleep(self.interval)
+
+        samples = {}
+        for pid, proc in procs.items():
+            try:
+                samples[pid] = proc.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return samples
+
+    def _sample_delta(self, pids, baseline):
+        """读取当前累计 CPU 时间并与基准快照比较，不等待"""
+        now = time.time()
+        collector = get_procfs_collector()
+        if collector is not None:
+            before = {pid: baseline.processes[pid]['cpu_time'] for pid in pids
+                      if pid in baseline.processes and baseline.processes[pid]['cpu_time'] is not None}
+            return _cpu_percent_from_times(before, collector.cpu_times(before), now - baseline.timestamp)
+
+        if HAS_PSUTIL:
+            samples = {}
+            elapsed = now - baseline.timestamp
+            for pid in pids:
+                before = baseline.processes.get(pid)
+                if not before or before['cpu_time'] is None or elapsed <= 0:
+                    continue
+                try:
+                    cpu = psutil.Process(pid).cpu_times()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+                samples[pid] = max(0.0, (cpu.user + cpu.system - before['cpu_time']) / elapsed * 100)
+            return samples
+
+        return _cpu_percent_between(baseline, ProcessSnapshot.capture(), pids)
+
+def _cpu_percent_from_times(before, after, elapsed):
+    """
+    根据前后两次的累计 CPU 时间计算 CPU 使用率
+
+    参数:
+        before: 进程ID -> 较早的累计 CPU 时间（秒）
+        after: 进程ID -> 较晚的累计 CPU 时间（秒）
+        elapsed: 两次读取之间经过的时间（秒）
+
+    返回:
+        dict: 进程ID -> CPU 使用率
+    """
+    if elapsed <= 0:
+        return {}
+    return {pid: max(0.0, (after[pid] - before[pid]) / elapsed * 100) for pid in after if pid in before}
+
+def _cpu_percent_between(before, after, pids):
+    """
+    根据两个进程快照的累计 CPU 时间计算 CPU 使用率
+
+    参数:
+        before: 较早的进程快照
+        after: 较晚的进程快照
+        pids: 要计算的进程ID
+
+    返回:
+        dict: 进程ID -> CPU 使用率
+    """
+    samples = {}
+    elapsed = after.timestamp - before.timestamp
+    if elapsed <= 0:
+        return samples
+
+    for pid in pids:
+        old = before.processes.get(pid)
+        new = after.processes.get(pid)
+        if not old or not new or old['cpu_time'] is None or new['cpu_time'] is None:
+            continue
+        samples[pid] = max(0.0, (new['cpu_time'] - old['cpu_time']) / elapsed * 100)
+    return samples
+
+# powermetrics 进程能耗行: 进程名 PID 若干数值列，最后一列为 Energy Impact
+POWERMETRICS_TASK_PATTERN = re.compile(r'^\s*(?P<name>.+?)\s+(?P<pid>-?\d+)\s+(?P<values>-?[\d.]+(?:\s+-?[\d.]+)+)\s*$')
+
+def parse_powermetrics_energy(output):
+    """
+    解析 powermetrics --show-process-energy 的输出
+
+    参数:
+        output: powermetrics 的文本输出
+
+    返回:
+        dict: 进程ID -> Energy Impact
+    """
+    energy = {}
+    for line in output.split('\n'):
+        match = POWERMETRICS_TASK_PATTERN.match(line)
+        if not match:
+            continue
+        try:
+            energy[int(match.group('pid'))] = float(match.group('values').split()[-1])
+        except ValueError:
+            continue
+    return energy
+
+class EnergySampler:
+    """
+    共享的能耗采样器
+
+    整个扫描只运行一次 powermetrics，一次性得到所有进程的能耗，
+    之后每个应用只需在 进程ID -> 能耗 映射中查找自己的进程。
+    """
+
+    def __init__(self, interval_ms=100):
+        """
+        参数:
+            interval_ms: powermetrics 的采样间隔（毫秒）
+        """
+        self.interval_ms = interval_ms
+        self._samples = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        """powermetrics 只在 macOS 上可用，并且需要管理员权限"""
+        return IS_MACOS and bool(shutil.which('sudo')) and os.geteuid() == 0
+
+    def sample(self):
+        """
+        获取所有进程的能耗，第一次调用时采样，之后直接返回同一份结果
+
+        返回:
+            dict: 进程ID -> Energy Impact，不可用或采样失败时为空字典
+        """
+        with self._lock:
+            if self._samples is None:
+                self._samples = {}
+                if self.available():
+                    cmd = ['sudo', 'powermetrics', '-n', '1', '-i', str(self.interval_ms), '--show-process-energy']
+                    try:
+                        result = run_command(cmd)
+                        if result.returncode == 0:
+                            self._samples = parse_powermetrics_energy(result.stdout)
+                    except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError):
+                        pass
+            return self._samples
+
+def _energy_impact(energy_samples, pids):
+    """汇总一组进程的能耗，没有数据时返回 'N/A'"""
+    values = [energy_samples[pid] for pid in pids if pid in energy_samples]
+    return f"{sum(values):.1f}" if values else 'N/A'
+
+def _sum_memory_mb(processes, key):
+    """汇总进程的某项内存（MB），没有任何进程采集到该项时返回 None"""
+    values = [proc[key] for proc in processes if proc.get(key) is not None]
+    if not values:
+        return None
+    return sum(values) / (1024 * 1024)
+
+def _process_memory(proc):
+    """返回单个进程用于统计的内存字节数：优先 PSS，其次 USS，最后 RSS"""
+    if COLLECT_PSS:
+        for key in ('pss', 'uss'):
+            if proc.get(key) is not None:
+                return proc[key]
+    return proc['rss']
+
+def _by_role(processes, value):
+    """
+    按 Chromium 进程角色汇总一个数值
+
+    参数:
+        processes: 进程记录列表
+        value: 从进程记录计算数值的函数
+
+    返回:
+        dict: 角色 -> 该角色所有进程的数值之和
+    """
+    totals = {}
+    for proc in processes:
+        role = proc.get('role') or chromium_process_role(proc['command'])
+        totals[role] = totals.get(role, 0) + value(proc)
+    return totals
+
+def _memory_info_from_processes(processes):
+    """
+    根据匹配到的进程汇总内存使用信息
+
+    RSS 会把渲染进程、GPU 进程等共享的 Chromium 映射重复计算多次；
+    开启 PSS 采集时同时汇总按比例分摊后的 PSS 和进程独占的 USS，无法采集时为 None。
+    """
+    details = []
+    total_memory = 0
+    for proc in processes:
+        mem = proc['rss'] / (1024 * 1024)  # 转换为MB
+        total_memory += mem
+        detail = {
+            'pid': proc['pid'],
+            'role': proc.get('role') or chromium_process_role(proc['command']),
+            'memory_mb': mem,
+            'command': proc['exe'] or proc['command']
+        }
+        if COLLECT_PSS:
+            for key in ('pss', 'uss'):
+                detail[f'{key}_mb'] = proc[key] / (1024 * 1024) if proc.get(key) is not None else None
+        details.append(detail)
+
+    return {
+        'running': len(details) > 0,
+        'memory_mb': total_memory,
+        'pss_mb': _sum_memory_mb(processes, 'pss'),
+        'uss_mb': _sum_memory_mb(processes, 'uss'),
+        'memory_by_role': _by_role(processes, lambda proc: proc['rss'] / (1024 * 1024)),
+        'processes_by_role': _by_role(processes, lambda proc: 1),
+        'processes': len(details),
+        'status': f"运行中 ({len(details)} 进程)" if len(details) > 0 else "未运行",
+        'process_details': details if len(details) > 0 else None
+    }
+
+def get_memory_usage_windows(app_path, snapshot=None):
+    """
+    获取Windows上应用程序的内存使用情况
+
+    参数:
+        app_path: 应用程序目录的路径
+        snapshot: 本次扫描共享的进程快照，为 None 时临时采集一次
+
+    返回:
+        dict: 包含内存使用信息的字典，包括总内存、是否运行中等
+    """
+    try:
+        if snapshot is None:
+            snapshot = ProcessSnapshot.capture()
+        return _memory_info_from_processes(snapshot.find_app_processes(app_path))
+    except Exception as e:
+        print(f"获取应用 {app_path} 内存使用情况时出错: {str(e)}")
+        return {
+            'running': False,
+            'memory_mb': 0,
+            'processes': 0,
+            'status': '未知'
+        }
+
+def get_memory_usage(app_path, snapshot=None):
+    """
+    获取应用程序的内存使用情况
+
+    参数:
+        app_path: 应用程序包的路径
+        snapshot: 本次扫描共享的进程快照，为 None 时临时采集一次
+
+    返回:
+        dict: 包含内存使用信息的字典，包括总内存、是否运行中等
+    """
+    # 根据平台选择相应的实现
+    if IS_WINDOWS:
+        return get_memory_usage_windows(app_path, snapshot)
+
+    # macOS实现
+    try:
+        if snapshot is None:
+            snapshot = ProcessSnapshot.capture()
+        return _memory_info_from_processes(snapshot.find_app_processes(app_path))
+    except Exception as e:
+        print(f"获取应用 {app_path} 内存使用情况时出错: {str(e)}")
+        return {
+            'running': False,
+            'memory_mb': 0,
+            'processes': 0,
+            'status': '未知'
+        }
+
+def get_process_performance_windows(app_path, snapshot=None, cpu_samples=None):
+    """
+    获取Windows上应用程序的性能信息，包括CPU使用率
+
+    参数:
+        app_path: 应用程序目录的路径
+        snapshot: 本次扫描共享的进程快照，为 None 时临时采集一次
+        cpu_samples: 批量采样得到的 进程ID -> CPU 使用率 映射，为 None 时只对本应用的进程采样
+
+    返回:
+        dict: 包含性能信息的字典，包括CPU使用率等
+    """
+    try:
+        performance_info = {
+            'cpu_percent': 0,
+            'num_threads': 0,
+            'energy_impact': 'N/A',  # Windows不提供能耗信息
+            'has_performance_data': False
+        }
+
+        # 如果没有psutil库，无法获取详细的性能信息
+        if not HAS_PSUTIL:
+            return performance_info
+
+        if snapshot is None:
+            snapshot = ProcessSnapshot.capture()
+        processes = snapshot.find_app_processes(app_path)
+
+        if not processes:
+            return performance_info
+
+        # 获取CPU使用率（所有进程共享一个采样间隔）
+        pids = [proc_info['pid'] for proc_info in processes]
+        if cpu_samples is None:
+            cpu_samples = CpuSampler().sample(pids)
+        total_cpu_percent = sum(cpu_samples.get(pid, 0) for pid in pids)
+
+        performance_info = {
+            'cpu_percent': total_cpu_percent,
+            'cpu_by_role': _by_role(processes, lambda proc: cpu_samples.get(proc['pid'], 0)),
+            'num_threads': sum(proc_info['num_threads'] for proc_info in processes),
+            'energy_impact': 'N/A',  # Windows不提供能耗信息
+            'has_performance_data': True
+        }
+
+        return performance_info
+
+    except Exception as e:
+        print(f"获取应用 {app_path} 性能信息时出错: {str(e)}")
+        return {
+            'cpu_percent': 0,
+            'num_threads': 0,
+            'energy_impact': 'N/A',
+            'has_performance_data': False
+        }
+
+def get_process_performance(app_path, snapshot=None, cpu_samples=None, energy_samples=None):
+    """
+    获取应用程序的性能信息，包括 CPU 使用率和能耗情况
+
+    参数:
+        app_path: 应用程序包的路径
+        snapshot: 本次扫描共享的进程快照，为 None 时临时采集一次
+        cpu_samples: 批量采样得到的 进程ID -> CPU 使用率 映射，为 None 时只对本应用的进程采样
+        energy_samples: 共享采样得到的 进程ID -> 能耗 映射（EnergySampler），为 None 时临时采样一次
+
+    返回:
+        dict: 包含性能信息的字典，包括 CPU 使用率、能耗等
+    """
+    # 根据平台选择相应的实现
+    if IS_WINDOWS:
+        return get_process_performance_windows(app_path, snapshot, cpu_samples)
+
+    # macOS实现
+    try:
+        performance_info = {
+            'cpu_percent': 0,
+            'num_threads': 0,
+            'energy_impact': 'N/A',
+            'has_performance_data': False
+        }
+
+        # 从进程快照中查找应用的进程
+        if snapshot is None:
+            snapshot = ProcessSnapshot.capture()
+        processes = snapshot.find_app_processes(app_path)
+        pids = [proc_info['pid'] for proc_info in processes]
+
+        if not pids:
+            return performance_info
+
+        # 获取 CPU 使用率（100% 表示一个核心的满负荷），所有进程共享一个采样间隔
+        if cpu_samples is None:
+            cpu_samples = CpuSampler().sample(pids)
+        total_cpu_percent = sum(cpu_samples.get(pid, 0) for pid in pids)
+        total_threads = sum(proc_info['num_threads'] for proc_info in processes)
+        
+        # 获取能耗信息（使用 powermetrics，需要管理员权限），所有应用共享一次采样
+        if energy_samples is None:
+            energy_samples = EnergySampler().sample()
+        energy_impact = _energy_impact(energy_samples, pids)
+        
+        performance_info = {
+            'cpu_percent': total_cpu_percent,
+            'cpu_by_role': _by_role(processes, lambda proc: cpu_samples.get(proc['pid'], 0)),
+            'num_threads': total_threads,
+            'energy_impact': energy_impact,
+            'has_performance_data': len(pids) > 0
+        }
+        
+        return performance_info
+    
+    except Exception as e:
+        print(f"获取应用 {app_path} 性能信息时出错: {str(e)}")
+        return {
+            'cpu_percent': 0,
+            'num_threads': 0,
+            'energy_impact': 'N/A',
+            'has_performance_data': False
+        }
+
+def get_bundle_info(app_path, timings=None):
+    """
+    分析应用包本身的信息：应用版本、Electron 版本和大小
+    
+    只依赖磁盘上的应用包，结果可以缓存，也可以在子进程中计算后返回。
+    
+    参数:
+        app_path: 应用程序包的路径
+        timings: 可选的字典，写入 version 和 sizing 两个阶段的耗时（秒）
+        
+    返回:
+        dict: 包含 path、version、electron_version、size、allocated_size 的字典
+    """
+    bundle_info = get_bundle_versions(app_path, timings)
+    bundle_info.update(get_bundle_size(bundle_info['path'], timings))
+    return bundle_info
+
+def get_bundle_versions(app_path, timings=None):
+    """
+    分析应用包的应用版本和 Electron 版本（以解析为主，hybrid 模式下在进程池中执行）
+    
+    参数:
+        app_path: 应用程序包的路径
+        timings: 可选的字典，写入 version 阶段的耗时（秒）
+        
+    返回:
+        dict: 包含 path（Windows 上 .exe 换算为所在目录）、version、electron_version 的字典
+    """
+    version_start = time.perf_counter()
+    
+    # 获取应用版本
+    app_version = "未知"
+    if IS_MACOS:
+        plist_path = os.path.join(app_path, 'Contents', 'Info.plist')
+        if os.path.exists(plist_path):
+            try:
+                with open(plist_path, 'rb') as fp:
+                    plist_data = plistlib.load(fp)
+                    app_version = plist_data.get('CFBundleShortVersionString', "未知")
+            except Exception:
+                pass
+    elif IS_WINDOWS:
+        # 对于Windows，尝试从可执行文件获取版本信息
+        if HAS_PSUTIL:
+            try:
+                # 查找主可执行文件
+                exe_files = []
+                if os.path.isdir(app_path):
+                    exe_files = [f for f in os.listdir(app_path) if f.lower().endswith('.exe')]
+                elif app_path.lower().endswith('.exe'):
+                    exe_files = [os.path.basename(app_path)]
+                    app_path = os.path.dirname(app_path)
+            
+                if exe_files:
+                    exe_path = os.path.join(app_path, exe_files[0])
+                    # 使用wmic获取版本信息
+                    wmic_path = exe_path.replace('\\', '\\\\')
+                    cmd = ['wmic', 'datafile', 'where', f'name="{wmic_path}"', 'get', 'Version', '/value']
+                    try:
+                        result = run_command(cmd)
+                        if result.returncode == 0:
+                            output = result.stdout
+                            version_match = re.search(r'Version=(.+)', output)
+                            if version_match:
+                                app_version = version_match.group(1).strip()
+                    except Exception:
+                        pass
+            except Exception:
+                pass
+    elif IS_LINUX:
+        # 对于Linux，从 app.asar 内的 package.json 获取应用版本
+        package_data = read_asar_package_json(os.path.join(app_path, 'resources', 'app.asar'))
+        if package_data and package_data.get('version'):
+            app_version = str(package_data['version'])
+
+    # 获取 Electron 版本
+    electron_version = get_electron_version(app_path)
+    
+    if timings is not None:
+        timings['version'] = time.perf_counter() - version_start
+    
+    return {
+        'path': app_path,
+        'version': app_version,
+        'electron_version': electron_version
+    }
+
+def get_bundle_size(app_path, timings=None):
+    """
+    统计应用包的表观大小和实际占用的磁盘空间（以 I/O 为主，始终可以在线程中执行）
+    
+    参数:
+        app_path: 应用程序包或目录的路径
+        timings: 可选的字典，写入 sizing 阶段的耗时（秒）
+        
+    返回:
+        dict: 包含 size 和 allocated_size（MB）的字典
+    """
+    sizing_start = time.perf_counter()
+    try:
+        usage = get_dir_usage(app_path)
+        app_size = usage['apparent_bytes'] / (1024 * 1024)  # 转换为MB
+        allocated_size = usage['allocated_bytes'] / (1024 * 1024)
+    except Exception as e:
+        print(f"获取 {app_path} 大小时出错: {str(e)}")
+        app_size = allocated_size = 0
+
+    if timings is not None:
+        timings['sizing'] = time.perf_counter() - sizing_start
+    
+    return {
+        'size': app_size,
+        'allocated_size': allocated_size
+    }
+
+def get_app_info(app_path, analyze_memory=False, analyze_performance=False, snapshot=None, cached_info=None):
+    """
+    获取应用程序的详细信息
+    
+    参数:
+        app_path: 应用程序包的路径
+        analyze_memory: 是否分析内存使用情况
+        analyze_performance: 是否分析性能信息（CPU、能耗等）
+        snapshot: 本次扫描共享的进程快照（ProcessSnapshot）
+        cached_info: 扫描缓存中保存的或已分析好的 get_bundle_info 结果，提供时跳过重新分析
+        
+    返回:
+        dict: 包含应用信息的字典
+    """
+    try:
+        # 获取应用名称
+        app_name = os.path.basename(app_path)
+        
+        # 根据平台处理应用名称
+        if IS_MACOS:
+            app_name = app_name.replace('.app', '')
+        elif IS_WINDOWS:
+            if app_name.lower().endswith('.exe'):
+                app_name = os.path.splitext(app_name)[0]
+        elif IS_LINUX:
+            # 使用 .desktop 文件中的应用名称
+            app_name = linux_app_names.get(app_path, app_name)
+        
+        # 缓存命中或已在其他进程中分析过时，直接复用版本、Electron 版本和大小
+        bundle_info = cached_info if cached_info is not None else get_bundle_info(app_path)
+        app_path = bundle_info['path']
+        app_version = bundle_info['version']
+        electron_version = bundle_info['electron_version']
+        app_size = bundle_info['size']
+        allocated_size = bundle_info['allocated_size']
+        
+        # 创建基本信息字典
+        app_info = {
+            'name': app_name,
+            'path': app_path,
+            'version': app_version,
+            'electron_version': electron_version,
+            'size': app_size,
+            'allocated_size': allocated_size
+        }
+        
+        # 如果需要分析内存，则获取内存使用情况
+        if analyze_memory:
+            apply_memory_info(app_info, get_memory_usage(app_path, snapshot))
+        
+        # 如果需要分析性能，则获取 CPU 使用率和能耗情况
+        if analyze_performance:
+            apply_performance_info(app_info, get_process_performance(app_path, snapshot))
+        
+        return app_info
+    except Exception as e:
+        print(f"获取应用 {app_path} 信息时出错: {str(e)}")
+        base_info = {
+            'name': os.path.basename(app_path).replace('.app', '') if IS_MACOS else os.path.splitext(os.path.basename(app_path))[0] if IS_WINDOWS and app_path.lower().endswith('.exe') else os.path.basename(app_path),
+            'path': app_path,
+            'version': "未知",
+            'electron_version': "未知",
+            'size': 0,
+            'allocated_size': 0
+        }
+        
+        # 如果需要分析内存，添加默认内存信息
+        if analyze_memory:
+            base_info.update({
+                'memory_mb': 0,
+                'running': False,
+                'processes': 0,
+                'status': '未知',
+                'memory_by_role': {},
+                'processes_by_role': {},
+                'memory_size_ratio': 0
+            })
+            if COLLECT_PSS:
+                base_info.update({'memory_pss_mb': None, 'memory_uss_mb': None})
             
-            # 检查是否是目标应用的进程
-            is_target = False
+        # 如果需要分析性能，添加默认性能信息
+        if analyze_performance:
+            base_info.update({
+                'cpu_percent': 0,
+                'cpu_by_role': {},
+                'num_threads': 0,
+                'energy_impact': 'N/A',
+                'has_performance_data': False
+            })
             
-            # 检查命令行是否包含应用路径
-            if re.search(app_path_pattern, command, re.IGNORECASE):
-                is_target = True
-            # 检查命令行是否包含应用名称（更宽松的匹配）
-            elif re.search(app_name_pattern, command, re.IGNORECASE):
-                # 排除可能的误匹配（例如，如果应用名是常见词）
-                if not re.search(r'\/Library\/', command) and not re.search(r'\/System\/', command):
-                    is_target = True
-            # 检查是否是 Electron Helper 进程
-            elif 'Electron Helper' in command and app_name_pattern in command:
-                is_target = True
-                
-            if is_target:
-                try:
-                    pids.append(int(pid))
-                except ValueError:
-                    pass
+        return base_info
+
+def apply_memory_info(app_info, memory_info):
+    """把内存使用信息写入应用信息字典"""
+    app_info.update({
+        'memory_mb': memory_info['memory_mb'],
+        'running': memory_info['running'],
+        'processes': memory_info['processes'],
+        'status': memory_info['status'],
+        'memory_by_role': memory_info.get('memory_by_role', {}),
+        'processes_by_role': memory_info.get('processes_by_role', {})
+    })
+    # 采集了 PSS 时，内存/大小比例按 PSS 计算，避免共享映射被重复计算
+    ratio_memory = memory_info['memory_mb']
+    if COLLECT_PSS:
+        app_info['memory_pss_mb'] = memory_info.get('pss_mb')
+        app_info['memory_uss_mb'] = memory_info.get('uss_mb')
+        if app_info['memory_pss_mb'] is not None:
+            ratio_memory = app_info['memory_pss_mb']
+    app_info['memory_size_ratio'] = ratio_memory / app_info['size'] if app_info['size'] > 0 else 0
+
+def collect_memory(results, snapshot):
+    """
+    对所有扫描结果统一采集内存使用信息
+
+    参数:
+        results: get_app_info 返回的应用信息列表，会被原地更新
+        snapshot: 已通过 assign_apps 完成进程归属的进程快照
+    """
+    for app_info in results:
+        with scan_telemetry.stage('memory', app_info['path']):
+            apply_memory_info(app_info, get_memory_usage(app_info['path'], snapshot))
+
+def apply_performance_info(app_info, performance_info):
+    """把性能信息写入应用信息字典"""
+    app_info.update({
+        'cpu_percent': performance_info['cpu_percent'],
+        'cpu_by_role': performance_info.get('cpu_by_role', {}),
+        'num_threads': performance_info['num_threads'],
+        'energy_impact': performance_info['energy_impact'],
+        'has_performance_data': performance_info['has_performance_data']
+    })
+
+def collect_performance(results, snapshot, sampler, energy_sampler=None):
+    """
+    对所有扫描结果批量采集性能信息
+
+    先汇总所有应用的进程，只做一次 CPU 采样，再按应用分摊结果，
+    因此 --performance 的耗时不随应用数量增长。
+
+    参数:
+        results: get_app_info 返回的应用信息列表，会被原地更新
+        snapshot: 本次扫描共享的进程快照
+        sampler: CpuSampler 实例
+        energy_sampler: 共享的 EnergySampler，为 None 时临时创建一个
+    """
+    all_pids = []
+    for app_info in results:
+        all_pids.extend(proc['pid'] for proc in snapshot.find_app_processes(app_info['path']))
+
+    with scan_telemetry.stage('performance'):
+        cpu_samples = sampler.sample(all_pids)
+        energy_samples = (energy_sampler or EnergySampler()).sample()
+
+    for app_info in results:
+        with scan_telemetry.stage('performance', app_info['path']):
+            apply_performance_info(app_info, get_process_performance(app_info['path'], snapshot, cpu_samples,
+                                                                     energy_samples))
+
+# 时间序列存储的磁盘格式：每个层级一个文件，文件头之后是定长记录，只追加写入，可直接 mmap 读取
+TS_MAGIC = b'EATS'
+TS_FORMAT_VERSION = 1
+TS_HEADER = struct.Struct('<4sHH')                 # 魔数、格式版本、记录长度
+TS_RAW_RECORD = struct.Struct('<IdQfH')            # 应用ID、时间戳、内存字节数、CPU 使用率、进程数
+TS_ROLLUP_RECORD = struct.Struct('<IdIQQdQffff')   # 应用ID、桶起始时间、采样数、内存 min/max/avg/last、CPU min/max/avg/last
+
+# 降采样层级: (名称, 桶宽度秒数, 默认保留秒数)
+TS_ROLLUP_TIERS = (
+    ('1m', 60, 7 * 24 * 3600),
+    ('15m', 900, 90 * 24 * 3600),
+)
+TS_RAW_RETENTION = 3600
+# 文件中的记录数超过内存中保留的记录数的这个倍数时，在刷盘时重写文件丢弃过期记录
+TS_COMPACT_RATIO = 2
+TS_COMPACT_MIN_RECORDS = 4096
+
+class _RawSeries:
+    """一个应用的原始采样，按列保存在定型数组中"""
+
+    def __init__(self):
+        self.timestamp = array.array('d')
+        self.memory = array.array('Q')
+        self.cpu = array.array('f')
+        self.processes = array.array('H')
+
+    def append(self, timestamp, memory, cpu, processes):
+        self.timestamp.append(timestamp)
+        self.memory.append(memory)
+        self.cpu.append(cpu)
+        self.processes.append(min(processes, 0xFFFF))
+
+    def trim(self, oldest):
+        """丢弃早于 oldest 的采样"""
+        cut = bisect.bisect_left(self.timestamp, oldest)
+        if cut:
+            for column in (self.timestamp, self.memory, self.cpu, self.processes):
+                del column[:cut]
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in
+                   (self.timestamp, self.memory, self.cpu, self.processes))
+
+class _RollupSeries:
+    """一个应用在某个降采样层级上的数据：已结束的桶按列保存，当前桶单独累计"""
+
+    COLUMNS = (('start', 'd'), ('count', 'I'), ('memory_min', 'Q'), ('memory_max', 'Q'), ('memory_avg', 'd'),
+               ('memory_last', 'Q'), ('cpu_min', 'f'), ('cpu_max', 'f'), ('cpu_avg', 'f'), ('cpu_last', 'f'))
+
+    def __init__(self, width):
+        self.width = width
+        self.columns = {name: array.array(code) for name, code in self.COLUMNS}
+        self.current = None
+
+    def add(self, timestamp, memory, cpu):
+        """
+        累加一个采样
+
+        返回:
+            tuple or None: 采样进入新桶时返回刚结束的桶（与 TS_ROLLUP_RECORD 的字段顺序一致，不含应用ID）
+        """
+        start = timestamp - timestamp % self.width
+        closed = None
+        if self.current is not None and self.current[0] != start:
+            closed = self.close()
+
+        if self.current is None:
+            self.current = [start, 0, memory, memory, 0, memory, cpu, cpu, 0.0, cpu]
+        bucket = self.current
+        bucket[1] += 1
+        bucket[2] = min(bucket[2], memory)
+        bucket[3] = max(bucket[3], memory)
+        bucket[4] += memory
+        bucket[5] = memory
+        bucket[6] = min(bucket[6], cpu)
+        bucket[7] = max(bucket[7], cpu)
+        bucket[8] += cpu
+        bucket[9] = cpu
+        return closed
+
+    def close(self):
+        """结束当前桶并返回它，没有当前桶时返回 None"""
+        if self.current is None:
+            return None
+        start, count, mem_min, mem_max, mem_sum, mem_last, cpu_min, cpu_max, cpu_sum, cpu_last = self.current
+        self.current = None
+        bucket = (start, count, mem_min, mem_max, mem_sum / count, mem_last,
+                  cpu_min, cpu_max, cpu_sum / count, cpu_last)
+        self.extend(bucket)
+        return bucket
+
+    def extend(self, bucket):
+        """追加一个已结束的桶，与最后一个桶起始时间相同时合并（例如上次运行中途写入的部分桶）"""
+        starts = self.columns['start']
+        if starts and starts[-1] == bucket[0]:
+            columns = self.columns
+            old_count = columns['count'][-1]
+            count = old_count + bucket[1]
+            columns['count'][-1] = count
+            columns['memory_min'][-1] = min(columns['memory_min'][-1], bucket[2])
+            columns['memory_max'][-1] = max(columns['memory_max'][-1], bucket[3])
+            columns['memory_avg'][-1] = (columns['memory_avg'][-1] * old_count + bucket[4] * bucket[1]) / count
+            columns['memory_last'][-1] = bucket[5]
+            columns['cpu_min'][-1] = min(columns['cpu_min'][-1], bucket[6])
+            columns['cpu_max'][-1] = max(columns['cpu_max'][-1], bucket[7])
+            columns['cpu_avg'][-1] = (columns['cpu_avg'][-1] * old_count + bucket[8] * bucket[1]) / count
+            columns['cpu_last'][-1] = bucket[9]
+            return
+        for (name, _), value in zip(self.COLUMNS, bucket):
+            self.columns[name].append(value)
+
+    def trim(self, oldest):
+        """丢弃起始时间早于 oldest 的桶"""
+        cut = bisect.bisect_left(self.columns['start'], oldest)
+        if cut:
+            for column in self.columns.values():
+                del column[:cut]
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+def read_timeseries_file(path, record):
+    """
+    通过 mmap 读取时间序列文件中的全部记录
+
+    参数:
+        path: 文件路径
+        record: 记录格式（TS_RAW_RECORD 或 TS_ROLLUP_RECORD）
+
+    返回:
+        list: 解包后的记录元组，文件不存在或格式不符时返回空列表
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < TS_HEADER.size:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, record_size = TS_HEADER.unpack_from(mm, 0)
+                if magic != TS_MAGIC or version != TS_FORMAT_VERSION or record_size != record.size:
+                    print(f"时间序列文件 {path} 的格式不兼容，已忽略")
+                    return []
+                # 只读取完整的记录，忽略写入中断留下的不完整尾部
+                end = TS_HEADER.size + (size - TS_HEADER.size) // record.size * record.size
+                return list(record.iter_unpack(mm[TS_HEADER.size:end]))
+    except (OSError, ValueError):
+        return []
+
+class TimeSeriesStore:
+    """
+    紧凑的监控时间序列存储
+
+    每个应用的指标按列保存在 array 定型数组中，同时滚动汇总到 1 分钟和 15 分钟两个层级，
+    每个桶记录内存和 CPU 的 min/avg/max/last。各层级按时间保留，超出保留期的数据被丢弃。
+
+    指定目录时数据同时写入磁盘：每个层级一个只追加的定长记录文件，可以直接 mmap 读取；
+    应用路径与应用ID的对应关系保存在 apps.json 中。打开已有目录时会载入保留期内的数据，
+    并压缩掉过期的记录；运行期间文件中的记录数超过保留期内记录数的 TS_COMPACT_RATIO 倍时，
+    刷盘时也会重写文件，因此文件大小始终与保留期而不是运行时长成正比。
+    """
+
+    def __init__(self, directory=None, raw_retention=TS_RAW_RETENTION, rollup_retention=None,
+                 flush_interval=10.0):
+        """
+        参数:
+            directory: 数据目录，为 None 时只保存在内存中
+            raw_retention: 原始采样的保留时长（秒）
+            rollup_retention: 层级名称 -> 保留时长（秒），覆盖 TS_ROLLUP_TIERS 中的默认值
+            flush_interval: 把缓冲的写入刷到磁盘的最长间隔（秒）
+        """
+        self.directory = directory
+        self.raw_retention = raw_retention
+        self.retention = {name: retention for name, _, retention in TS_ROLLUP_TIERS}
+        if rollup_retention:
+            self.retention.update(rollup_retention)
+        self.flush_interval = flush_interval
+
+        self.apps = []
+        self._app_ids = {}
+        self._raw = {}
+        self._rollups = {name: {} for name, _, _ in TS_ROLLUP_TIERS}
+        self._files = {}
+        self._file_records = {}
+        self._last_flush = time.monotonic()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+            self._files['raw'] = self._open_file('raw', TS_RAW_RECORD)
+            for name, _, _ in TS_ROLLUP_TIERS:
+                self._files[name] = self._open_file(name, TS_ROLLUP_RECORD)
+
+    def _path(self, name):
+        return os.path.join(self.directory, f'{name}.tsdb')
+
+    def _open_file(self, name, record):
+        """以追加方式打开层级文件，新文件先写入文件头"""
+        f = open(self._path(name), 'ab')
+        if f.tell() == 0:
+            f.write(TS_HEADER.pack(TS_MAGIC, TS_FORMAT_VERSION, record.size))
+        return f
+
+    def _rewrite(self, name, record, rows):
+        """只保留 rows 重写层级文件（压缩过期记录）"""
+        path = self._path(name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(TS_HEADER.pack(TS_MAGIC, TS_FORMAT_VERSION, record.size))
+            for row in rows:
+                f.write(record.pack(*row))
+        os.replace(tmp_path, path)
+
+    def _load(self):
+        """载入目录中保留期内的数据"""
+        try:
+            with open(os.path.join(self.directory, 'apps.json'), 'r', encoding='utf-8') as f:
+                for app_key in json.load(f):
+                    self._app_ids[app_key] = len(self.apps)
+                    self.apps.append(app_key)
+        except (OSError, ValueError):
+            pass
+
+        now = time.time()
+        raw_rows = read_timeseries_file(self._path('raw'), TS_RAW_RECORD)
+        kept = [row for row in raw_rows if row[0] < len(self.apps) and row[1] >= now - self.raw_retention]
+        for app_id, timestamp, memory, cpu, processes in kept:
+            self._raw_series(self.apps[app_id]).append(timestamp, memory, cpu, processes)
+        if len(kept) != len(raw_rows):
+            self._rewrite('raw', TS_RAW_RECORD, kept)
+        self._file_records['raw'] = len(kept)
+
+        for name, _, _ in TS_ROLLUP_TIERS:
+            rows = read_timeseries_file(self._path(name), TS_ROLLUP_RECORD)
+            kept = [row for row in rows if row[0] < len(self.apps) and row[1] >= now - self.retention[name]]
+            for row in kept:
+                self._rollup_series(name, self.apps[row[0]]).extend(row[1:])
+            if len(kept) != len(rows):
+                self._rewrite(name, TS_ROLLUP_RECORD, kept)
+            self._file_records[name] = len(kept)
+
+    def app_id(self, app_key):
+        """返回应用的ID，新应用会被登记（并写入 apps.json）"""
+        app_id = self._app_ids.get(app_key)
+        if app_id is None:
+            app_id = self._app_ids[app_key] = len(self.apps)
+            self.apps.append(app_key)
+            if self.directory:
+                path = os.path.join(self.directory, 'apps.json')
+                with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump(self.apps, f, ensure_ascii=False)
+                os.replace(path + '.tmp', path)
+        return app_id
+
+    def _raw_series(self, app_key):
+        series = self._raw.get(app_key)
+        if series is None:
+            series = self._raw[app_key] = _RawSeries()
+        return series
+
+    def _rollup_series(self, tier, app_key):
+        series = self._rollups[tier].get(app_key)
+        if series is None:
+            width = next(width for name, width, _ in TS_ROLLUP_TIERS if name == tier)
+            series = self._rollups[tier][app_key] = _RollupSeries(width)
+        return series
+
+    def append(self, app_key, timestamp, memory, cpu, processes):
+        """
+        追加一个采样
+
+        参数:
+            app_key: 应用标识（通常是应用路径）
+            timestamp: 采样时间戳（秒）
+            memory: 内存字节数
+            cpu: CPU 使用率
+            processes: 进程数
+        """
+        app_id = self.app_id(app_key)
+        memory = int(memory)
+        raw = self._raw_series(app_key)
+        raw.append(timestamp, memory, cpu, processes)
+        # 超出保留期一成以上时才裁剪，摊薄删除数组头部的开销
+        if raw.timestamp[0] < timestamp - self.raw_retention * 1.1:
+            raw.trim(timestamp - self.raw_retention)
+        if self._files:
+            self._files['raw'].write(TS_RAW_RECORD.pack(app_id, timestamp, memory, cpu, min(processes, 0xFFFF)))
+            self._file_records['raw'] += 1
+
+        for name, width, _ in TS_ROLLUP_TIERS:
+            series = self._rollup_series(name, app_key)
+            closed = series.add(timestamp, memory, cpu)
+            if closed is not None:
+                starts = series.columns['start']
+                if starts[0] < timestamp - self.retention[name] * 1.1:
+                    series.trim(timestamp - self.retention[name])
+                if self._files:
+                    self._files[name].write(TS_ROLLUP_RECORD.pack(app_id, *closed))
+                    self._file_records[name] += 1
+
+        if self._files and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def raw(self, app_key):
+        """
+        返回应用的原始采样列
+
+        返回:
+            dict: timestamp、memory、cpu、processes 四个 array 列
+        """
+        series = self._raw.get(app_key) or _RawSeries()
+        return {'timestamp': series.timestamp, 'memory': series.memory,
+                'cpu': series.cpu, 'processes': series.processes}
+
+    def rollups(self, app_key, tier):
+        """
+        返回应用在某个层级上已结束的桶
+
+        参数:
+            app_key: 应用标识
+            tier: 层级名称（'1m' 或 '15m'）
+
+        返回:
+            dict: 列名 -> array 列（见 _RollupSeries.COLUMNS）
+        """
+        series = self._rollups[tier].get(app_key)
+        if series is None:
+            return {name: array.array(code) for name, code in _RollupSeries.COLUMNS}
+        return series.columns
+
+    def nbytes(self):
+        """内存中所有数组占用的字节数"""
+        total = sum(series.nbytes() for series in self._raw.values())
+        for tier in self._rollups.values():
+            total += sum(series.nbytes() for series in tier.values())
+        return total
+
+    def _iter_rows(self, name):
+        """按应用依次生成某个层级在内存中保留的全部记录（与文件记录格式一致）"""
+        if name == 'raw':
+            for app_key, series in self._raw.items():
+                app_id = self._app_ids[app_key]
+                for row in zip(series.timestamp, series.memory, series.cpu, series.processes):
+                    yield (app_id,) + row
+            return
+        for app_key, series in self._rollups[name].items():
+            app_id = self._app_ids[app_key]
+            columns = [series.columns[column] for column, _ in _RollupSeries.COLUMNS]
+            for row in zip(*columns):
+                yield (app_id,) + row
+
+    def _compact(self):
+        """重写记录数明显多于内存中保留数据的层级文件，丢弃运行期间过期的记录"""
+        tiers = [('raw', TS_RAW_RECORD)] + [(name, TS_ROLLUP_RECORD) for name, _, _ in TS_ROLLUP_TIERS]
+        for name, record in tiers:
+            if name == 'raw':
+                kept = sum(len(series.timestamp) for series in self._raw.values())
+            else:
+                kept = sum(len(series.columns['start']) for series in self._rollups[name].values())
+            if self._file_records[name] <= max(kept * TS_COMPACT_RATIO, TS_COMPACT_MIN_RECORDS):
+                continue
+            self._files[name].close()
+            self._rewrite(name, record, self._iter_rows(name))
+            self._files[name] = self._open_file(name, record)
+            self._file_records[name] = kept
+
+    def flush(self):
+        """把缓冲的写入刷到磁盘，必要时压缩层级文件"""
+        if self._files:
+            self._compact()
+        for f in self._files.values():
+            f.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """写出未结束的桶（下次载入时与后续数据合并）并关闭文件"""
+        for name, _, _ in TS_ROLLUP_TIERS:
+            for app_key, series in self._rollups[name].items():
+                bucket = series.close()
+                if bucket is not None and self._files:
+                    self._files[name].write(TS_ROLLUP_RECORD.pack(self.app_id(app_key), *bucket))
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+class AppMonitor:
+    """
+    持续监控模式
+
+    按固定间隔采样各应用的内存和 CPU，结果写入时间序列存储（TimeSeriesStore），
+    原始采样按保留期滚动丢弃，长时间运行内存占用也保持不变。进程归属只在出现新进程时对新进程增量计算，
+    已归属进程的每次采样只读取内存和 CPU 时间；进程退出后直接从归属表中移除。
+    """
+
+    def __init__(self, app_paths, interval=1.0, history=3600, store=None):
+        """
+        参数:
+            app_paths: 要监控的应用路径列表
+            interval: 采样间隔（秒）
+            history: 每个应用保留的最近原始采样数量
+            store: 时间序列存储，为 None 时创建一个只在内存中的存储
+        """
+        self.apps = list(app_paths)
+        self.interval = interval
+        self.history = history
+        self.store = store if store is not None else TimeSeriesStore(raw_retention=history * interval)
+        self.samples = 0
+        self.refreshes = 0
+        self.busy_time = 0.0
+        self.started = None
+
+        self._owner = {}        # 进程ID -> 应用路径，不属于任何应用时为 None
+        self._cpu_times = {}    # 进程ID -> 上一次采样时的累计 CPU 时间
+        self._last_sample = None
+        self._collector = get_procfs_collector()
+        self._psutil_procs = {}
+
+    def _list_pids(self):
+        """列出当前所有进程ID，无法单独列出时返回 None"""
+        if self._collector is not None:
+            return set(self._collector.pids())
+        if HAS_PSUTIL:
+            return set(psutil.pids())
+        return None
+
+    def _read_records(self, pids):
+        """读取新进程的完整记录，用于计算归属"""
+        records = []
+        for pid in pids:
+            if self._collector is not None:
+                record = self._collector.read_process(pid)
+            else:
+                record = _psutil_process_record(pid)
+            if record is not None:
+                records.append(record)
+        return records
+
+    def _read_usage(self, pids):
+        """
+        读取已归属进程的内存和累计 CPU 时间
+
+        开启 PSS 采集时内存为 PSS（psutil 上只有 USS 时使用 USS），无法读取时退回 RSS。
+
+        返回:
+            dict: 进程ID -> (内存字节数, 累计 CPU 时间)
+        """
+        usage = {}
+        for pid in pids:
+            if self._collector is not None:
+                result = self._collector.read_usage(pid)
+                if result is not None:
+                    usage[pid] = result
+                continue
+
+            proc = self._psutil_procs.get(pid)
+            try:
+                if proc is None:
+                    proc = self._psutil_procs[pid] = psutil.Process(pid)
+                with proc.oneshot():
+                    cpu = proc.cpu_times()
+                    usage[pid] = (self._psutil_memory(proc), cpu.user + cpu.system)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self._psutil_procs.pop(pid, None)
+        return usage
+
+    def _psutil_memory(self, proc):
+        """用 psutil 读取单个进程的内存字节数"""
+        if COLLECT_PSS:
+            try:
+                full = proc.memory_full_info()
+                return getattr(full, 'pss', None) or full.uss
+            except psutil.AccessDenied:
+                pass  # 其他用户的进程无权读取 USS 时退回 RSS
+        return proc.memory_info().rss
+
+    def _attribute(self, records):
+        """
+        计算新进程属于哪个应用
+
+        父进程已归属某个应用的新进程（例如新打开的渲染进程）直接继承父进程的归属，
+        其余新进程再按进程树规则匹配。
+        """
+        snapshot = ProcessSnapshot(records)
+        for proc in records:
+            owner = self._owner.get(proc['ppid'])
+            if owner is not None and proc['ppid'] not in snapshot.processes:
+                for pid in snapshot.descendants([proc['pid']]):
+                    self._owner[pid] = owner
+        for app_path, processes in snapshot.assign_apps(self.apps).items():
+            for proc in processes:
+                if self._owner.get(proc['pid']) is None:
+                    self._owner[proc['pid']] = app_path
+
+    def _refresh(self):
+        """
+        对比当前进程列表，只为新出现的进程计算归属，移除已退出的进程
+
+        返回:
+            dict or None: 没有 procfs 和 psutil 时返回完整采集的 进程ID -> (RSS, CPU 时间)
+        """
+        current = self._list_pids()
+        full_usage = None
+        records = None
+        if current is None:
+            # 只能整表采集（例如没有 psutil 的 macOS），顺便得到所有进程的用量
+            snapshot = ProcessSnapshot.capture()
+            current = set(snapshot.processes)
+            records = snapshot.processes
+            full_usage = {pid: (_process_memory(proc), proc['cpu_time']) for pid, proc in records.items()}
+
+        for pid in self._owner.keys() - current:
+            del self._owner[pid]
+            self._cpu_times.pop(pid, None)
+            self._psutil_procs.pop(pid, None)
+
+        new_pids = current - self._owner.keys()
+        if new_pids:
+            if records is not None:
+                new_records = [records[pid] for pid in new_pids]
+            else:
+                new_records = self._read_records(new_pids)
+            for pid in new_pids:
+                self._owner[pid] = None
+            self._attribute(new_records)
+            self.refreshes += 1
+        return full_usage
+
+    def sample(self):
+        """
+        采样一次所有应用的内存和 CPU 使用率，写入时间序列存储
+
+        返回:
+            dict: 应用路径 -> (时间戳, 内存字节数, CPU 使用率, 进程数)
+        """
+        start = time.perf_counter()
+        now = time.monotonic()
+        full_usage = self._refresh()
+
+        tracked = [pid for pid, app_path in self._owner.items() if app_path is not None]
+        if full_usage is not None:
+            usage = {pid: full_usage[pid] for pid in tracked if pid in full_usage}
+        else:
+            usage = self._read_usage(tracked)
+
+        elapsed = now - self._last_sample if self._last_sample is not None else 0
+        cpu_times = {pid: cpu_time for pid, (_, cpu_time) in usage.items() if cpu_time is not None}
+        cpu_percent = _cpu_percent_from_times(self._cpu_times, cpu_times, elapsed)
+        self._cpu_times.update(cpu_times)
+        self._last_sample = now
+
+        totals = {app_path: [0, 0.0, 0] for app_path in self.apps}
+        for pid, (rss, _) in usage.items():
+            total = totals[self._owner[pid]]
+            total[0] += rss
+            total[1] += cpu_percent.get(pid, 0.0)
+            total[2] += 1
+
+        timestamp = time.time()
+        result = {}
+        for app_path, (rss, cpu, count) in totals.items():
+            self.store.append(app_path, timestamp, rss, cpu, count)
+            result[app_path] = (timestamp, rss, cpu, count)
+
+        self.samples += 1
+        self.busy_time += time.perf_counter() - start
+        return result
+
+    def run(self, duration=None, on_sample=None):
+        """
+        按间隔持续采样，直到达到 duration 秒或被 Ctrl+C 中断
+
+        参数:
+            duration: 监控时长（秒），为 None 时一直运行
+            on_sample: 每次采样后调用的回调，参数为 sample() 的返回值
+        """
+        self.started = time.monotonic()
+        next_tick = self.started
+        try:
+            while duration is None or time.monotonic() - self.started < duration:
+                result = self.sample()
+                if on_sample is not None:
+                    on_sample(result)
+                # 以固定节拍采样，采样本身的耗时不会累积成漂移
+                next_tick += self.interval
+                time.sleep(max(0.0, next_tick - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+
+    def overhead(self):
+        """监控自身占用的 CPU 时间比例（采样耗时 / 运行时间）"""
+        if self.started is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started
+        return self.busy_time / elapsed if elapsed > 0 else 0.0
+
+    def summary(self, app_path):
+        """
+        汇总一个应用保留期内的原始采样
+
+        返回:
+            dict: 采样数、平均/峰值内存（MB）、平均/峰值 CPU 使用率
+        """
+        raw = self.store.raw(app_path)
+        memory, cpu = raw['memory'], raw['cpu']
+        if not memory:
+            return {'monitor_samples': 0, 'memory_mb_avg': 0, 'memory_mb_peak': 0,
+                    'cpu_percent_avg': 0, 'cpu_percent_peak': 0}
+        return {
+            'monitor_samples': len(memory),
+            'memory_mb_avg': sum(memory) / len(memory) / (1024 * 1024),
+            'memory_mb_peak': max(memory) / (1024 * 1024),
+            'cpu_percent_avg': sum(cpu) / len(cpu),
+            'cpu_percent_peak': max(cpu),
+        }
+
+def run_monitor(results, interval=1.0, duration=None, history=3600, store_dir=None):
+    """
+    对扫描到的 Electron 应用运行持续监控，并把监控汇总写回应用信息
+
+    参数:
+        results: 扫描结果列表，会被原地更新
+        interval: 采样间隔（秒）
+        duration: 监控时长（秒），为 None 时运行到 Ctrl+C
+        history: 每个应用保留的最近原始采样数量
+        store_dir: 时间序列数据目录，为 None 时只保存在内存中
+
+    返回:
+        AppMonitor: 监控器，可通过 monitor.store 读取时间序列
+    """
+    store = TimeSeriesStore(store_dir, raw_retention=history * interval)
+    monitor = AppMonitor([app_info['path'] for app_info in results], interval, history, store)
+
+    def show(sample):
+        running = [point for point in sample.values() if point[3] > 0]
+        total_memory = sum(point[1] for point in running) / (1024 * 1024)
+        total_cpu = sum(point[2] for point in running)
+        sys.stdout.write(f"\r监控中: 第 {monitor.samples} 次采样，运行中 {len(running)} 个应用，"
+                         f"内存 {format_size(total_memory)}，CPU {total_cpu:.1f}%   ")
+        sys.stdout.flush()
+
+    duration_text = f"{duration:g} 秒" if duration else "直到按 Ctrl+C"
+    print(f"\n开始监控 {len(results)} 个应用，采样间隔 {interval:g} 秒，持续 {duration_text}")
+    monitor.run(duration, show)
+    store.close()
+    print(f"\n监控结束: 共 {monitor.samples} 次采样，归属刷新 {monitor.refreshes} 次，"
+          f"监控开销 {monitor.overhead() * 100:.2f}% CPU，时间序列占用 {format_size(store.nbytes() / (1024 * 1024))}")
+    if store_dir:
+        print(f"时间序列已保存到: {store_dir}")
+
+    for app_info in results:
+        app_info.update(monitor.summary(app_info['path']))
+    return monitor
+
+def _get_size_executor():
+    """获取计算目录大小时共享的线程池（按需创建）"""
+    global _size_executor
+    with _size_executor_lock:
+        if _size_executor is None:
+            _size_executor = ThreadPoolExecutor(max_workers=SIZE_WORKERS)
+        return _size_executor
+
+def _scan_dir_entries(directory, totals, seen_inodes, seen_lock):
+    """
+    统计单个目录中的文件大小，返回其子目录列表
+
+    直接复用 os.scandir 返回的 DirEntry 的类型和 stat 信息，每个文件只需一次 stat。
+    跳过符号链接，硬链接按 (st_dev, st_ino) 去重只统计一次。
+
+    参数:
+        directory: 目录路径
+        totals: [表观大小, 占用大小, 文件数, 目录数]，会被原地累加
+        seen_inodes: 已统计过的硬链接 (st_dev, st_ino) 集合
+        seen_lock: 保护 seen_inodes 的锁
+
+    返回:
+        list: 子目录路径列表
+    """
+    subdirs = []
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        # 忽略无法访问的目录
+        return subdirs
+
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                if entry.is_symlink():  # 跳过符号链接
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                # 忽略无法访问的文件
+                continue
+
+            if st.st_nlink > 1:
+                inode_key = (st.st_dev, st.st_ino)
+                with seen_lock:
+                    if inode_key in seen_inodes:
+                        continue
+                    seen_inodes.add(inode_key)
+
+            totals[0] += st.st_size
+            totals[1] += st.st_blocks * 512 if HAS_ST_BLOCKS else st.st_size
+            totals[2] += 1
+
+    totals[3] += len(subdirs)
+    return subdirs
+
+def _scan_subtree(directory, seen_inodes, seen_lock):
+    """在当前线程中统计整棵子树，返回 [表观大小, 占用大小, 文件数, 目录数]"""
+    totals = [0, 0, 0, 0]
+    stack = [directory]
+    while stack:
+        stack.extend(_scan_dir_entries(stack.pop(), totals, seen_inodes, seen_lock))
+    return totals
+
+def get_dir_usage(path, parallel=True):
+    """
+    获取目录或文件的磁盘使用情况
+
+    先在当前线程中按层展开目录，子目录足够多时把各个子树分发到共享线程池并行统计。
+
+    参数:
+        path: 目录或文件路径
+        parallel: 是否把大的子树分发到线程池
+
+    返回:
+        dict: 包含 apparent_bytes（文件大小之和）、allocated_bytes（实际占用的磁盘块）、
+              files（文件数）和 dirs（目录数）
+    """
+    if not os.path.isdir(path):
+        st = os.stat(path)
+        allocated = st.st_blocks * 512 if HAS_ST_BLOCKS else st.st_size
+        return {'apparent_bytes': st.st_size, 'allocated_bytes': allocated, 'files': 1, 'dirs': 0}
+
+    totals = [0, 0, 0, 0]
+    seen_inodes = set()
+    seen_lock = threading.Lock()
+
+    # 逐层展开，直到子目录数量足够分发给所有工作线程
+    frontier = [path]
+    for _ in range(SIZE_FANOUT_DEPTH):
+        next_frontier = []
+        for directory in frontier:
+            next_frontier.extend(_scan_dir_entries(directory, totals, seen_inodes, seen_lock))
+        frontier = next_frontier
+        if not parallel or len(frontier) >= SIZE_WORKERS:
+            break
+
+    if parallel and len(frontier) > 1:
+        executor = _get_size_executor()
+        futures = [executor.submit(_scan_subtree, directory, seen_inodes, seen_lock) for directory in frontier]
+        subtree_totals = [future.result() for future in futures]
+    else:
+        subtree_totals = [_scan_subtree(directory, seen_inodes, seen_lock) for directory in frontier]
+
+    for subtotal in subtree_totals:
+        for i, value in enumerate(subtotal):
+            totals[i] += value
+
+    return {
+        'apparent_bytes': totals[0],
+        'allocated_bytes': totals[1],
+        'files': totals[2],
+        'dirs': totals[3]
+    }
+
+def get_dir_size(path):
+    """
+    获取目录或文件大小
+    
+    参数:
+        path: 目录或文件路径
+        
+    返回:
+        float: 大小（MB）
+    """
+    try:
+        return get_dir_usage(path)['apparent_bytes'] / (1024 * 1024)  # 转换为MB
+    except Exception as e:
+        print(f"获取 {path} 大小时出错: {str(e)}")
+        return 0
+
+def _bundle_key_files(app_path):
+    """
+    返回决定应用检测结果的关键文件：Info.plist、app.asar 和主可执行文件；
+    Linux 上是 resources/app.asar、与目录同名的主程序、启动器解析出的程序和 .desktop 文件
+
+    参数:
+        app_path: 应用程序包或目录的路径
+
+    返回:
+        list: 关键文件路径列表（文件可能不存在）
+    """
+    if IS_WINDOWS:
+        if app_path.lower().endswith('.exe'):
+            app_dir = os.path.dirname(app_path)
+            main_executable = app_path
+        else:
+            app_dir = app_path
+            main_executable = os.path.join(app_dir, os.path.basename(app_dir) + '.exe')
+        return [os.path.join(app_dir, 'resources', 'app.asar'), main_executable]
+
+    if IS_LINUX:
+        # 原地升级（如 apt 更新 /usr/share/code）时目录本身不变，只有其中的文件被替换
+        executable, desktop_path = linux_app_launchers.get(app_path, (None, None))
+        key_files = [os.path.join(app_path, 'resources', 'app.asar'),
+                     os.path.join(app_path, os.path.basename(app_path))]
+        return key_files + [path for path in (executable, desktop_path) if path]
+
+    contents_dir = os.path.join(app_path, 'Contents')
+    key_files = [
+        os.path.join(contents_dir, 'Info.plist'),
+        os.path.join(contents_dir, 'Resources', 'app.asar'),
+    ]
+    # Contents/MacOS 下通常只有主可执行文件
+    executable_dir = os.path.join(contents_dir, 'MacOS')
+    try:
+        key_files.extend(sorted(entry.path for entry in os.scandir(executable_dir)))
+    except OSError:
+        pass
+    return key_files
+
+def bundle_fingerprint(app_path):
+    """
+    计算应用包的身份指纹，用于判断缓存是否仍然有效
+
+    指纹由应用包自身的 inode、设备号以及关键文件的修改时间组成。
+
+    参数:
+        app_path: 应用程序包或目录的路径
+
+    返回:
+        list or None: 指纹，无法访问应用包时返回 None
+    """
+    try:
+        st = os.stat(app_path)
+    except OSError:
+        return None
+
+    fingerprint = [st.st_ino, st.st_dev]
+    for key_file in _bundle_key_files(app_path):
+        try:
+            fingerprint.append(os.stat(key_file).st_mtime_ns)
+        except OSError:
+            fingerprint.append(None)
+    return fingerprint
+
+class ScanCache:
+    """
+    持久化的增量扫描缓存
+
+    以规范化路径为键，保存应用包指纹以及上次的检测结果、版本和大小。
+    指纹未变化的应用直接复用缓存，只有新增或修改过的应用才会重新分析。
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, path):
+        """
+        参数:
+            path: 缓存文件路径
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._entries = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """从磁盘加载缓存，文件不存在或格式不兼容时从空缓存开始"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.FORMAT_VERSION:
+                self._entries = data.get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+    def lookup(self, app_path, fingerprint):
+        """
+        查找应用的缓存条目
+
+        参数:
+            app_path: 应用程序包的路径
+            fingerprint: bundle_fingerprint 计算出的当前指纹
+
+        返回:
+            dict or None: 指纹一致时返回缓存条目（包含 is_electron 和 info），否则返回 None
+        """
+        key = os.path.realpath(app_path)
+        with self._lock:
+            self._seen.add(key)
+            entry = self._entries.get(key)
+            if entry is not None and fingerprint is not None and entry['fingerprint'] == fingerprint:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def store(self, app_path, fingerprint, is_electron, info=None):
+        """
+        保存应用的分析结果
+
+        参数:
+            app_path: 应用程序包的路径
+            fingerprint: 分析时的应用包指纹
+            is_electron: 是否为 Electron 应用
+            info: Electron 应用的 path、version、electron_version、size、allocated_size
+        """
+        if fingerprint is None:
+            return
+        key = os.path.realpath(app_path)
+        with self._lock:
+            self._seen.add(key)
+            self._entries[key] = {
+                'fingerprint': fingerprint,
+                'is_electron': is_electron,
+                'info': info
+            }
+
+    def evict_stale(self, directories=None):
+        """
+        淘汰本次扫描的目录下已经不存在的应用条目
+
+        参数:
+            directories: 本次扫描的目录列表，其他目录下的条目保持不变；为 None 时淘汰本次扫描没有见到的
+                         所有条目（Linux 上扫描的是 .desktop 目录，安装目录在别处，无法按目录前缀判断）
+        """
+        roots = None
+        if directories is not None:
+            roots = [os.path.realpath(directory).rstrip(os.sep) + os.sep for directory in directories]
+        with self._lock:
+            for key in list(self._entries):
+                if key not in self._seen and (roots is None or any(key.startswith(root) for root in roots)):
+                    del self._entries[key]
+                    self.evicted += 1
+
+    def save(self):
+        """以原子替换的方式把缓存写回磁盘"""
+        try:
+            cache_dir = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with self._lock:
+                data = {'version': self.FORMAT_VERSION, 'entries': self._entries}
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"保存扫描缓存时出错: {str(e)}")
+
+    def __len__(self):
+        return len(self._entries)
+
+# 扫描遥测：各阶段耗时直方图的桶上限（秒）
+TELEMETRY_STAGES = ('discovery', 'detection', 'version', 'sizing', 'memory', 'performance')
+TELEMETRY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+# 队列深度按该时间粒度（秒）记录区间内的最大值
+TELEMETRY_QUEUE_RESOLUTION = 0.1
+
+class ScanTelemetry:
+    """
+    扫描遥测
+
+    记录发现、检测、版本提取、大小统计、内存和性能各阶段的耗时直方图，
+    每个应用在各阶段的耗时（用于找出最慢的应用和拖慢它的阶段），
+    以及流水线各队列的深度随时间的变化。可以导出为 JSON 或 OpenMetrics 文本。
+    """
+
+    def __init__(self):
+        self.start = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {stage: self._new_histogram() for stage in TELEMETRY_STAGES}
+        self._app_timings = {}
+        self._queue_depth = {}
+        self._queue_series = {}
+
+    @staticmethod
+    def _new_histogram():
+        return {'buckets': [0] * len(TELEMETRY_BUCKETS), 'count': 0, 'sum': 0.0, 'max': 0.0}
+
+    def record(self, stage, seconds, app_path=None):
+        """
+        记录一次阶段耗时
+
+        参数:
+            stage: 阶段名称（TELEMETRY_STAGES 之一）
+            seconds: 耗时（秒）
+            app_path: 对应的应用路径，为 None 时只计入直方图
+        """
+        with self._lock:
+            histogram = self._histograms.setdefault(stage, self._new_histogram())
+            for i, bound in enumerate(TELEMETRY_BUCKETS):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+            histogram['max'] = max(histogram['max'], seconds)
+
+            if app_path is not None:
+                timings = self._app_timings.setdefault(app_path, {})
+                timings[stage] = timings.get(stage, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, stage, app_path=None):
+        """计时上下文：with telemetry.stage('detection', app_path): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, app_path)
+
+    def queue_changed(self, name, delta):
+        """
+        更新队列深度
+
+        参数:
+            name: 队列名称
+            delta: 深度变化量（入队 +1，出队 -1）
+        """
+        with self._lock:
+            depth = self._queue_depth.get(name, 0) + delta
+            self._queue_depth[name] = depth
+            offset = round(int((time.time() - self.start) / TELEMETRY_QUEUE_RESOLUTION) * TELEMETRY_QUEUE_RESOLUTION, 3)
+            series = self._queue_series.setdefault(name, [])
+            if series and series[-1][0] == offset:
+                series[-1][1] = max(series[-1][1], depth)
+            else:
+                series.append([offset, depth])
+
+    def slowest_apps(self, top_n=5):
+        """
+        返回总耗时最长的应用
+
+        参数:
+            top_n: 返回的应用数量
+
+        返回:
+            list: [{'path', 'total', 'slowest_stage', 'slowest_seconds', 'stages'}]，按总耗时降序
+        """
+        with self._lock:
+            items = [(path, dict(timings)) for path, timings in self._app_timings.items()]
+
+        apps = []
+        for path, timings in items:
+            slowest_stage = max(timings, key=timings.get)
+            apps.append({
+                'path': path,
+                'total': sum(timings.values()),
+                'slowest_stage': slowest_stage,
+                'slowest_seconds': timings[slowest_stage],
+                'stages': timings,
+            })
+        apps.sort(key=lambda app: app['total'], reverse=True)
+        return apps[:top_n]
+
+    def to_dict(self, top_n=5):
+        """导出为可 JSON 序列化的字典"""
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._histograms.items():
+                stages[stage] = {
+                    'count': histogram['count'],
+                    'sum': histogram['sum'],
+                    'max': histogram['max'],
+                    'avg': histogram['sum'] / histogram['count'] if histogram['count'] else 0.0,
+                    'buckets': {str(bound): count for bound, count in zip(TELEMETRY_BUCKETS, histogram['buckets'])},
+                }
+            queues = {name: [list(point) for point in series] for name, series in self._queue_series.items()}
+
+        return {
+            'started_at': self.start,
+            'elapsed': time.time() - self.start,
+            'stages': stages,
+            'slowest_apps': self.slowest_apps(top_n),
+            'queue_depth': queues,
+        }
+
+    def to_openmetrics(self):
+        """导出为 OpenMetrics 文本格式"""
+        lines = [
+            '# TYPE electron_scan_stage_seconds histogram',
+            '# UNIT electron_scan_stage_seconds seconds',
+            '# HELP electron_scan_stage_seconds Latency of each scan stage.',
+        ]
+        with self._lock:
+            for stage, histogram in self._histograms.items():
+                cumulative = 0
+                for bound, count in zip(TELEMETRY_BUCKETS, histogram['buckets']):
+                    cumulative += count
+                    lines.append(f'electron_scan_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'electron_scan_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+                lines.append(f'electron_scan_stage_seconds_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+                lines.append(f'electron_scan_stage_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+
+            lines.extend([
+                '# TYPE electron_scan_queue_depth_max gauge',
+                '# HELP electron_scan_queue_depth_max Peak depth of each scan pipeline queue.',
+            ])
+            for name, series in self._queue_series.items():
+                peak = max(depth for _, depth in series) if series else 0
+                lines.append(f'electron_scan_queue_depth_max{{queue="{name}"}} {peak}')
+
+        lines.extend([
+            '# TYPE electron_scan_elapsed_seconds gauge',
+            '# UNIT electron_scan_elapsed_seconds seconds',
+            f'electron_scan_elapsed_seconds {time.time() - self.start:.6f}',
+            '# EOF',
+        ])
+        return '\n'.join(lines) + '\n'
+
+    def print_summary(self, top_n=5):
+        """打印各阶段耗时和最慢的应用"""
+        data = self.to_dict(top_n)
+        print("\n扫描阶段耗时:")
+        print(f"{'阶段':<14} {'次数':>7} {'总耗时':>10} {'平均':>10} {'最大':>10}")
+        for stage, stats in data['stages'].items():
+            if stats['count']:
+                print(f"{stage:<14} {stats['count']:>7} {stats['sum']:>9.2f}s "
+                      f"{stats['avg'] * 1000:>8.1f}ms {stats['max'] * 1000:>8.1f}ms")
+
+        if data['slowest_apps']:
+            print(f"\n最慢的 {len(data['slowest_apps'])} 个应用:")
+            for app in data['slowest_apps']:
+                print(f"- {app['path']}: {app['total']:.2f}s（最慢阶段 {app['slowest_stage']} "
+                      f"{app['slowest_seconds']:.2f}s）")
+
+        for name, series in data['queue_depth'].items():
+            if series:
+                print(f"队列 {name}: 峰值深度 {max(depth for _, depth in series)}")
+
+    def export(self, json_path=None, metrics_path=None, top_n=5):
+        """
+        导出遥测数据
+
+        参数:
+            json_path: JSON 文件路径
+            metrics_path: OpenMetrics 文本文件路径
+            top_n: JSON 中包含的最慢应用数量
+        """
+        try:
+            if json_path:
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.to_dict(top_n), f, ensure_ascii=False, indent=2)
+                print(f"扫描遥测已导出到: {json_path}")
+            if metrics_path:
+                with open(metrics_path, 'w', encoding='utf-8') as f:
+                    f.write(self.to_openmetrics())
+                print(f"OpenMetrics 指标已导出到: {metrics_path}")
+        except OSError as e:
+            print(f"导出扫描遥测时出错: {str(e)}")
+
+# 本次扫描的遥测数据
+scan_telemetry = ScanTelemetry()
+
+# 扫描阶段的执行方式
+EXECUTOR_MODES = ('thread', 'process', 'hybrid')
+
+def _scan_worker_config():
+    """
+    收集子进程需要继承的模块配置（spawn 方式启动的子进程不会继承 main() 中的设置）
+
+    扫描截止时间以剩余秒数传递：事件循环的单调时钟在不同进程之间不可比较
+    """
+    return {
+        'MARKER_BYTE_BUDGET': MARKER_BYTE_BUDGET,
+        'PROC_ROOT': PROC_ROOT,
+        'COLLECT_PSS': COLLECT_PSS,
+        'MAX_SUBPROCESSES': MAX_SUBPROCESSES,
+        'deadline': get_command_runner().remaining(),
+    }
+
+def _init_scan_worker(config):
+    """子进程初始化：恢复主进程中的模块配置和扫描截止时间"""
+    config = dict(config)
+    deadline = config.pop('deadline', None)
+    globals().update(config)
+    if deadline is not None:
+        get_command_runner().set_deadline(deadline)
+
+def _detect_in_worker(app_path):
+    """
+    在子进程中检测应用
+
+    返回:
+        tuple: (是否为 Electron 应用, 本次检测产生的探针计数增量)
+    """
+    chain = get_probe_chain()
+    before = chain.counters()
+    is_electron = is_electron_app(app_path)
+    after = chain.counters()
+    deltas = [tuple(a - b for a, b in zip(new, old)) for new, old in zip(after, before)]
+    return is_electron, deltas
+
+def _bundle_info_in_worker(app_path, sizing=True):
+    """
+    在子进程中分析应用包
+
+    参数:
+        app_path: 应用程序包的路径
+        sizing: 是否同时统计大小，为 False 时只分析版本（大小由主进程的线程统计）
+
+    返回:
+        tuple: (get_bundle_info 或 get_bundle_versions 的结果, 各阶段耗时)
+    """
+    timings = {}
+    if not sizing:
+        return get_bundle_versions(app_path, timings), timings
+    return get_bundle_info(app_path, timings), timings
+
+class StageExecutor:
+    """
+    扫描阶段执行器
+
+    决定检测和应用包分析在哪里执行：
+    - thread: 全部在线程中执行，适合以 stat 调用为主的扫描
+    - process: 检测和应用包分析都交给进程池，绕开 GIL
+    - hybrid: 以文件系统访问为主的检测探针和大小统计留在线程中（大小统计自身已在线程池中并行），
+              CPU 密集的版本分析（版本正则、JSON/plist 解析）交给进程池
+
+    进程池只返回可序列化的小字典和元组，进程快照、缓存等状态始终留在主进程。
+    """
+
+    def __init__(self, mode='thread', max_workers=8):
+        """
+        参数:
+            mode: 执行方式，thread、process 或 hybrid
+            max_workers: 进程池大小
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"不支持的执行方式: {mode}")
+        self.mode = mode
+        self._pool = None
+        if mode != 'thread':
+            # 统一使用 spawn，避免在多线程的进程中 fork
+            self._pool = ProcessPoolExecutor(max_workers=max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_init_scan_worker,
+                                             initargs=(_scan_worker_config(),))
+
+    def detect(self, app_path):
+        """判断应用是否为 Electron 应用"""
+        if self.mode != 'process':
+            return is_electron_app(app_path)
+        is_electron, deltas = self._pool.submit(_detect_in_worker, app_path).result()
+        get_probe_chain().merge(deltas)
+        return is_electron
+
+    def bundle_info(self, app_path, timings=None):
+        """分析应用包的版本和大小信息，timings 同 get_bundle_info"""
+        if self._pool is None:
+            return get_bundle_info(app_path, timings)
+        sizing_in_pool = self.mode == 'process'
+        bundle_info, worker_timings = self._pool.submit(_bundle_info_in_worker, app_path, sizing_in_pool).result()
+        if timings is not None:
+            timings.update(worker_timings)
+        if not sizing_in_pool:
+            bundle_info.update(get_bundle_size(bundle_info['path'], timings))
+        return bundle_info
+
+    def shutdown(self):
+        """关闭进程池"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+def detect_app(app_path, cache=None, stages=None):
+    """
+    检测阶段：判断应用是否为 Electron 应用，应用包未变化时复用缓存中的检测结果
+    
+    参数:
+        app_path: 应用程序包的路径
+        cache: 增量扫描缓存（ScanCache），为 None 时不使用缓存
+        stages: 扫描阶段执行器（StageExecutor），为 None 时在当前线程中执行
         
-        if not pids:
-            return performance_info
-            
-        # 使用 psutil 获取更详细的进程信息（如果可用）
-        total_cpu_percent = 0
-        total_threads = 0
+    返回:
+        tuple: (是否为 Electron 应用, 缓存条目或 None, 应用包指纹或 None)
+    """
+    start = time.perf_counter()
+    fingerprint = None
+    cached = None
+    if cache is not None:
+        fingerprint = bundle_fingerprint(app_path)
+        cached = cache.lookup(app_path, fingerprint)
+    
+    if cached:
+        is_electron = cached['is_electron']
+    else:
+        is_electron = stages.detect(app_path) if stages is not None else is_electron_app(app_path)
+    
+    if not is_electron and cache is not None and cached is None:
+        cache.store(app_path, fingerprint, False)
+    
+    scan_telemetry.record('detection', time.perf_counter() - start, app_path)
+    return is_electron, cached, fingerprint
+
+def analyze_app(app_path, analyze_memory=False, analyze_performance=False, snapshot=None, cache=None,
+                cached=None, fingerprint=None, sampler=None, stages=None, energy_sampler=None):
+    """
+    信息收集阶段：获取 Electron 应用的详细信息并写回缓存
+    
+    参数:
+        app_path: 应用程序包的路径
+        analyze_memory: 是否分析内存使用情况
+        analyze_performance: 是否分析性能信息（CPU、能耗等）
+        snapshot: 本次扫描共享的进程快照（ProcessSnapshot）
+        cache: 增量扫描缓存（ScanCache）
+        cached: detect_app 返回的缓存条目
+        fingerprint: detect_app 返回的应用包指纹
+        sampler: 分析性能时使用的 CpuSampler，为 None 时由 get_process_performance 自行采样
+        stages: 扫描阶段执行器（StageExecutor），为 None 时在当前线程中执行
+        energy_sampler: 本次扫描共享的 EnergySampler，为 None 时由 get_process_performance 自行采样
         
-        if HAS_PSUTIL:
-            for pid in pids:
-                try:
-                    proc = psutil.Process(pid)
-                    # 获取 CPU 使用率（这是一个相对值，100% 表示一个核心的满负荷）
-                    cpu_percent = proc.cpu_percent(interval=0.1)
-                    total_cpu_percent += cpu_percent
-                    
-                    # 获取线程数
-                    total_threads += proc.num_threads()
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+    返回:
+        dict: 应用信息
+    """
+    if cached:
+        bundle_info = cached['info']
+    else:
+        timings = {}
+        if stages is not None:
+            bundle_info = stages.bundle_info(app_path, timings)
         else:
-            # 如果没有 psutil，使用 top 命令获取 CPU 使用率
-            for pid in pids:
-                cmd = ['top', '-l', '1', '-pid', str(pid), '-stats', 'cpu']
-                try:
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=1)
-                    if result.returncode == 0:
-                        output = result.stdout
-                        # 解析 top 输出以获取 CPU 使用率
-                        for line in output.strip().split('\n'):
-                            if str(pid) in line:
-                                parts = line.split()
-                                if len(parts) >= 3:
-                                    try:
-                                        cpu_percent = float(parts[2].replace('%', ''))
-                                        total_cpu_percent += cpu_percent
-                                    except (ValueError, IndexError):
-                                        pass
-                except (subprocess.TimeoutExpired, subprocess.SubprocessError):
-                    pass
-        
-        # 获取能耗信息（使用 powermetrics，需要管理员权限）
-        energy_impact = 'N/A'
-        # 检查是否有 sudo 权限
-        has_sudo = False
-        
-        # 仅当存在 sudo 并且用户希望分析能耗时才尝试获取能耗信息
-        if shutil.which('sudo') and os.geteuid() == 0:  # 检查是否为 root 用户
-            has_sudo = True
-        
-        if has_sudo and pids:
-            try:
-                # 使用 powermetrics 命令获取能耗信息
-                # 注意：这需要管理员权限，如果没有权限会失败
-                cmd = ['sudo', 'powermetrics', '-n', '1', '-i', '100', '--show-process-energy']
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=3)
-                
-                if result.returncode == 0:
-                    output = result.stdout
-                    # 解析输出以获取能耗信息
-                    for pid in pids:
-                        pid_pattern = r"^\s*{}\s+.*".format(pid)
-                        for line in output.strip().split('\n'):
-                            if re.search(pid_pattern, line):
-                                parts = line.split()
-                                if len(parts) >= 5:  # 进程信息至少应该有 5 个字段
-                                    energy_impact = parts[4]  # 能耗值通常在第 5 列
-            except (subprocess.TimeoutExpired, subprocess.SubprocessError):
-                pass
-        
-        performance_info = {
-            'cpu_percent': total_cpu_percent,
-            'num_threads': total_threads,
-            'energy_impact': energy_impact,
-            'has_performance_data': len(pids) > 0
-        }
-        
-        return performance_info
+            bundle_info = get_bundle_info(app_path, timings)
+        for stage, seconds in timings.items():
+            scan_telemetry.record(stage, seconds, app_path)
     
-    except Exception as e:
-        print(f"获取应用 {app_path} 性能信息时出错: {str(e)}")
-        return {
-            'cpu_percent': 0,
-            'num_threads': 0,
-            'energy_impact': 'N/A',
-            'has_performance_data': False
-        }
+    start = time.perf_counter()
+    app_info = get_app_info(app_path, analyze_memory, False, snapshot, bundle_info)
+    if analyze_memory:
+        scan_telemetry.record('memory', time.perf_counter() - start, app_path)
+    
+    if cache is not None and cached is None:
+        cache.store(app_path, fingerprint, True,
+                    {key: app_info[key] for key in ('path', 'version', 'electron_version', 'size', 'allocated_size')})
+    
+    if analyze_performance:
+        start = time.perf_counter()
+        cpu_samples = None
+        if sampler is not None:
+            if snapshot is None:
+                snapshot = ProcessSnapshot.capture()
+            cpu_samples = sampler.sample(proc['pid'] for proc in snapshot.find_app_processes(app_path))
+        energy_samples = energy_sampler.sample() if energy_sampler is not None else None
+        apply_performance_info(app_info, get_process_performance(app_path, snapshot, cpu_samples, energy_samples))
+        scan_telemetry.record('performance', time.perf_counter() - start, app_path)
+    
+    return app_info
 
-def get_app_info(app_path, analyze_memory=False, analyze_performance=False):
+def process_app(app_path, analyze_memory=False, analyze_performance=False, snapshot=None, cache=None):
     """
-    获取应用程序的详细信息
+    处理单个应用程序
     
     参数:
         app_path: 应用程序包的路径
         analyze_memory: 是否分析内存使用情况
         analyze_performance: 是否分析性能信息（CPU、能耗等）
+        snapshot: 本次扫描共享的进程快照（ProcessSnapshot）
+        cache: 增量扫描缓存（ScanCache），为 None 时不使用缓存
         
     返回:
-        dict: 包含应用信息的字典
+        dict or None: 如果是 Electron 应用，则返回应用信息，否则返回 None
     """
+    global processed_count
+    
     try:
-        # 获取应用名称
-        app_name = os.path.basename(app_path)
-        
-        # 根据平台处理应用名称
-        if IS_MACOS:
-            app_name = app_name.replace('.app', '')
-        elif IS_WINDOWS:
-            if app_name.lower().endswith('.exe'):
-                app_name = os.path.splitext(app_name)[0]
-        
-        # 获取应用版本
-        app_version = "未知"
-        if IS_MACOS:
-            plist_path = os.path.join(app_path, 'Contents', 'Info.plist')
-            if os.path.exists(plist_path):
-                try:
-                    with open(plist_path, 'rb') as fp:
-                        plist_data = plistlib.load(fp)
-                        app_version = plist_data.get('CFBundleShortVersionString', "未知")
-                except Exception:
-                    pass
-        elif IS_WINDOWS:
-            # 对于Windows，尝试从可执行文件获取版本信息
-            if HAS_PSUTIL:
-                try:
-                    # 查找主可执行文件
-                    exe_files = []
-                    if os.path.isdir(app_path):
-                        exe_files = [f for f in os.listdir(app_path) if f.lower().endswith('.exe')]
-                    elif app_path.lower().endswith('.exe'):
-                        exe_files = [os.path.basename(app_path)]
-                        app_path = os.path.dirname(app_path)
-                    
-                    if exe_files:
-                        exe_path = os.path.join(app_path, exe_files[0])
-                        # 使用wmic获取版本信息
-                        cmd = ['wmic', 'datafile', 'where', f'name="{exe_path.replace("\\", "\\\\")}"', 'get', 'Version', '/value']
-                        try:
-                            result = subprocess.run(cmd, capture_output=True, text=True, timeout=3)
-                            if result.returncode == 0:
-                                output = result.stdout
-                                version_match = re.search(r'Version=(.+)', output)
-                                if version_match:
-                                    app_version = version_match.group(1).strip()
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
+        is_electron, cached, fingerprint = detect_app(app_path, cache)
+        if is_electron:
+            app_info = analyze_app(app_path, analyze_memory, analyze_performance, snapshot, cache, cached, fingerprint)
+            processed_count += 1
+            print_progress()
+            return app_info
+    except Exception as e:
+        print(f"处理应用 {app_path} 时出错: {str(e)}")
+    
+    processed_count += 1
+    print_progress()
+    return None
+
+def print_progress():
+    """打印进度信息"""
+    if apps_count > 0:
+        percent = (processed_count / apps_count) * 100
+        sys.stdout.write(f"\r正在处理: {processed_count}/{apps_count} 应用 ({percent:.1f}%)")
+        sys.stdout.flush()
+
+# macOS 应用发现的默认排除规则（fnmatch 通配符，匹配完整路径）
+DEFAULT_DISCOVERY_EXCLUDES = ['*/Library/Caches', '*/System/Library']
+
+# 应用发现的最大目录深度（None 表示不限制）和排除规则，可通过命令行参数修改
+DISCOVERY_MAX_DEPTH = None
+DISCOVERY_EXCLUDES = list(DEFAULT_DISCOVERY_EXCLUDES)
+
+# 应用发现统计: 访问的目录数、在应用包边界或排除规则处剪枝的目录数
+discovery_stats = {'visited': 0, 'pruned': 0}
+
+def walk_app_bundles(directory, max_depth=None, excludes=None, stats=None):
+    """
+    查找目录下的 .app 应用包，在应用包边界处剪枝
+    
+    找到 .app 后不再进入其内部，框架、Helper 应用和 Resources 目录都不会被遍历，
+    嵌套的 Helper .app 也不会被当作独立的候选应用。
+    
+    参数:
+        directory: 要扫描的目录路径
+        max_depth: 相对 directory 的最大下探深度（None 表示不限制）
+        excludes: 要跳过的路径通配符列表（fnmatch 语法，匹配完整路径）
+        stats: 统计字典，累加 visited 和 pruned 计数
         
-        # 获取 Electron 版本
-        electron_version = get_electron_version(app_path)
+    返回:
+        generator: 逐个产出 .app 应用包路径
+    """
+    if stats is None:
+        stats = {'visited': 0, 'pruned': 0}
+    excludes = excludes or []
+    
+    stack = [(directory, 0)]
+    while stack:
+        current, depth = stack.pop()
+        stats['visited'] += 1
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
         
-        # 获取应用大小
-        app_size = get_dir_size(app_path)
+        subdirs = []
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            
+            if entry.name.endswith('.app'):
+                # 应用包本身就是候选，不再进入其内部
+                stats['pruned'] += 1
+                yield entry.path
+            elif entry.name.startswith('.'):
+                continue
+            elif any(fnmatch.fnmatch(entry.path, pattern) for pattern in excludes):
+                stats['pruned'] += 1
+            elif max_depth is not None and depth + 1 > max_depth:
+                stats['pruned'] += 1
+            else:
+                subdirs.append((entry.path, depth + 1))
         
-        # 创建基本信息字典
-        app_info = {
-            'name': app_name,
-            'path': app_path,
-            'version': app_version,
-            'electron_version': electron_version,
-            'size': app_size
-        }
+        # 逆序压栈，保持按名称顺序遍历
+        stack.extend(reversed(subdirs))
+
+# Windows 候选目录评分：目录中能直接看到的 Electron 特征及其分值
+WINDOWS_CANDIDATE_SIGNALS = {
+    'resources': 2,
+    'locales': 2,
+    'ffmpeg.dll': 3,
+    'v8_context_snapshot.bin': 3,
+}
+WINDOWS_PAK_SCORE = 1
+WINDOWS_MIN_CANDIDATE_SCORE = 2
+
+# Windows 上默认的候选目录最大深度（与原来 os.walk 的递归深度一致）
+WINDOWS_DISCOVERY_DEPTH = 4
+
+def score_windows_candidate(dir_name, entry_names):
+    """
+    根据目录名称和目录内的条目名称为 Windows 候选目录打分
+    
+    参数:
+        dir_name: 目录名称
+        entry_names: 目录内的条目名称（一次 scandir 的结果）
         
-        # 如果需要分析内存，则获取内存使用情况
-        if analyze_memory:
-            memory_info = get_memory_usage(app_path)
-            app_info.update({
-                'memory_mb': memory_info['memory_mb'],
-                'running': memory_info['running'],
-                'processes': memory_info['processes'],
-                'status': memory_info['status'],
-                'memory_size_ratio': memory_info['memory_mb'] / app_size if app_size > 0 else 0
-            })
+    返回:
+        int: 分数，达到 WINDOWS_MIN_CANDIDATE_SCORE 才值得做进一步检测；
+             目录中没有 .exe 时不是安装目录，分数为 0
+    """
+    if dir_name.lower() in WINDOWS_KNOWN_ELECTRON_APPS:
+        return WINDOWS_MIN_CANDIDATE_SCORE
+    
+    score = 0
+    has_pak = False
+    has_exe = False
+    for name in entry_names:
+        name = name.lower()
+        score += WINDOWS_CANDIDATE_SIGNALS.get(name, 0)
+        if name.endswith('.exe'):
+            has_exe = True
+        elif not has_pak and name.endswith('.pak'):
+            has_pak = True
+            score += WINDOWS_PAK_SCORE
+    return score if has_exe else 0
+
+def walk_windows_candidates(directory, max_depth=WINDOWS_DISCOVERY_DEPTH, excludes=None, stats=None):
+    """
+    查找目录下可能是 Electron 应用的安装目录
+    
+    每个目录只做一次 scandir，用看到的特征文件为目录打分，只有分数足够的目录才成为候选，
+    昂贵的二进制检测只会在这些目录上运行。安装目录本身就是候选，其中的 .exe 不再单独产出，
+    成为候选的目录也不再向下遍历。
+    
+    单个 .exe 放在资源目录外面的安装方式（Foo.exe 旁边是包含 resources 的 Foo 目录）
+    由 .exe 本身作为候选：同名目录自身不是候选、但其中有 resources 时产出该 .exe。
+    
+    参数:
+        directory: 要扫描的目录路径
+        max_depth: 相对 directory 的最大下探深度（None 表示不限制）
+        excludes: 要跳过的路径通配符列表（fnmatch 语法，匹配完整路径）
+        stats: 统计字典，累加 visited 和 pruned 计数
         
-        # 如果需要分析性能，则获取 CPU 使用率和能耗情况
-        if analyze_performance:
-            performance_info = get_process_performance(app_path)
-            app_info.update({
-                'cpu_percent': performance_info['cpu_percent'],
-                'num_threads': performance_info['num_threads'],
-                'energy_impact': performance_info['energy_impact'],
-                'has_performance_data': performance_info['has_performance_data']
-            })
+    返回:
+        generator: 逐个产出候选应用目录路径
+    """
+    if stats is None:
+        stats = {'visited': 0, 'pruned': 0}
+    excludes = excludes or []
+    
+    # 栈中每项为 (目录, 深度, 与目录同名的 .exe 路径或 None)
+    stack = [(directory, 0, None)]
+    while stack:
+        current, depth, loose_exe = stack.pop()
+        stats['visited'] += 1
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
         
-        return app_info
-    except Exception as e:
-        print(f"获取应用 {app_path} 信息时出错: {str(e)}")
-        base_info = {
-            'name': os.path.basename(app_path).replace('.app', '') if IS_MACOS else os.path.splitext(os.path.basename(app_path))[0] if IS_WINDOWS and app_path.lower().endswith('.exe') else os.path.basename(app_path),
-            'path': app_path,
-            'version': "未知",
-            'electron_version': "未知",
-            'size': 0
-        }
+        names = [entry.name for entry in entries]
+        if depth > 0 and score_windows_candidate(os.path.basename(current), names) >= WINDOWS_MIN_CANDIDATE_SCORE:
+            # 候选目录就是应用安装目录，不再进入其内部
+            stats['pruned'] += 1
+            yield current
+            continue
+        if loose_exe is not None and any(name.lower() == 'resources' for name in names):
+            yield loose_exe
         
-        # 如果需要分析内存，添加默认内存信息
-        if analyze_memory:
-            base_info.update({
-                'memory_mb': 0,
-                'running': False,
-                'processes': 0,
-                'status': '未知',
-                'memory_size_ratio': 0
-            })
-            
-        # 如果需要分析性能，添加默认性能信息
-        if analyze_performance:
-            base_info.update({
-                'cpu_percent': 0,
-                'num_threads': 0,
-                'energy_impact': 'N/A',
-                'has_performance_data': False
-            })
+        exes = {entry.name[:-4].lower(): entry.path for entry in entries if entry.name.lower().endswith('.exe')}
+        subdirs = []
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
             
-        return base_info
+            sibling_exe = exes.get(entry.name.lower())
+            if entry.name.startswith('.'):
+                continue
+            elif any(fnmatch.fnmatch(entry.path, pattern) for pattern in excludes):
+                stats['pruned'] += 1
+            elif max_depth is not None and depth + 1 > max_depth:
+                stats['pruned'] += 1
+                # 不再进入同名目录，只看其中是否有 resources
+                if sibling_exe is not None and os.path.isdir(os.path.join(entry.path, 'resources')):
+                    yield sibling_exe
+            else:
+                subdirs.append((entry.path, depth + 1, sibling_exe))
+        
+        # 逆序压栈，保持按名称顺序遍历
+        stack.extend(reversed(subdirs))
 
-def get_dir_size(path):
+def discover_candidates(directory, linux_seen_dirs=None):
     """
-    获取目录或文件大小
+    发现目录中所有可能的 Electron 应用路径
     
     参数:
-        path: 目录或文件路径
+        directory: 要扫描的目录路径
+        linux_seen_dirs: Linux 上已发现的安装目录集合，用于跨目录去重
         
     返回:
-        float: 大小（MB）
+        generator: 逐个产出候选应用路径
     """
-    try:
-        # 检查是否是文件
-        if os.path.isfile(path):
-            return os.path.getsize(path) / (1024 * 1024)  # 转换为MB
-            
-        # 如果是目录，累计所有文件大小
-        total_size = 0
-        for dirpath, _, filenames in os.walk(path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if not os.path.islink(fp):  # 跳过符号链接
-                    try:
-                        total_size += os.path.getsize(fp)
-                    except (OSError, PermissionError):
-                        # 忽略无法访问的文件
-                        pass
-        return total_size / (1024 * 1024)  # 转换为MB
-    except Exception as e:
-        print(f"获取 {path} 大小时出错: {str(e)}")
-        return 0
+    # 根据平台使用不同的搜索策略
+    if IS_WINDOWS:
+        # 在Windows上，只把有 Electron 特征的安装目录作为候选
+        max_depth = DISCOVERY_MAX_DEPTH if DISCOVERY_MAX_DEPTH is not None else WINDOWS_DISCOVERY_DEPTH
+        for app_path in walk_windows_candidates(directory, max_depth, DISCOVERY_EXCLUDES, discovery_stats):
+            yield app_path
+    elif IS_MACOS:
+        # 在macOS上，查找所有.app包，不进入已找到的应用包内部
+        for app_path in walk_app_bundles(directory, DISCOVERY_MAX_DEPTH, DISCOVERY_EXCLUDES, discovery_stats):
+            yield app_path
+    else:  # Linux或其他系统
+        # 在Linux上，把.desktop文件解析为应用安装目录
+        for app_path in discover_linux_apps(directory, linux_seen_dirs):
+            yield app_path
 
-def process_app(app_path, analyze_memory=False, analyze_performance=False):
+# 流水线内部事件
+_CANDIDATE_DISCOVERED = object()
+_DISCOVERY_FINISHED = object()
+
+def run_scan_pipeline(directories, analyze_memory=False, analyze_performance=False, snapshot=None, cache=None,
+                      sampler=None, max_workers=8, max_pending=256, executor='thread', energy_sampler=None):
     """
-    处理单个应用程序
+    流式扫描流水线
+    
+    发现线程把候选路径交给检测线程池，检测为 Electron 的应用再交给信息收集线程池，
+    结果按完成顺序逐个产出，一个慢应用不会阻塞其他应用的结果。
+    同时处理中的候选数量不超过 max_pending，目录再大内存占用也有上限。
     
     参数:
-        app_path: 应用程序包的路径
+        directories: 要扫描的目录列表
         analyze_memory: 是否分析内存使用情况
-        analyze_performance: 是否分析性能信息（CPU、能耗等）
+        analyze_performance: 是否在信息收集阶段分析性能信息
+        snapshot: 本次扫描共享的进程快照（ProcessSnapshot）
+        cache: 增量扫描缓存（ScanCache）
+        sampler: 分析性能时使用的 CpuSampler
+        max_workers: 检测和信息收集阶段各自的最大线程数
+        max_pending: 同时处理中的候选应用数量上限
+        executor: 检测和应用包分析的执行方式（thread、process 或 hybrid），见 StageExecutor
+        energy_sampler: 分析性能时共享的 EnergySampler
         
     返回:
-        dict or None: 如果是 Electron 应用，则返回应用信息，否则返回 None
+        generator: 按完成顺序产出应用信息字典
     """
-    global processed_count
+    global apps_count, processed_count
+    
+    events = queue.Queue()
+    pending = threading.BoundedSemaphore(max_pending)
+    stopped = threading.Event()
+    detect_pool = ThreadPoolExecutor(max_workers=max_workers)
+    info_pool = ThreadPoolExecutor(max_workers=max_workers)
+    stages = StageExecutor(executor, max_workers)
+    linux_seen_dirs = set()
+    
+    def finish(app_info):
+        pending.release()
+        scan_telemetry.queue_changed('results', 1)
+        events.put(app_info)
+    
+    def collect_info(app_path, cached, fingerprint):
+        scan_telemetry.queue_changed('info', -1)
+        app_info = None
+        try:
+            app_info = analyze_app(app_path, analyze_memory, analyze_performance, snapshot, cache,
+                                   cached, fingerprint, sampler, stages, energy_sampler)
+        except Exception as e:
+            print(f"处理应用 {app_path} 时出错: {str(e)}")
+        finish(app_info)
+    
+    def detect(app_path):
+        scan_telemetry.queue_changed('detect', -1)
+        try:
+            is_electron, cached, fingerprint = detect_app(app_path, cache, stages)
+            if is_electron:
+                scan_telemetry.queue_changed('info', 1)
+                info_pool.submit(collect_info, app_path, cached, fingerprint)
+                return
+        except Exception as e:
+            print(f"处理应用 {app_path} 时出错: {str(e)}")
+        finish(None)
+    
+    def discover():
+        try:
+            for directory in directories:
+                # 发现耗时不含等待流水线空位的时间
+                start = time.perf_counter()
+                waited = 0.0
+                for app_path in discover_candidates(directory, linux_seen_dirs):
+                    wait_start = time.perf_counter()
+                    pending.acquire()
+                    waited += time.perf_counter() - wait_start
+                    if stopped.is_set():
+                        pending.release()
+                        return
+                    events.put(_CANDIDATE_DISCOVERED)
+                    scan_telemetry.queue_changed('detect', 1)
+                    detect_pool.submit(detect, app_path)
+                scan_telemetry.record('discovery', time.perf_counter() - start - waited)
+        except Exception as e:
+            if not stopped.is_set():
+                print(f"发现应用时出错: {str(e)}")
+        finally:
+            events.put(_DISCOVERY_FINISHED)
+    
+    apps_count = 0
+    processed_count = 0
+    discovery_finished = False
+    threading.Thread(target=discover, name='electron-discovery', daemon=True).start()
     
     try:
-        if is_electron_app(app_path):
-            app_info = get_app_info(app_path, analyze_memory, analyze_performance)
+        while not discovery_finished or processed_count < apps_count:
+            event = events.get()
+            if event is _CANDIDATE_DISCOVERED:
+                apps_count += 1
+                continue
+            if event is _DISCOVERY_FINISHED:
+                discovery_finished = True
+                continue
+            
             processed_count += 1
+            scan_telemetry.queue_changed('results', -1)
             print_progress()
-            return app_info
-    except Exception as e:
-        print(f"处理应用 {app_path} 时出错: {str(e)}")
-    
-    processed_count += 1
-    print_progress()
-    return None
-
-def print_progress():
-    """打印进度信息"""
-    if apps_count > 0:
-        percent = (processed_count / apps_count) * 100
-        sys.stdout.write(f"\r正在处理: {processed_count}/{apps_count} 应用 ({percent:.1f}%)")
+            if event is not None:
+                yield event
+    finally:
+        stopped.set()
+        detect_pool.shutdown(wait=True)
+        info_pool.shutdown(wait=True)
+        stages.shutdown()
+        
+        # 清除进度条
+        sys.stdout.write('\r' + ' ' * 80 + '\r')
         sys.stdout.flush()
 
+# 增量导出支持的文件格式
+EXPORT_FORMATS = ('ndjson', 'json')
+
+class ExportSink:
+    """
+    增量结果导出
+
+    每条记录编码后立即追加到目标文件旁的临时文件，按条数或时间间隔定期刷新，
+    finalize 时补全 JSON 数组结尾、同步到磁盘，再原子地重命名为目标文件。
+    扫描中途出错时调用 abort，已刷新的记录保留在临时文件中；被 Ctrl+C 中断时
+    把已写入的部分结果完成为 <导出文件>.partial。目标文件始终是某一次完整的导出。
+    内存占用与记录数量无关；可选的排序索引只保存每条记录的排序键和字节偏移。
+    """
+
+    def __init__(self, path, fmt='ndjson', flush_every=64, flush_interval=1.0, index_key=None, index_reverse=False):
+        """
+        参数:
+            path: 导出文件路径
+            fmt: 导出格式，ndjson（每行一条记录）或 json（流式写出的 JSON 数组，每条记录占一行）
+            flush_every: 累计多少条未刷新的记录后刷新一次
+            flush_interval: 距上次刷新超过多少秒后刷新一次
+            index_key: 从记录计算排序键的函数，指定时在 finalize 后写出排序索引
+            index_reverse: 排序索引是否按降序排列
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"不支持的导出格式: {fmt}")
+        self.path = path
+        self.format = fmt
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.index_path = f"{path}.idx.json"
+        self.partial_path = f"{path}.partial"
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.index_key = index_key
+        self.index_reverse = index_reverse
+        self.count = 0
+        self.finalized = False
+        self.closed = False
+        self._index = [] if index_key is not None else None
+        self._offset = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file = open(self.tmp_path, 'wb')
+        if fmt == 'json':
+            self._emit(b'[')
+
+    def _emit(self, data):
+        """写入字节并记录当前偏移"""
+        self._file.write(data)
+        self._offset += len(data)
+
+    def write(self, record):
+        """追加一条记录"""
+        data = json.dumps(record, ensure_ascii=False).encode('utf-8')
+        if self.format == 'json':
+            self._emit(b'\n' if self.count == 0 else b',\n')
+        if self._index is not None:
+            self._index.append((self.index_key(record), self._offset, len(data)))
+        self._emit(data)
+        if self.format == 'ndjson':
+            self._emit(b'\n')
+
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """把已写入的记录刷新到临时文件"""
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def finalize(self, partial=False):
+        """
+        写完结尾并原子地替换目标文件，可重复调用
+
+        参数:
+            partial: 结果不完整（如扫描被中断）时为 True，写到 partial_path 而不覆盖上一次的完整导出，
+                     也不写排序索引
+        """
+        if self.closed:
+            return
+        if self.format == 'json':
+            self._emit(b'\n]\n' if self.count else b']\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self.closed = True
+        if partial:
+            os.replace(self.tmp_path, self.partial_path)
+            return
+        os.replace(self.tmp_path, self.path)
+        self.finalized = True
+        # 完整导出已经替换了目标文件，之前中断留下的部分结果不再需要
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+        if self._index is not None:
+            self._write_index()
+
+    def abort(self):
+        """出错时关闭临时文件但不替换目标文件，已刷新的记录留在 tmp_path 中"""
+        if self.closed:
+            return
+        self._file.close()
+        self.closed = True
+
+    def discard(self):
+        """关闭并删除临时文件，不替换目标文件（结果将由另一个导出器重新写出时使用）"""
+        self.abort()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+    def _write_index(self):
+        """
+        写出排序索引：按排序键排列的 [排序键, 字节偏移, 字节长度]，
+        读取方可以按顺序直接定位每条记录，不需要载入并排序整个导出文件
+        """
+        self._index.sort(key=lambda entry: entry[0], reverse=self.index_reverse)
+        index = {
+            'file': os.path.basename(self.path),
+            'format': self.format,
+            'count': self.count,
+            'reverse': self.index_reverse,
+            'entries': [list(entry) for entry in self._index],
+        }
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    close = finalize
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 只有正常结束才替换目标文件；Ctrl+C 时部分结果另存，其他异常保留临时文件
+        if exc_type is None:
+            self.finalize()
+        elif issubclass(exc_type, KeyboardInterrupt):
+            self.finalize(partial=True)
+        else:
+            self.abort()
+
+def open_export_sinks(ndjson_file=None, json_file=None, flush_interval=1.0, index_key=None, index_reverse=False):
+    """
+    为指定的导出文件创建增量导出器
+
+    返回:
+        list: ExportSink 列表，没有指定导出文件时为空
+    """
+    sinks = []
+    for path, fmt in ((ndjson_file, 'ndjson'), (json_file, 'json')):
+        if path:
+            sinks.append(ExportSink(path, fmt, flush_interval=flush_interval,
+                                    index_key=index_key, index_reverse=index_reverse))
+    return sinks
+
+def rewrite_export_sinks(results, ndjson_file=None, json_file=None, **options):
+    """
+    用补充了进程信息或监控汇总的结果重新写出导出文件
+
+    扫描阶段逐条写出的结果此时已经完成为 <导出文件>.partial。重新写出成功后替换目标文件并删除 .partial；
+    中途出错或被 Ctrl+C 中断时删除临时文件，扫描阶段的 .partial 保留不变。
+
+    参数:
+        results: 要写出的结果列表
+        ndjson_file: NDJSON 导出文件路径
+        json_file: JSON 导出文件路径
+        options: 传给 open_export_sinks 的其他参数
+
+    返回:
+        list: 已完成的 ExportSink 列表
+    """
+    sinks = open_export_sinks(ndjson_file, json_file, **options)
+    try:
+        for sink in sinks:
+            for app_info in results:
+                sink.write(app_info)
+            sink.finalize()
+    except BaseException:
+        for sink in sinks:
+            if not sink.finalized:
+                sink.discard()
+                print(f"\n重新写出导出文件时中断，扫描结果保留在 {sink.partial_path}")
+        raise
+    return sinks
+
+# 列式导出的写入端，文件布局和格式常量见 api/columnar.py
+def _columnar_type(values):
+    """根据一列中的非空值推断列类型"""
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return COLUMN_BOOL
+    if all(isinstance(value, int) and not isinstance(value, bool) and -2 ** 63 <= value < 2 ** 63
+           for value in present):
+        return COLUMN_INT if present else COLUMN_FLOAT
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return COLUMN_FLOAT
+    if all(isinstance(value, str) for value in present):
+        return COLUMN_STRING
+    return COLUMN_JSON
+
+def _pad8(data):
+    """在字节串末尾补零到 8 字节对齐"""
+    return data + b'\0' * (-len(data) % 8)
+
+def write_columnar(records, path):
+    """
+    把扫描结果写成列式二进制文件
+
+    每个字段一列，按值推断为布尔、整数、浮点、字符串或 JSON 类型；字符串（包括列名和 JSON 编码的值）
+    在字符串表中只存一次，重复的应用名称、版本和路径只占一个 uint32 序号。
+    先写入临时文件再原子地替换目标文件。
+
+    参数:
+        records: 应用信息字典列表
+        path: 导出文件路径
+    """
+    fields = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                fields.append(key)
+
+    strings = {}
+
+    def intern(value):
+        return strings.setdefault(value, len(strings))
+
+    rows = len(records)
+    columns = []
+    for field in fields:
+        values = [record.get(field) for record in records]
+        column_type = _columnar_type(values)
+        has_nulls = any(value is None for value in values)
+
+        if column_type == COLUMN_BOOL:
+            data = array.array('B', (1 if value else 0 for value in values))
+        elif column_type == COLUMN_INT:
+            data = array.array('q', (value or 0 for value in values))
+        elif column_type == COLUMN_FLOAT:
+            data = array.array('d', (float('nan') if value is None else value for value in values))
+        elif column_type == COLUMN_STRING:
+            data = array.array('I', (intern(value or '') for value in values))
+        else:
+            data = array.array('I', (intern(json.dumps(value, ensure_ascii=False)) for value in values))
+        if sys.byteorder == 'big':
+            data.byteswap()
+
+        blob = b''
+        if has_nulls:
+            bitmap = bytearray((rows + 7) // 8)
+            for row, value in enumerate(values):
+                if value is not None:
+                    bitmap[row >> 3] |= 1 << (row & 7)
+            blob = _pad8(bytes(bitmap))
+        columns.append((intern(field), column_type, has_nulls, _pad8(blob + data.tobytes())))
+
+    # 列数据从文件头和列目录之后开始，字符串表放在最后
+    offset = len(_pad8(b'\0' * (COLUMNAR_HEADER.size + COLUMNAR_COLUMN.size * len(columns))))
+    directory = b''
+    for name_id, column_type, has_nulls, blob in columns:
+        directory += COLUMNAR_COLUMN.pack(name_id, column_type, has_nulls, offset, len(blob))
+        offset += len(blob)
+
+    encoded = [value.encode('utf-8') for value in strings]
+    string_offsets = array.array('I', [0])
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+    if sys.byteorder == 'big':
+        string_offsets.byteswap()
+
+    header = COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_SCHEMA_VERSION, 0, rows, len(columns),
+                                  len(strings), offset)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_pad8(header + directory))
+        for column in columns:
+            f.write(column[3])
+        f.write(string_offsets.tobytes())
+        f.write(b''.join(encoded))
+    os.replace(tmp_path, path)
+
 def scan_directory(directory, max_workers=8):
     """
     扫描目录查找 Electron 应用
@@ -1128,44 +4823,8 @@ def scan_directory(directory, max_workers=8):
     返回:
         list: 找到的 Electron 应用列表
     """
-    global apps_count, processed_count, electron_apps
-    
     print(f"正在扫描目录: {directory}")
-    
-    # 获取所有 .app 文件
-    app_paths = []
-    for root, dirs, _ in os.walk(directory):
-        # 排除系统应用和缓存目录
-        if '/Library/Caches' in root or '/System/Library' in root:
-            continue
-            
-        for dir_name in dirs:
-            if dir_name.endswith('.app'):
-                app_path = os.path.join(root, dir_name)
-                app_paths.append(app_path)
-    
-    apps_count = len(app_paths)
-    processed_count = 0
-    
-    print(f"找到 {apps_count} 个应用，正在分析...")
-    
-    # 使用线程池并行处理应用
-    results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_app = {executor.submit(process_app, app): app for app in app_paths}
-        for future in future_to_app:
-            try:
-                result = future.result()
-                if result:
-                    results.append(result)
-            except Exception as e:
-                print(f"处理应用时出错: {str(e)}")
-    
-    # 清除进度条
-    sys.stdout.write('\r' + ' ' * 80 + '\r')
-    sys.stdout.flush()
-    
-    return results
+    return list(run_scan_pipeline([directory], max_workers=max_workers))
 
 def format_size(size_mb):
     """格式化大小显示"""
@@ -1180,14 +4839,31 @@ def format_ratio(ratio):
         return "N/A"
     return f"{ratio:.2f}x"
 
-def print_results(results, sort_by='name', export_path=None, show_memory=False, show_performance=False, show_ratio=False, top_n=0):
+def result_sort_key(sort_by='name', show_memory=False, show_performance=False):
+    """
+    返回结果排序使用的排序键函数和排序方向
+
+    返回:
+        tuple: (排序键函数, 是否降序)
+    """
+    if sort_by == 'size':
+        return (lambda x: x['size']), True
+    elif sort_by == 'version':
+        return (lambda x: x['electron_version']), False
+    elif sort_by == 'memory' and show_memory:
+        return (lambda x: x['memory_mb']), True
+    elif sort_by == 'cpu' and show_performance:
+        return (lambda x: x['cpu_percent']), True
+    else:  # 默认按名称排序
+        return (lambda x: x['name'].lower()), False
+
+def print_results(results, sort_by='name', show_memory=False, show_performance=False, show_ratio=False, top_n=0):
     """
     打印结果
     
     参数:
         results: 找到的 Electron 应用列表
         sort_by: 排序方式（name, size, version, memory, cpu）
-        export_path: 导出 JSON 文件的路径
         show_memory: 是否显示内存使用情况
         show_performance: 是否显示性能信息（CPU、能耗等）
         show_ratio: 是否显示内存使用与应用大小的比例
@@ -1198,30 +4874,13 @@ def print_results(results, sort_by='name', export_path=None, show_memory=False,
         return
     
     # 排序结果
-    if sort_by == 'size':
-        results.sort(key=lambda x: x['size'], reverse=True)
-    elif sort_by == 'version':
-        results.sort(key=lambda x: x['electron_version'])
-    elif sort_by == 'memory' and show_memory:
-        results.sort(key=lambda x: x['memory_mb'], reverse=True)
-    elif sort_by == 'cpu' and show_performance:
-        results.sort(key=lambda x: x['cpu_percent'], reverse=True)
-    else:  # 默认按名称排序
-        results.sort(key=lambda x: x['name'].lower())
+    key, reverse = result_sort_key(sort_by, show_memory, show_performance)
+    results.sort(key=key, reverse=reverse)
     
     # 如果指定了 top_n，只保留前 N 个结果
     if top_n > 0 and (show_memory or show_performance):
         results = results[:top_n]
     
-    # 导出为 JSON 文件
-    if export_path:
-        try:
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
-            print(f"结果已导出到 {export_path}")
-        except Exception as e:
-            print(f"导出结果时出错: {str(e)}")
-    
     # 打印结果
     print(f"\n找到 {len(results)} 个 Electron 应用:")
     
@@ -1317,7 +4976,7 @@ def print_results(results, sort_by='name', export_path=None, show_memory=False,
             total_memory = sum(app.get('memory_mb', 0) for app in running_apps)
             avg_memory = total_memory / len(running_apps)
             max_memory = max(app.get('memory_mb', 0) for app in running_apps)
-            min_memory = min(app.get('memory_mb', 0) for app in running_apps if app.get('memory_mb', 0) > 0)
+            min_memory = min((app.get('memory_mb', 0) for app in running_apps if app.get('memory_mb', 0) > 0), default=0)
             
             print("\n内存使用统计:")
             print(f"- 运行中的应用: {len(running_apps)} 个")
@@ -1355,7 +5014,8 @@ def print_results(results, sort_by='name', export_path=None, show_memory=False,
             total_cpu = sum(app.get('cpu_percent', 0) for app in apps_with_performance)
             avg_cpu = total_cpu / len(apps_with_performance)
             max_cpu = max(app.get('cpu_percent', 0) for app in apps_with_performance)
-            min_cpu = min(app.get('cpu_percent', 0) for app in apps_with_performance if app.get('cpu_percent', 0) > 0)
+            min_cpu = min((app.get('cpu_percent', 0) for app in apps_with_performance if app.get('cpu_percent', 0) > 0),
+                          default=0)
             
             print("\nCPU 使用统计:")
             print(f"- 运行中的应用: {len(apps_with_performance)} 个")
@@ -1373,6 +5033,371 @@ def print_results(results, sort_by='name', export_path=None, show_memory=False,
         else:
             print("\nCPU 使用统计: 没有运行中的 Electron 应用")
 
+# 合并导出时每提交一次事务处理的文件数
+MERGE_BATCH_FILES = 200
+# 机群汇总中计算的内存百分位
+MERGE_PERCENTILES = (50, 95)
+# 合并时识别为导出文件的扩展名
+MERGE_EXTENSIONS = ('.json', '.ndjson')
+
+def _iter_json_array(f, buffer, chunk_size):
+    """从已读入的缓冲区开始，逐条解析 JSON 数组中的元素，按需继续读取文件"""
+    decoder = json.JSONDecoder()
+    pos = buffer.index('[') + 1
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if pos < len(buffer):
+            if buffer[pos] == ']':
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+                yield record
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            raise json.JSONDecodeError("JSON 数组不完整", buffer, pos)
+
+        # 缓冲区中剩下的元素不完整，丢弃已解析的部分后继续读取
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+def iter_export_records(path, chunk_size=1 << 16):
+    """
+    流式读取一个导出文件中的记录
+
+    以 '[' 开头的文件按 JSON 数组逐条解析（包括 -e 导出的缩进格式），否则按 NDJSON 逐行解析，
+    内存占用只与单条记录的大小有关。
+
+    参数:
+        path: 导出文件路径
+        chunk_size: 每次读取的字符数
+
+    返回:
+        generator: 逐条产生记录
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        if buffer.lstrip().startswith('['):
+            yield from _iter_json_array(f, buffer, chunk_size)
+            return
+
+        f.seek(0)
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def iter_export_files(inputs, exclude=()):
+    """
+    展开输入路径，逐个产生导出文件
+
+    参数:
+        inputs: 导出文件或目录，目录会递归查找 .json 和 .ndjson 文件
+        exclude: 需要跳过的文件（例如合并输出本身）
+
+    返回:
+        generator: 导出文件路径
+    """
+    excluded = {os.path.abspath(path) for path in exclude if path}
+    for item in inputs:
+        if not os.path.isdir(item):
+            if os.path.abspath(item) not in excluded:
+                yield item
+            continue
+        for root, dirs, files in os.walk(item):
+            dirs.sort()
+            for name in sorted(files):
+                # 跳过排序索引和未完成导出的临时文件
+                if not name.endswith(MERGE_EXTENSIONS) or name.endswith('.idx.json'):
+                    continue
+                path = os.path.join(root, name)
+                if os.path.abspath(path) not in excluded:
+                    yield path
+
+def _merge_host_id(path, record, host_from):
+    """确定记录所属的主机：优先使用记录中的 host_id，否则取文件名或所在目录名"""
+    host = record.get('host_id')
+    if host:
+        return str(host)
+    if host_from == 'dir':
+        return os.path.basename(os.path.dirname(os.path.abspath(path)))
+    name = os.path.basename(path)
+    for extension in MERGE_EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+def _merge_text(value):
+    """把记录中的文本字段转换为字符串，空值保持为 None"""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value)
+
+def _merge_number(value):
+    """把记录中的数值字段转换为浮点数，无法转换（如字典、布尔值）时返回 None"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _app_identity(record):
+    """应用在不同机器之间的标识：应用名称（不区分大小写），没有名称时取路径的最后一段"""
+    name = _merge_text(record.get('name')) or os.path.basename(str(record.get('path') or '').rstrip('/\\'))
+    return name.strip().lower()
+
+class FleetMerger:
+    """
+    多台机器导出结果的合并器
+
+    逐个文件流式读取记录，写入 SQLite 工作库，按 (主机, 应用, 版本) 去重，后读到的记录覆盖先前的；
+    每条记录保存来源文件，文件变化后重新合并时先删除它上次写入的记录。
+    汇总时由 SQLite 分组排序，再按应用顺序逐个产出统计结果。
+    工作状态全部在磁盘上，合并上万个文件时内存占用也保持不变。
+    """
+
+    def __init__(self, db_path):
+        """
+        参数:
+            db_path: SQLite 工作库路径，已存在时在其基础上继续合并
+        """
+        self.db_path = db_path
+        self.db = sqlite3.connect(db_path)
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        columns = [row[1] for row in self.db.execute('PRAGMA table_info(records)')]
+        if columns and 'file' not in columns:
+            # 旧版工作库的记录没有来源文件，无法增量更新，清空后全部重新合并
+            self.db.execute('DROP TABLE records')
+            self.db.execute('DROP TABLE IF EXISTS files')
+        self.db.execute('CREATE TABLE IF NOT EXISTS files ('
+                        'path TEXT PRIMARY KEY, mtime REAL, size INTEGER, records INTEGER)')
+        self.db.execute('CREATE TABLE IF NOT EXISTS records ('
+                        'host TEXT, app TEXT, version TEXT, name TEXT, electron_version TEXT, '
+                        'size REAL, memory_mb REAL, record TEXT, file TEXT, PRIMARY KEY (host, app, version))')
+        self.db.execute('CREATE INDEX IF NOT EXISTS records_memory ON records (app, memory_mb)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS records_file ON records (file)')
+        self.db.commit()
+        self.files = 0
+        self.skipped = 0
+        self.errors = 0
+        self.records = 0
+        self.duplicates = 0
+
+    def add_file(self, path, host_from='file'):
+        """
+        合并一个导出文件，路径、修改时间和大小都与上次合并时相同的文件直接跳过
+
+        参数:
+            path: 导出文件路径
+            host_from: 记录中没有 host_id 时主机标识的来源，file 或 dir
+        """
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"读取导出文件 {path} 时出错: {str(e)}")
+            self.errors += 1
+            return
+
+        key = os.path.abspath(path)
+        row = self.db.execute('SELECT mtime, size FROM files WHERE path = ?', (key,)).fetchone()
+        if row is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            self.skipped += 1
+            return
+
+        # 每个文件一个保存点，文件损坏时撤销它已写入的记录；外层事务由 commit() 按批提交
+        if not self.db.in_transaction:
+            self.db.execute('BEGIN')
+        self.db.execute('SAVEPOINT merge_file')
+        count = 0
+        duplicates = 0
+        try:
+            # 文件内容变化时，它上次合并的记录可能已不存在，先删除再重新写入
+            self.db.execute('DELETE FROM records WHERE file = ?', (key,))
+            for record in iter_export_records(path):
+                if not isinstance(record, dict):
+                    continue
+                host = _merge_host_id(path, record, host_from)
+                record = dict(record, host_id=host)
+                app = _app_identity(record)
+                version = _merge_text(record.get('version')) or '未知'
+                memory = _merge_number(record.get('memory_mb')) if record.get('running') else None
+                if self.db.execute('SELECT 1 FROM records WHERE host = ? AND app = ? AND version = ?',
+                                   (host, app, version)).fetchone():
+                    duplicates += 1
+                self.db.execute(
+                    'INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (host, app, version, _merge_text(record.get('name')),
+                     _merge_text(record.get('electron_version')) or '未知', _merge_number(record.get('size')),
+                     memory if memory else None, json.dumps(record, ensure_ascii=False), key))
+                count += 1
+        except (OSError, ValueError, TypeError, AttributeError, sqlite3.Error) as e:
+            self.db.execute('ROLLBACK TO merge_file')
+            self.db.execute('RELEASE merge_file')
+            print(f"读取导出文件 {path} 时出错: {str(e)}")
+            self.errors += 1
+            return
+
+        self.db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', (key, stat.st_mtime, stat.st_size, count))
+        self.db.execute('RELEASE merge_file')
+        self.files += 1
+        self.records += count
+        self.duplicates += duplicates
+
+    def commit(self):
+        """提交已合并的文件"""
+        self.db.commit()
+
+    def _groups(self, sql):
+        """执行按应用排序的查询，逐个产生 (应用, 该应用的行列表)"""
+        app = None
+        rows = []
+        for row in self.db.execute(sql):
+            if row[0] != app and rows:
+                yield app, rows
+                rows = []
+            app = row[0]
+            rows.append(row[1:])
+        if rows:
+            yield app, rows
+
+    def aggregates(self):
+        """
+        逐个应用产出机群汇总
+
+        几个查询都按应用排序，按应用顺序同步推进，每次只在内存中保留一个应用的数据。
+
+        返回:
+            generator: 每个应用一条汇总记录，包含安装数、版本和 Electron 版本分布、内存 p50/p95；
+                       同时提供 name、size、electron_version、memory_mb、running 字段，可以直接用可视化工具打开
+        """
+        versions = self._groups('SELECT app, version, COUNT(DISTINCT host) FROM records '
+                                'GROUP BY app, version ORDER BY app, 3 DESC, 2')
+        electron_versions = self._groups('SELECT app, electron_version, COUNT(DISTINCT host) FROM records '
+                                         'GROUP BY app, electron_version ORDER BY app, 3 DESC, 2')
+        memory = self._groups('SELECT app, memory_mb FROM records WHERE memory_mb IS NOT NULL '
+                              'ORDER BY app, memory_mb')
+        pending = {'versions': next(versions, None), 'electron': next(electron_versions, None),
+                   'memory': next(memory, None)}
+        streams = {'versions': versions, 'electron': electron_versions, 'memory': memory}
+
+        def take(kind, app):
+            group = pending[kind]
+            if group is None or group[0] != app:
+                return []
+            pending[kind] = next(streams[kind], None)
+            return group[1]
+
+        for app, name, installs, record_count, size in self.db.execute(
+                'SELECT app, MIN(name), COUNT(DISTINCT host), COUNT(*), AVG(size) FROM records '
+                'GROUP BY app ORDER BY app'):
+            version_spread = take('versions', app)
+            electron_spread = take('electron', app)
+            samples = [row[0] for row in take('memory', app)]
+
+            aggregate = {
+                'name': name or app,
+                'app': app,
+                'install_count': installs,
+                'records': record_count,
+                'versions': {version: hosts for version, hosts in version_spread},
+                'electron_versions': {version: hosts for version, hosts in electron_spread},
+                'electron_version_count': len(electron_spread),
+                'electron_version': electron_spread[0][0] if electron_spread else '未知',
+                'size': size or 0,
+                'memory_samples': len(samples),
+            }
+            # 最近秩法计算百分位
+            for percentile in MERGE_PERCENTILES:
+                rank = max(1, -(-percentile * len(samples) // 100))
+                aggregate[f'memory_p{percentile}_mb'] = samples[rank - 1] if samples else 0
+            aggregate['memory_mb'] = aggregate['memory_p50_mb']
+            aggregate['running'] = len(samples) > 0
+            yield aggregate
+
+    def iter_records(self):
+        """按主机和应用顺序逐条产出去重后、带有 host_id 的原始记录"""
+        for (record,) in self.db.execute('SELECT record FROM records ORDER BY host, app, version'):
+            yield json.loads(record)
+
+    def close(self):
+        """提交并关闭工作库"""
+        self.db.commit()
+        self.db.close()
+
+def parse_merge_arguments(argv):
+    """解析 merge 子命令的参数"""
+    parser = argparse.ArgumentParser(
+        prog='find_electron_apps.py merge',
+        description='合并多台机器导出的扫描结果，生成按应用汇总的机群数据集',
+        epilog='''
+示例:
+  # 合并目录下所有机器的导出文件（文件名作为主机标识）
+  python find_electron_apps.py merge exports/ -o fleet.json
+  
+  # 每台机器一个目录（hosts/<主机>/electron_apps.json），保留工作库以便增量合并
+  python find_electron_apps.py merge hosts/ --host-from dir -o fleet.json --work-db fleet.sqlite
+''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help='导出文件（JSON 或 NDJSON），或递归查找 .json/.ndjson 文件的目录')
+    parser.add_argument('-o', '--output', required=True,
+                        help='机群汇总数据集的路径，以 .ndjson 结尾时输出 NDJSON，否则输出 JSON 数组')
+    parser.add_argument('--records-file',
+                        help='同时输出去重后带有 host_id 的全部记录（NDJSON）')
+    parser.add_argument('--host-from', choices=['file', 'dir'], default='file',
+                        help='记录中没有 host_id 时，使用文件名(file)或所在目录名(dir)作为主机标识 (默认: file)')
+    parser.add_argument('--work-db',
+                        help='合并工作库（SQLite）的路径；指定后会保留，再次合并时跳过未变化的文件 '
+                             '(默认: 输出文件旁的临时库，完成后删除)')
+    return parser.parse_args(argv)
+
+def merge_main(argv):
+    """merge 子命令：合并多台机器的导出结果"""
+    args = parse_merge_arguments(argv)
+    start_time = time.time()
+
+    db_path = args.work_db or f"{args.output}.{os.getpid()}.sqlite"
+    merger = FleetMerger(db_path)
+    try:
+        for index, path in enumerate(iter_export_files(args.inputs, (args.output, args.records_file)), 1):
+            merger.add_file(path, args.host_from)
+            if index % MERGE_BATCH_FILES == 0:
+                merger.commit()
+                print(f"\r已读取 {index} 个文件，{merger.records} 条记录", end='', flush=True)
+        merger.commit()
+        print(f"\r合并完成: 读取 {merger.files} 个文件，跳过未变化的 {merger.skipped} 个，出错 {merger.errors} 个；"
+              f"{merger.records} 条记录，去重 {merger.duplicates} 条")
+
+        apps = 0
+        with ExportSink(args.output, 'ndjson' if args.output.endswith('.ndjson') else 'json') as sink:
+            for aggregate in merger.aggregates():
+                sink.write(aggregate)
+            apps = sink.count
+        print(f"已将 {apps} 个应用的机群汇总写入 {args.output}")
+
+        if args.records_file:
+            with ExportSink(args.records_file, 'ndjson') as sink:
+                for record in merger.iter_records():
+                    sink.write(record)
+            print(f"已将 {sink.count} 条去重记录写入 {args.records_file}")
+    finally:
+        merger.close()
+        if not args.work_db:
+            for path in (db_path, db_path + '-journal'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    print(f"用时 {time.time() - start_time:.2f} 秒")
+    return 0
+
 def parse_arguments():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(
@@ -1415,6 +5440,15 @@ def parse_arguments():
     parser.add_argument('-d', '--directories', nargs='+', 
                       help=dirs_help)
     
+    # 发现选项
+    discovery_group = parser.add_argument_group('发现选项')
+    discovery_group.add_argument('--max-depth', type=int, default=None,
+                               help='查找应用包时相对扫描目录的最大深度 (默认: ' + (str(WINDOWS_DISCOVERY_DEPTH) if IS_WINDOWS else '不限制') + ')')
+    
+    discovery_group.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                               help='跳过匹配该通配符的目录（匹配完整路径，可多次指定），'
+                                    f'默认已排除: {", ".join(DEFAULT_DISCOVERY_EXCLUDES)}')
+    
     # 分析选项
     analysis_group = parser.add_argument_group('分析选项')
     analysis_group.add_argument('-m', '--memory', action='store_true',
@@ -1426,6 +5460,17 @@ def parse_arguments():
     analysis_group.add_argument('--ratio', action='store_true',
                               help='显示内存使用与应用大小的比例分析')
     
+    analysis_group.add_argument('--pss', action='store_true',
+                              help='同时采集按比例分摊共享内存的 PSS 和进程独占的 USS：Linux 上读取 '
+                                   '/proc/[pid]/smaps_rollup，其他平台使用 psutil 的 memory_full_info；'
+                                   '内存/大小比例和监控模式改用 PSS 计算')
+    
+    analysis_group.add_argument('--cpu-mode', choices=CpuSampler.MODES, default='interval',
+                              help='CPU采样方式：所有进程共享一个采样间隔(interval)，或与扫描开始时的进程快照比较的零等待模式(delta)')
+    
+    analysis_group.add_argument('--cpu-interval', type=float, default=0.5,
+                              help='interval 模式下的共享CPU采样间隔，单位秒 (默认: 0.5)')
+    
     # 显示选项
     display_group = parser.add_argument_group('显示选项')
     display_group.add_argument('-s', '--sort', choices=['name', 'size', 'version', 'memory', 'cpu'], default='name',
@@ -1434,22 +5479,94 @@ def parse_arguments():
     display_group.add_argument('--top', type=int, default=0,
                              help='只显示资源使用最多的前 N 个应用')
     
+    # 监控选项
+    monitor_group = parser.add_argument_group('监控选项')
+    monitor_group.add_argument('--monitor', action='store_true',
+                             help='扫描完成后持续监控各应用的内存和 CPU，按 Ctrl+C 结束')
+    monitor_group.add_argument('--monitor-interval', type=float, default=1.0,
+                             help='监控采样间隔，单位秒 (默认: 1.0)')
+    monitor_group.add_argument('--monitor-duration', type=float, default=0,
+                             help='监控时长，单位秒 (默认: 0，直到按 Ctrl+C)')
+    monitor_group.add_argument('--monitor-history', type=int, default=3600,
+                             help='每个应用保留的最近原始采样数量，更早的数据只保留 1 分钟和 15 分钟汇总 (默认: 3600)')
+    monitor_group.add_argument('--monitor-store', metavar='DIR',
+                             help='把监控时间序列追加写入该目录（可 mmap 读取），再次监控时继续追加')
+    
     # 输出选项
     output_group = parser.add_argument_group('输出选项')
     output_group.add_argument('-e', '--json-file', 
                             help='将结果导出为 JSON 文件的路径')
+    output_group.add_argument('--ndjson-file',
+                            help='扫描过程中按完成顺序逐条写入结果的 NDJSON 文件路径；'
+                                 '与 --memory/--performance/--monitor 同用时，扫描结束后用补充了进程信息的结果重新写出')
+    output_group.add_argument('--columnar-file', metavar='FILE',
+                            help='将结果导出为列式二进制文件（按字段分列、字符串去重，可视化工具可直接加载，建议使用 .eac 扩展名）')
+    output_group.add_argument('--export-index', action='store_true',
+                            help='导出完成后额外写入按 --sort 排序的索引文件（<导出文件>.idx.json）')
+    output_group.add_argument('--export-flush-interval', type=float, default=1.0, metavar='SECONDS',
+                            help='导出临时文件的刷新间隔，单位秒 (默认: 1.0)')
+    output_group.add_argument('--telemetry', action='store_true',
+                            help='显示各扫描阶段的耗时、最慢的应用和队列峰值深度')
+    output_group.add_argument('--telemetry-file', metavar='FILE',
+                            help='将扫描遥测（阶段耗时直方图、最慢应用、队列深度变化）导出为 JSON 文件')
+    output_group.add_argument('--metrics-file', metavar='FILE',
+                            help='将扫描遥测导出为 OpenMetrics 文本文件')
+    output_group.add_argument('--slow-apps', type=int, default=5, metavar='N',
+                            help='遥测中列出的最慢应用数量 (默认: 5)')
+    output_group.add_argument('--probe-report', nargs='?', const='-', metavar='FILE',
+                            help='显示各检测探针的命中率和耗时，指定文件时同时导出为 JSON '
+                                 '（缓存命中的应用不会执行探针，可配合 --no-cache 使用）')
     
     # 性能选项
     perf_group = parser.add_argument_group('性能选项')
     perf_group.add_argument('-w', '--workers', type=int, default=8,
                           help='同时处理的最大线程数量 (默认: 8)')
     
+    perf_group.add_argument('--executor', choices=EXECUTOR_MODES, default='thread',
+                          help='检测和应用包分析的执行方式：全部使用线程(thread)、全部交给进程池(process)，'
+                               '或检测和大小统计用线程、CPU 密集的版本分析用进程池(hybrid) (默认: thread)')
+    
+    perf_group.add_argument('--max-subprocesses', type=int, default=MAX_SUBPROCESSES,
+                          help=f'同时运行的外部命令（wmic、ps、powermetrics 等）数量上限 (默认: {MAX_SUBPROCESSES})')
+    
+    perf_group.add_argument('--scan-deadline', type=float, default=0,
+                          help='扫描截止时间，单位秒；到期后取消所有未完成的外部命令 (默认: 0，不限制)')
+    
+    perf_group.add_argument('--marker-budget', type=float, default=0,
+                          help='在可执行文件中查找 Electron 特征时每个文件最多读取的大小，单位MB (默认: 0，不限制)')
+    
+    if IS_LINUX:
+        perf_group.add_argument('--proc-root', default=PROC_ROOT,
+                              help=f'读取进程信息的 proc 目录 (默认: {PROC_ROOT})')
+    
+    perf_group.add_argument('--cache-file', default=DEFAULT_CACHE_FILE,
+                          help=f'增量扫描缓存文件的路径 (默认: {DEFAULT_CACHE_FILE})')
+    
+    perf_group.add_argument('--no-cache', action='store_true',
+                          help='不使用增量扫描缓存，重新分析所有应用')
+    
     return parser.parse_args()
 
 def main():
     """主函数"""
+    # merge 子命令有自己的参数，不与扫描参数混在一起
+    if len(sys.argv) > 1 and sys.argv[1] == 'merge':
+        return merge_main(sys.argv[2:])
+    
     args = parse_arguments()
     
+    # 设置二进制特征查找的读取上限和 proc 目录
+    global MARKER_BYTE_BUDGET, PROC_ROOT, DISCOVERY_MAX_DEPTH, DISCOVERY_EXCLUDES, MAX_SUBPROCESSES, COLLECT_PSS
+    if IS_LINUX:
+        PROC_ROOT = args.proc_root
+    COLLECT_PSS = args.pss
+    if args.marker_budget > 0:
+        MARKER_BYTE_BUDGET = int(args.marker_budget * 1024 * 1024)
+    
+    # 设置应用发现的深度限制和排除规则
+    DISCOVERY_MAX_DEPTH = args.max_depth
+    DISCOVERY_EXCLUDES = DEFAULT_DISCOVERY_EXCLUDES + [os.path.expanduser(pattern) for pattern in args.exclude]
+    
     # 确定要扫描的目录
     directories = args.directories if args.directories else DEFAULT_SEARCH_DIRS
     
@@ -1468,6 +5585,12 @@ def main():
     # 记录开始时间
     start_time = time.time()
     
+    # 外部命令的并发上限和扫描截止时间
+    MAX_SUBPROCESSES = max(1, args.max_subprocesses)
+    runner = get_command_runner()
+    if args.scan_deadline > 0:
+        runner.set_deadline(args.scan_deadline)
+    
     # 扫描每个目录
     all_results = []
     
@@ -1476,75 +5599,114 @@ def main():
         print("将分析 Electron 应用的内存使用情况...")
         print("注意: 只有正在运行的应用才会显示内存使用数据")
     
-    # 扫描每个目录
-    for directory in valid_directories:
-        # 获取所有可能的Electron应用路径
-        app_paths = []
-        
-        # 根据平台使用不同的搜索策略
-        if IS_WINDOWS:
-            # 在Windows上，递归查找所有.exe文件和目录
-            for root, dirs, files in os.walk(directory):
-                # 首先检查目录
-                for dir_name in dirs:
-                    if not dir_name.startswith('.'):  # 跳过隐藏目录
-                        app_dir_path = os.path.join(root, dir_name)
-                        app_paths.append(app_dir_path)
-                
-                # 然后检查.exe文件
-                for file_name in files:
-                    if file_name.lower().endswith('.exe'):
-                        app_path = os.path.join(root, file_name)
-                        app_paths.append(app_path)
-                        
-                # 为避免扫描过多文件，限制递归深度
-                if len(root.split(os.sep)) - len(directory.split(os.sep)) > 2:
-                    # 清空dirs列表以停止递归
-                    dirs[:] = []
-        elif IS_MACOS:
-            # 在macOS上，递归查找所有.app包
-            for root, dirs, _ in os.walk(directory):
-                # 排除系统应用和缓存目录
-                if '/Library/Caches' in root or '/System/Library' in root:
-                    continue
-                    
-                for dir_name in dirs:
-                    if dir_name.endswith('.app'):
-                        app_path = os.path.join(root, dir_name)
-                        app_paths.append(app_path)
-        else:  # Linux或其他系统
-            # 在Linux上，查找.desktop文件
-            for root, _, files in os.walk(directory):
-                for file_name in files:
-                    if file_name.endswith('.desktop'):
-                        app_path = os.path.join(root, file_name)
-                        app_paths.append(app_path)
-        
-        global apps_count, processed_count
-        apps_count = len(app_paths)
-        processed_count = 0
-        
-        print(f"正在扫描目录 {directory}，找到 {apps_count} 个应用，正在分析...")
-        
-        results = []
-        with ThreadPoolExecutor(max_workers=args.workers) as executor:
-            future_to_app = {executor.submit(process_app, app, args.memory, args.performance): app for app in app_paths}
-            for future in future_to_app:
-                try:
-                    result = future.result()
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    print(f"处理应用时出错: {str(e)}")
-        
-        # 清除进度条
-        sys.stdout.write('\r' + ' ' * 80 + '\r')
-        sys.stdout.flush()
-        
-        all_results.extend(results)
+    # 加载增量扫描缓存，未变化的应用直接复用上次的分析结果
+    cache = None if args.no_cache else ScanCache(args.cache_file)
+    
+    # 整个扫描只采集一次进程表，所有应用共享同一个快照
+    snapshot = None
+    if args.memory or args.performance:
+        snapshot = ProcessSnapshot.capture()
+        print(f"已采集进程快照: {len(snapshot)} 个进程")
+    
+    # 进程归属需要所有应用一起参与一次匹配才能裁决冲突，
+    # 因此内存和性能分析都放到扫描结束后统一进行；delta 模式的CPU采样仍然不需要等待
+    sampler = None
+    energy_sampler = None
+    if args.performance:
+        sampler = CpuSampler(args.cpu_mode, args.cpu_interval, baseline=snapshot)
+        # 整个扫描只运行一次 powermetrics，所有应用共享同一份能耗数据
+        energy_sampler = EnergySampler()
+    
+    # 导出文件逐条写入临时文件，结束时原子地重命名；可选按 --sort 的顺序写出排序索引
+    index_key, index_reverse = result_sort_key(args.sort, args.memory, args.performance)
+    export_options = {
+        'flush_interval': args.export_flush_interval,
+        'index_key': index_key if args.export_index else None,
+        'index_reverse': index_reverse,
+    }
+    
+    # 扫描结果按完成顺序边扫描边导出，中断时已完成的结果也会保留；
+    # 需要补充进程信息或监控汇总时，扫描结果先完成为 .partial，补充后再重新写出一遍
+    enrich_export = snapshot is not None or bool(args.monitor)
+    sinks = open_export_sinks(args.ndjson_file, args.json_file, **export_options)
+    
+    print(f"正在扫描目录: {', '.join(valid_directories)}")
+    try:
+        for app_info in run_scan_pipeline(valid_directories, cache=cache, max_workers=args.workers,
+                                          executor=args.executor):
+            all_results.append(app_info)
+            for sink in sinks:
+                sink.write(app_info)
+    except KeyboardInterrupt:
+        # 已完成的结果另存为 .partial，上一次的完整导出保持不变
+        for sink in sinks:
+            sink.finalize(partial=True)
+            print(f"\n扫描被中断，已将 {sink.count} 条部分结果写入 {sink.partial_path}")
+        raise
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    for sink in sinks:
+        sink.finalize(partial=enrich_export)
+    
+    if discovery_stats['visited']:
+        print(f"应用发现: 访问 {discovery_stats['visited']} 个目录，剪枝 {discovery_stats['pruned']} 个")
+    
+    # 淘汰已删除应用的缓存条目并保存缓存
+    if cache is not None:
+        cache.evict_stale(None if IS_LINUX else valid_directories)
+        cache.save()
+        print(f"扫描缓存: 命中 {cache.hits}，未命中 {cache.misses}，淘汰 {cache.evicted}，共 {len(cache)} 条")
+    
+    if runner.started or runner.cancelled:
+        print(f"外部命令: 启动 {runner.started}，合并 {runner.deduplicated}，"
+              f"超时 {runner.timed_out}，取消 {runner.cancelled}")
+    
+    # 检测探针统计，用于根据实际数据调整探针顺序
+    if args.probe_report:
+        report = get_probe_chain().report()
+        print_probe_report(report)
+        if args.probe_report != '-':
+            try:
+                with open(args.probe_report, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+                print(f"探针统计已导出到: {args.probe_report}")
+            except OSError as e:
+                print(f"导出探针统计时出错: {str(e)}")
+    
+    # 所有目录扫描完成后，一次遍历进程表把进程归属到全部应用，再统一采集内存和CPU
+    if snapshot is not None:
+        snapshot.assign_apps([app_info['path'] for app_info in all_results])
+        if args.memory:
+            collect_memory(all_results, snapshot)
+        if args.performance:
+            collect_performance(all_results, snapshot, sampler, energy_sampler)
+    
+    # 持续监控，监控汇总会写入导出结果
+    if args.monitor and all_results:
+        run_monitor(all_results, args.monitor_interval, args.monitor_duration or None, args.monitor_history,
+                    args.monitor_store)
+    
+    if enrich_export:
+        sinks = rewrite_export_sinks(all_results, args.ndjson_file, args.json_file, **export_options)
+    for sink in sinks:
+        print(f"已将 {sink.count} 条结果写入 {sink.path}" + (f"（排序索引: {sink.index_path}）" if args.export_index else ''))
+    if args.columnar_file:
+        try:
+            write_columnar(all_results, args.columnar_file)
+            print(f"已将 {len(all_results)} 条结果写入列式文件 {args.columnar_file}")
+        except OSError as e:
+            print(f"导出列式文件时出错: {str(e)}")
     
     # 打印结果
-    print_results(all_results, args.sort, args.export, args.memory, args.performance, args.ratio, args.top)
+    print_results(all_results, args.sort, args.memory, args.performance, args.ratio, args.top)
+    
+    # 扫描遥测
+    if args.telemetry:
+        scan_telemetry.print_summary(args.slow_apps)
+    if args.telemetry_file or args.metrics_file:
+        scan_telemetry.export(args.telemetry_file, args.metrics_file, args.slow_apps)
     
     # 打印总用时
     elapsed_time = time.time() - start_time
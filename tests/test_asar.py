@@ -0,0 +1,45 @@
+import json
+import struct
+
+import pytest
+
+import find_electron_apps as fea
+
+
+def write_asar(path, files):
+    """按 Chromium Pickle 布局写一个只包含顶层文件的 ASAR 归档"""
+    header = {'files': {}}
+    data = b''
+    for name, content in files.items():
+        header['files'][name] = {'size': len(content), 'offset': str(len(data))}
+        data += content
+    header_json = json.dumps(header).encode('utf-8')
+    payload = struct.pack('<I', len(header_json)) + header_json
+    payload += b'\0' * (-len(payload) % 4)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<3I', 4, len(payload) + 4, len(payload)))
+        f.write(payload)
+        f.write(data)
+
+
+def test_read_asar_header(tmp_path):
+    path = tmp_path / 'app.asar'
+    write_asar(path, {'package.json': b'{}', 'main.js': b'console.log(1)'})
+    header, data_offset = fea.read_asar_header(str(path))
+    assert set(header['files']) == {'package.json', 'main.js'}
+    assert data_offset == path.stat().st_size - len(b'{}console.log(1)')
+
+
+def test_read_asar_package_json(tmp_path):
+    path = tmp_path / 'app.asar'
+    write_asar(path, {'main.js': b'x', 'package.json': json.dumps({'name': 'foo', 'version': '1.2.3'}).encode()})
+    assert fea.read_asar_package_json(str(path)) == {'name': 'foo', 'version': '1.2.3'}
+    assert fea.read_asar_file(str(path), 'missing.js') is None
+
+
+@pytest.mark.parametrize('content', [b'', b'\0' * 8, struct.pack('<4I', 5, 8, 4, 4), struct.pack('<4I', 4, 8, 4, 100)])
+def test_read_asar_header_rejects_invalid_files(tmp_path, content):
+    path = tmp_path / 'app.asar'
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        fea.read_asar_header(str(path))
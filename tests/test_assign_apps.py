@@ -0,0 +1,41 @@
+import os
+
+import find_electron_apps as fea
+
+
+def proc(pid, ppid, exe, command, name):
+    return {'pid': pid, 'ppid': ppid, 'name': name, 'exe': exe, 'command': command,
+            'rss': 0, 'pss': None, 'uss': None, 'num_threads': 1, 'cpu_time': 0.0}
+
+
+def test_path_roots_take_their_descendants():
+    snapshot = fea.ProcessSnapshot([
+        proc(1, 0, '/sbin/init', '/sbin/init', 'init'),
+        proc(10, 1, '/opt/Foo/foo', '/opt/Foo/foo', 'foo'),
+        proc(11, 10, '/opt/Foo/foo', '/opt/Foo/foo --type=renderer', 'foo'),
+        proc(12, 10, '/bin/sh', '/bin/sh -c helper', 'sh'),
+    ])
+    assigned = snapshot.assign_apps(['/opt/Foo'])
+    assert [p['pid'] for p in assigned['/opt/Foo']] == [10, 11, 12]
+
+
+def test_name_matches_do_not_take_descendants():
+    snapshot = fea.ProcessSnapshot([
+        proc(1, 0, '/sbin/init', '/sbin/init', 'init'),
+        proc(20, 1, '', '/usr/bin/code', 'code'),
+        proc(21, 20, '', '/bin/bash', 'bash'),
+        proc(22, 21, '', 'python3 build.py', 'python3'),
+    ])
+    assigned = snapshot.assign_apps(['/usr/share/code'])
+    assert [p['pid'] for p in assigned['/usr/share/code']] == [20]
+    assert [p['pid'] for p in snapshot.find_app_processes('/usr/share/code')] == [20]
+
+
+def test_scanner_ancestry_is_never_name_matched():
+    me = os.getpid()
+    snapshot = fea.ProcessSnapshot([
+        proc(1, 0, '/sbin/init', '/sbin/init', 'init'),
+        proc(30, 1, '', '/usr/bin/code', 'code'),
+        proc(me, 30, '', 'python3 find_electron_apps.py', 'python3'),
+    ])
+    assert snapshot.assign_apps(['/usr/share/code'])['/usr/share/code'] == []
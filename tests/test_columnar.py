@@ -0,0 +1,45 @@
+import pytest
+
+import find_electron_apps as fea
+from api.columnar import ColumnarFile, is_columnar_file, load_columnar
+
+RECORDS = [
+    {'name': 'Slack', 'size': 310.5, 'running': True, 'process_count': 7, 'roles': {'renderer': 4}},
+    {'name': 'Code', 'size': None, 'running': False, 'process_count': None},
+    {'name': 'Slack', 'size': 12.0, 'running': False, 'process_count': 0, 'version': '1.0'},
+]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'apps.eac')
+    fea.write_columnar(RECORDS, path)
+    assert is_columnar_file(path)
+
+    expected = [dict({field: None for field in ('name', 'size', 'running', 'process_count', 'roles', 'version')},
+                     **record) for record in RECORDS]
+    assert load_columnar(path) == expected
+
+
+def test_reads_selected_columns(tmp_path):
+    path = str(tmp_path / 'apps.eac')
+    fea.write_columnar(RECORDS, path)
+    with ColumnarFile(path) as data:
+        assert data.rows == 3
+        assert data.column('name') == ['Slack', 'Code', 'Slack']
+        assert data.records(['running']) == [{'running': True}, {'running': False}, {'running': False}]
+
+
+def test_empty_export(tmp_path):
+    path = str(tmp_path / 'apps.eac')
+    fea.write_columnar([], path)
+    assert load_columnar(path) == []
+
+
+def test_truncated_file_raises_value_error(tmp_path):
+    path = tmp_path / 'apps.eac'
+    fea.write_columnar(RECORDS, str(path))
+    data = path.read_bytes()
+    for length in range(len(data)):
+        path.write_bytes(data[:length])
+        with pytest.raises(ValueError):
+            load_columnar(str(path))
@@ -0,0 +1,71 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import find_electron_apps as fea
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='使用 POSIX shell 命令')
+
+
+@pytest.fixture
+def runner():
+    runner = fea.CommandRunner(max_concurrent=4, timeouts={'sleep': 0.2})
+    yield runner
+    runner.close()
+
+
+def test_run_returns_completed_process(runner):
+    result = runner.run(['sh', '-c', 'echo out; echo err >&2; exit 3'])
+    assert (result.returncode, result.stdout, result.stderr) == (3, 'out\n', 'err\n')
+    assert runner.started == 1
+
+
+def test_identical_inflight_commands_run_once(runner):
+    cmd = ['sh', '-c', 'sleep 0.3; echo $$']
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(runner.run(cmd).stdout)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == 1 and len(results) == 3
+    assert (runner.started, runner.deduplicated) == (1, 2)
+
+
+def test_per_tool_timeout_kills_the_process(runner):
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run(['sleep', '5'])
+    assert time.monotonic() - start < 2
+    assert runner.timed_out == 1
+
+
+def test_timeout_also_kills_grandchildren(runner):
+    # sh 启动的 sleep 继承了输出管道，只杀 sh 时读取输出会一直等到 sleep 结束
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run(['sh', '-c', 'sleep 5; echo done'], timeout=0.2)
+    assert time.monotonic() - start < 2
+
+
+def test_timeout_for_uses_the_command_behind_sudo(runner):
+    assert runner.timeout_for(['/usr/bin/sleep', '1']) == 0.2
+    assert runner.timeout_for(['sudo', 'powermetrics']) == fea.COMMAND_TIMEOUTS['powermetrics']
+    assert runner.timeout_for(['unknown-tool']) == fea.DEFAULT_COMMAND_TIMEOUT
+
+
+def test_deadline_cancels_inflight_and_later_commands(runner):
+    runner.set_deadline(0.3)
+    assert 0 < runner.remaining() <= 0.3
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run(['sh', '-c', 'sleep 5'], timeout=30)
+    assert time.monotonic() - start < 2
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run(['echo', 'late'])
+    assert runner.remaining() == 0
+    assert runner.cancelled == 2
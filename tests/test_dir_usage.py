@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+import find_electron_apps as fea
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """两层目录，包含一个硬链接和一个符号链接"""
+    root = tmp_path / 'app'
+    for index in range(12):
+        sub = root / f'dir{index}' / 'nested'
+        sub.mkdir(parents=True)
+        (sub / 'file.bin').write_bytes(b'x' * 1000)
+    (root / 'top.bin').write_bytes(b'y' * 5000)
+    os.link(root / 'top.bin', root / 'dir0' / 'hardlink.bin')
+    os.symlink(root / 'top.bin', root / 'dir1' / 'symlink.bin')
+    os.symlink(root / 'dir2', root / 'dir3' / 'symlinked_dir')
+    return root
+
+
+@pytest.mark.parametrize('parallel', [True, False])
+def test_hardlinks_counted_once_and_symlinks_skipped(tree, parallel):
+    usage = fea.get_dir_usage(str(tree), parallel=parallel)
+    assert usage['apparent_bytes'] == 12 * 1000 + 5000
+    assert usage['files'] == 13
+    assert usage['dirs'] == 24
+
+
+def test_allocated_size_counts_blocks(tree):
+    sparse = tree / 'sparse.bin'
+    with open(sparse, 'wb') as f:
+        f.seek(10 * 1024 * 1024)
+        f.write(b'z')
+    usage = fea.get_dir_usage(str(tree))
+    assert usage['apparent_bytes'] == 12 * 1000 + 5000 + 10 * 1024 * 1024 + 1
+    if fea.HAS_ST_BLOCKS:
+        # 稀疏文件的表观大小远大于实际占用的磁盘块
+        assert usage['allocated_bytes'] < usage['apparent_bytes']
+    else:
+        assert usage['allocated_bytes'] == usage['apparent_bytes']
+
+
+def test_single_file(tmp_path):
+    path = tmp_path / 'file.bin'
+    path.write_bytes(b'x' * 100)
+    usage = fea.get_dir_usage(str(path))
+    assert (usage['apparent_bytes'], usage['files'], usage['dirs']) == (100, 1, 0)
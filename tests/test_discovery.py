@@ -0,0 +1,73 @@
+import os
+
+import find_electron_apps as fea
+
+
+def make_tree(root, paths):
+    for path in paths:
+        full = os.path.join(root, path)
+        if path.endswith('/'):
+            os.makedirs(full, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            open(full, 'wb').close()
+
+
+def test_windows_candidates_need_an_executable(tmp_path):
+    make_tree(str(tmp_path), [
+        'Programs/Real/Real.exe', 'Programs/Real/resources/', 'Programs/Real/locales/',
+        'Programs/NoExe/resources/',
+        'Programs/Single.exe', 'Programs/Single/resources/',
+        'Programs/plain.exe',
+    ])
+    candidates = list(fea.walk_windows_candidates(str(tmp_path)))
+    assert candidates == [str(tmp_path / 'Programs' / 'Real'), str(tmp_path / 'Programs' / 'Single.exe')]
+
+
+
+def make_linux_app(tmp_path):
+    """opt/Foo 安装目录和指向其主程序的 .desktop 启动器"""
+    make_tree(str(tmp_path), ['opt/Foo/Foo', 'opt/Foo/resources/app.asar', 'opt/Foo/chrome_100_percent.pak'])
+    applications = tmp_path / 'applications'
+    applications.mkdir()
+    (applications / 'foo.desktop').write_text(
+        f'[Desktop Entry]\nName=Foo App\nExec={tmp_path}/opt/Foo/Foo %U\n', encoding='utf-8')
+    return str(applications), os.path.realpath(str(tmp_path / 'opt' / 'Foo'))
+
+
+def test_linux_fingerprint_changes_on_in_place_upgrade(tmp_path, monkeypatch):
+    monkeypatch.setattr(fea, 'IS_WINDOWS', False)
+    monkeypatch.setattr(fea, 'IS_LINUX', True)
+    monkeypatch.setattr(fea, 'linux_app_launchers', {})
+    applications, install_dir = make_linux_app(tmp_path)
+    assert fea.discover_linux_apps(applications) == [install_dir]
+
+    before = fea.bundle_fingerprint(install_dir)
+    assert None not in before
+    asar = os.path.join(install_dir, 'resources', 'app.asar')
+    os.utime(asar, ns=(0, os.stat(asar).st_mtime_ns + 10 ** 9))
+    assert fea.bundle_fingerprint(install_dir) != before
+
+    before = fea.bundle_fingerprint(install_dir)
+    desktop = os.path.join(applications, 'foo.desktop')
+    os.utime(desktop, ns=(0, os.stat(desktop).st_mtime_ns + 10 ** 9))
+    assert fea.bundle_fingerprint(install_dir) != before
+
+
+def test_resolve_install_dir(tmp_path):
+    make_tree(str(tmp_path), ['opt/Foo/bin/foo', 'opt/Bar/bar'])
+    assert fea.resolve_install_dir(str(tmp_path / 'opt' / 'Foo' / 'bin' / 'foo')) == str(tmp_path / 'opt' / 'Foo')
+    assert fea.resolve_install_dir(str(tmp_path / 'opt' / 'Bar' / 'bar')) == str(tmp_path / 'opt' / 'Bar')
+    assert fea.resolve_install_dir(str(tmp_path / 'missing')) is None
+
+
+def test_resolve_install_dir_rejects_shared_prefixes(tmp_path, monkeypatch):
+    home = tmp_path / 'home'
+    make_tree(str(home), ['bin/wrapper', '.local/bin/wrapper'])
+    monkeypatch.setenv('HOME', str(home))
+    assert fea.resolve_install_dir(str(home / 'bin' / 'wrapper')) is None
+    assert fea.resolve_install_dir(str(home / '.local' / 'bin' / 'wrapper')) is None
+
+    monkeypatch.setattr(fea.os.path, 'realpath', lambda path: '/usr/bin/wrapper' if 'wrapper' in path else path)
+    monkeypatch.setattr(fea.os.path, 'isfile', lambda path: True)
+    assert fea.resolve_install_dir('/usr/bin/wrapper') is None
@@ -0,0 +1,109 @@
+import json
+import os
+
+import pytest
+
+import find_electron_apps as fea
+
+
+def read_ndjson(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize('fmt', ['ndjson', 'json'])
+def test_finalize_replaces_target(tmp_path, fmt):
+    path = str(tmp_path / f'out.{fmt}')
+    with fea.ExportSink(path, fmt) as sink:
+        sink.write({'name': 'A'})
+        sink.write({'name': 'B'})
+    records = read_ndjson(path) if fmt == 'ndjson' else json.load(open(path, encoding='utf-8'))
+    assert records == [{'name': 'A'}, {'name': 'B'}]
+    assert os.listdir(tmp_path) == [f'out.{fmt}']
+
+
+def test_empty_json_export_is_valid(tmp_path):
+    path = str(tmp_path / 'out.json')
+    fea.ExportSink(path, 'json').finalize()
+    assert json.load(open(path, encoding='utf-8')) == []
+
+
+def test_error_keeps_previous_export_and_temp_file(tmp_path):
+    path = str(tmp_path / 'out.ndjson')
+    with fea.ExportSink(path) as sink:
+        sink.write({'name': 'old'})
+
+    with pytest.raises(RuntimeError):
+        with fea.ExportSink(path) as sink:
+            sink.write({'name': 'new'})
+            raise RuntimeError('scan failed')
+    assert read_ndjson(path) == [{'name': 'old'}]
+    assert read_ndjson(sink.tmp_path) == [{'name': 'new'}]
+
+
+def test_interrupt_writes_partial_export(tmp_path):
+    path = str(tmp_path / 'out.json')
+    with fea.ExportSink(path, 'json') as sink:
+        sink.write({'name': 'old'})
+
+    with pytest.raises(KeyboardInterrupt):
+        with fea.ExportSink(path, 'json') as sink:
+            sink.write({'name': 'new'})
+            raise KeyboardInterrupt
+    assert json.load(open(path, encoding='utf-8')) == [{'name': 'old'}]
+    assert json.load(open(sink.partial_path, encoding='utf-8')) == [{'name': 'new'}]
+
+    # 下一次完整导出后不再保留部分结果
+    with fea.ExportSink(path, 'json') as sink:
+        sink.write({'name': 'newer'})
+    assert not os.path.exists(sink.partial_path)
+
+
+def test_discard_removes_temp_file(tmp_path):
+    path = str(tmp_path / 'out.ndjson')
+    sink = fea.ExportSink(path)
+    sink.write({'name': 'A'})
+    sink.discard()
+    assert os.listdir(tmp_path) == []
+
+
+def test_rewrite_replaces_scan_partial(tmp_path):
+    path = str(tmp_path / 'out.ndjson')
+    scan = fea.ExportSink(path)
+    scan.write({'name': 'A'})
+    scan.finalize(partial=True)
+
+    sinks = fea.rewrite_export_sinks([{'name': 'A', 'memory': 1}], ndjson_file=path)
+    assert read_ndjson(path) == [{'name': 'A', 'memory': 1}]
+    assert os.listdir(tmp_path) == ['out.ndjson']
+    assert sinks[0].finalized
+
+
+def test_interrupted_rewrite_keeps_scan_partial(tmp_path):
+    path = str(tmp_path / 'out.ndjson')
+    scan = fea.ExportSink(path)
+    scan.write({'name': 'A'})
+    scan.write({'name': 'B'})
+    scan.finalize(partial=True)
+
+    def results():
+        yield {'name': 'A', 'memory': 1}
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        fea.rewrite_export_sinks(results(), ndjson_file=path)
+    assert os.listdir(tmp_path) == ['out.ndjson.partial']
+    assert read_ndjson(scan.partial_path) == [{'name': 'A'}, {'name': 'B'}]
+
+
+def test_sort_index_points_at_records(tmp_path):
+    path = str(tmp_path / 'out.ndjson')
+    key, reverse = fea.result_sort_key('size', False, False)
+    with fea.ExportSink(path, index_key=key, index_reverse=reverse) as sink:
+        for name, size in (('A', 1.0), ('B', 3.0), ('C', 2.0)):
+            sink.write({'name': name, 'size': size})
+
+    index = json.load(open(sink.index_path, encoding='utf-8'))
+    data = open(path, 'rb').read()
+    names = [json.loads(data[offset:offset + length])['name'] for _, offset, length in index['entries']]
+    assert names == ['B', 'C', 'A']
@@ -0,0 +1,36 @@
+import pytest
+
+import find_electron_apps as fea
+
+MARKERS = (b'electron.asar', b'Electron Framework')
+
+
+def write(tmp_path, data):
+    path = tmp_path / 'binary'
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize('split', range(1, len(b'electron.asar')))
+def test_marker_straddling_a_chunk_boundary(tmp_path, split):
+    chunk_size = 64
+    data = b'\0' * (chunk_size - split) + b'electron.asar' + b'\0' * 100
+    assert fea.find_markers_in_file(write(tmp_path, data), MARKERS, chunk_size=chunk_size) == b'electron.asar'
+
+
+def test_first_marker_found_is_returned(tmp_path):
+    data = b'\0' * 200 + b'Electron Framework' + b'\0' * 10 + b'electron.asar'
+    assert fea.find_markers_in_file(write(tmp_path, data), MARKERS, chunk_size=32) == b'Electron Framework'
+
+
+def test_byte_budget_stops_reading(tmp_path):
+    data = b'\0' * 1000 + b'electron.asar'
+    path = write(tmp_path, data)
+    assert fea.find_markers_in_file(path, MARKERS, byte_budget=1000, chunk_size=64) is None
+    assert fea.find_markers_in_file(path, MARKERS, byte_budget=1013, chunk_size=64) == b'electron.asar'
+    assert fea.find_markers_in_file(path, MARKERS, chunk_size=64) == b'electron.asar'
+
+
+def test_no_marker(tmp_path):
+    assert fea.find_markers_in_file(write(tmp_path, b'\0' * 500), MARKERS, chunk_size=64) is None
+    assert fea.find_markers_in_file(write(tmp_path, b''), MARKERS) is None
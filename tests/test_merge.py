@@ -0,0 +1,88 @@
+import json
+import os
+
+import find_electron_apps as fea
+
+
+def write_export(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+
+
+def slack(memory, version='1'):
+    return {'name': 'Slack', 'version': version, 'size': 100.0, 'running': True, 'memory_mb': memory}
+
+
+def merge(db_path, paths):
+    merger = fea.FleetMerger(str(db_path))
+    for path in paths:
+        merger.add_file(str(path))
+    merger.commit()
+    return merger
+
+
+def test_duplicates_within_a_host_are_merged(tmp_path):
+    write_export(tmp_path / 'h1.json', [slack(100), dict(slack(120), name='slack')])
+    write_export(tmp_path / 'h2.json', [slack(200)])
+    merger = merge(tmp_path / 'work.sqlite', [tmp_path / 'h1.json', tmp_path / 'h2.json'])
+
+    [aggregate] = merger.aggregates()
+    assert aggregate['install_count'] == 2
+    assert aggregate['records'] == 2
+    assert merger.duplicates == 1
+    assert {record['host_id'] for record in merger.iter_records()} == {'h1', 'h2'}
+    merger.close()
+
+
+def test_memory_percentiles_use_nearest_rank(tmp_path):
+    paths = []
+    for host in range(1, 21):
+        path = tmp_path / f'h{host}.json'
+        write_export(path, [slack(host * 10.0)])
+        paths.append(path)
+    write_export(tmp_path / 'idle.json', [dict(slack(0), running=False)])
+    merger = merge(tmp_path / 'work.sqlite', paths + [tmp_path / 'idle.json'])
+
+    [aggregate] = merger.aggregates()
+    assert aggregate['install_count'] == 21
+    assert aggregate['memory_samples'] == 20
+    assert aggregate['memory_p50_mb'] == 100.0
+    assert aggregate['memory_p95_mb'] == 190.0
+    merger.close()
+
+
+def test_changed_file_replaces_its_records(tmp_path):
+    db_path = tmp_path / 'work.sqlite'
+    h1 = tmp_path / 'h1.json'
+    write_export(h1, [slack(100)])
+    merge(db_path, [h1]).close()
+
+    write_export(h1, [dict(slack(300, version='2'), size=300.0)])
+    os.utime(h1, (os.path.getmtime(h1) + 10,) * 2)
+    merger = merge(db_path, [h1])
+    [aggregate] = merger.aggregates()
+    assert aggregate['versions'] == {'2': 1}
+    assert aggregate['memory_p50_mb'] == 300.0
+    assert aggregate['size'] == 300.0
+    merger.close()
+
+
+def test_unchanged_file_is_skipped(tmp_path):
+    db_path = tmp_path / 'work.sqlite'
+    write_export(tmp_path / 'h1.json', [slack(100)])
+    merge(db_path, [tmp_path / 'h1.json']).close()
+    merger = merge(db_path, [tmp_path / 'h1.json'])
+    assert (merger.skipped, merger.files) == (1, 0)
+    merger.close()
+
+
+def test_malformed_records_do_not_abort_the_merge(tmp_path):
+    write_export(tmp_path / 'odd.json', [{'name': 5, 'size': {'mb': 1}}, {'name': {'x': 1}, 'path': None}])
+    (tmp_path / 'broken.json').write_text('[{"name": "Slack"', encoding='utf-8')
+    write_export(tmp_path / 'h1.json', [slack(100)])
+    merger = merge(tmp_path / 'work.sqlite', [tmp_path / 'odd.json', tmp_path / 'broken.json', tmp_path / 'h1.json'])
+
+    assert merger.errors == 1
+    assert sorted(aggregate['app'] for aggregate in merger.aggregates()) == ['5', 'slack', '{"x": 1}']
+    assert {record['host_id'] for record in merger.iter_records()} == {'odd', 'h1'}
+    merger.close()
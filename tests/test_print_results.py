@@ -0,0 +1,13 @@
+import find_electron_apps as fea
+
+
+def test_summary_with_idle_running_apps(capsys):
+    results = [{
+        'name': 'Foo', 'path': '/opt/Foo', 'version': '1.0', 'electron_version': '30.0.0', 'size': 100.0,
+        'running': True, 'memory_mb': 0, 'has_performance_data': True, 'cpu_percent': 0.0, 'num_threads': 4, 'energy_impact': 'N/A',
+        'process_count': 1,
+    }]
+    fea.print_results(results, 'name', show_memory=True, show_performance=True)
+    output = capsys.readouterr().out
+    assert '最小 CPU 使用率: 0.0%' in output
+    assert '内存使用统计' in output
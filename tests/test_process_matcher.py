@@ -0,0 +1,56 @@
+import find_electron_apps as fea
+
+
+def proc(exe, command, name):
+    return {'exe': exe, 'command': command, 'name': name}
+
+
+def test_name_must_be_a_whole_word():
+    matcher = fea.AppProcessMatcher(['/usr/share/code'])
+    xcode = '/Applications/Xcode.app/Contents/MacOS/Xcode'
+    assert matcher.match(proc(xcode, xcode, 'Xcode')) == (None, None)
+
+
+def test_exe_under_install_dir_matches_by_path():
+    matcher = fea.AppProcessMatcher(['/usr/share/code', '/opt/Slack'])
+    path_app, _ = matcher.match(proc('/usr/share/code/code', '/usr/share/code/code --type=renderer', 'code'))
+    assert path_app == '/usr/share/code'
+
+
+def test_path_match_respects_directory_boundaries():
+    matcher = fea.AppProcessMatcher(['/opt/Slack'])
+    path_app, _ = matcher.match(proc('/opt/Slack2/slack', '/opt/Slack2/slack', 'slack2'))
+    assert path_app is None
+
+
+def test_longest_path_wins():
+    matcher = fea.AppProcessMatcher(['/opt/apps', '/opt/apps/Foo'])
+    path_app, _ = matcher.match(proc('/opt/apps/Foo/foo', '/opt/apps/Foo/foo', 'foo'))
+    assert path_app == '/opt/apps/Foo'
+
+
+def test_command_line_paths_only_count_for_electron_runtimes():
+    matcher = fea.AppProcessMatcher(['/opt/Foo'])
+    path_app, _ = matcher.match(proc('/usr/bin/vim', 'vim /opt/Foo/resources/app.asar', 'vim'))
+    assert path_app is None
+    path_app, _ = matcher.match(proc('/usr/lib/electron/electron', 'electron /opt/Foo/resources/app.asar', 'electron'))
+    assert path_app == '/opt/Foo'
+
+
+def test_name_matches_process_name_or_argv0_only():
+    matcher = fea.AppProcessMatcher(['/usr/share/code'])
+    for command, name in [
+        ('vim /home/user/code/x', 'vim'),
+        ('python3 code.py', 'python3'),
+        ('/usr/bin/vscode-x --flag', 'vscode-x'),
+        ('bash -c cd ~/code && ./find_electron_apps.py', 'bash'),
+    ]:
+        assert matcher.match(proc('', command, name)) == (None, None), command
+    assert matcher.match(proc('', '/usr/bin/code --new-window', 'code')) == (None, '/usr/share/code')
+
+
+def test_name_matches_helper_process_by_leading_words():
+    matcher = fea.AppProcessMatcher(['/Applications/Slack.app'])
+    helper = '/Volumes/Other/Slack.app/Contents/Frameworks/Slack Helper (Renderer).app/Contents/MacOS/Slack Helper (Renderer)'
+    assert matcher.match(proc('', helper + ' --type=renderer', 'Slack Helper (Renderer)')) == (None, '/Applications/Slack.app')
+    assert matcher.match(proc('', '/usr/bin/slacker', 'slacker')) == (None, None)
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+
+import find_electron_apps as fea
+
+PAGE_SIZE = 4096
+CLK_TCK = 100
+
+
+def stat_line(pid, comm, ppid, utime, stime, threads):
+    """按 /proc/[pid]/stat 的字段顺序构造一行（comm 之后从 state 开始）"""
+    fields = ['S', ppid, pid, pid, 0, -1, 4194560, 0, 0, 0, 0, utime, stime, 0, 0, 20, 0, threads, 0, 12345]
+    return f"{pid} ({comm}) " + ' '.join(str(field) for field in fields) + '\n'
+
+
+def add_process(root, pid, comm, ppid=1, utime=150, stime=50, threads=3, resident=256, cmdline=None, exe=None,
+                smaps=None):
+    directory = root / str(pid)
+    directory.mkdir()
+    (directory / 'stat').write_text(stat_line(pid, comm, ppid, utime, stime, threads), encoding='utf-8')
+    (directory / 'statm').write_text(f'10000 {resident} 100 10 0 500 0\n', encoding='utf-8')
+    (directory / 'cmdline').write_bytes(cmdline if cmdline is not None else comm.encode() + b'\0')
+    if exe is not None:
+        os.symlink(exe, directory / 'exe')
+    if smaps is not None:
+        (directory / 'smaps_rollup').write_text(smaps, encoding='utf-8')
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    root = tmp_path / 'proc'
+    root.mkdir()
+    (root / 'self').mkdir()
+    (root / 'meminfo').write_text('MemTotal: 1 kB\n', encoding='utf-8')
+    return root
+
+
+def collector(root, proportional=False):
+    return fea.ProcFSCollector(str(root), clk_tck=CLK_TCK, page_size=PAGE_SIZE, proportional=proportional)
+
+
+def test_read_process(proc_root):
+    add_process(proc_root, 42, 'code', ppid=7, resident=300,
+                cmdline=b'/usr/share/code/code\0--type=renderer\0--lang=en\0', exe='/usr/share/code/code')
+    record = collector(proc_root).read_process(42)
+    assert record == {
+        'pid': 42, 'ppid': 7, 'name': 'code', 'exe': '/usr/share/code/code',
+        'command': '/usr/share/code/code --type=renderer --lang=en',
+        'rss': 300 * PAGE_SIZE, 'pss': None, 'uss': None, 'num_threads': 3, 'cpu_time': 2.0,
+    }
+
+
+@pytest.mark.parametrize('comm', ['Web Content', 'a) (b', 'x)', '(sd-pam)'])
+def test_stat_with_spaces_and_parentheses_in_comm(proc_root, comm):
+    add_process(proc_root, 10, comm, ppid=5, utime=30, stime=20, threads=9)
+    record = collector(proc_root).read_process(10)
+    assert (record['name'], record['ppid'], record['cpu_time'], record['num_threads']) == (comm, 5, 0.5, 9)
+
+
+def test_kernel_thread_without_cmdline(proc_root):
+    add_process(proc_root, 2, 'kthreadd', ppid=0, cmdline=b'')
+    record = collector(proc_root).read_process(2)
+    assert record['command'] == '[kthreadd]'
+    assert record['exe'] == ''
+
+
+def test_vanished_process(proc_root):
+    add_process(proc_root, 50, 'gone')
+    os.remove(proc_root / '50' / 'statm')
+    proc = collector(proc_root)
+    assert proc.read_process(50) is None
+    assert proc.read_process(51) is None
+    assert proc.read_usage(51) is None
+
+
+def test_collect_lists_only_numeric_entries(proc_root):
+    add_process(proc_root, 1, 'init', ppid=0)
+    add_process(proc_root, 300, 'bash')
+    proc = collector(proc_root)
+    assert sorted(proc.pids()) == [1, 300]
+    assert sorted(record['name'] for record in proc.collect()) == ['bash', 'init']
+
+
+def test_read_usage(proc_root):
+    add_process(proc_root, 42, 'code', utime=400, stime=100, resident=10)
+    assert collector(proc_root).read_usage(42) == (10 * PAGE_SIZE, 5.0)
+
+
+SMAPS_ROLLUP = """00400000-7ffc5a3f2000 ---p 00000000 00:00 0                          [rollup]
+Rss:                2048 kB
+Pss:                1500 kB
+Pss_Anon:            900 kB
+Pss_File:            600 kB
+Shared_Clean:        512 kB
+Shared_Dirty:          0 kB
+Private_Clean:       256 kB
+Private_Dirty:       768 kB
+Swap:                  0 kB
+"""
+
+
+def test_read_smaps_rollup(proc_root):
+    add_process(proc_root, 42, 'code', smaps=SMAPS_ROLLUP)
+    add_process(proc_root, 2, 'kthreadd', smaps='')
+    add_process(proc_root, 43, 'old-kernel')
+    proc = collector(proc_root, proportional=True)
+    assert proc.read_smaps_rollup(42) == (1500 * 1024, 1024 * 1024)
+    assert proc.read_smaps_rollup(2) is None
+    assert proc.read_smaps_rollup(43) is None
+
+
+def test_proportional_collection(proc_root):
+    add_process(proc_root, 42, 'code', resident=300, smaps=SMAPS_ROLLUP)
+    add_process(proc_root, 43, 'old-kernel', resident=10)
+    proc = collector(proc_root, proportional=True)
+    record = proc.read_process(42)
+    assert (record['rss'], record['pss'], record['uss']) == (300 * PAGE_SIZE, 1500 * 1024, 1024 * 1024)
+    assert proc.read_process(43)['pss'] is None
+    # 读取 PSS 失败时内存退回 RSS
+    assert proc.read_usage(42)[0] == 1500 * 1024
+    assert proc.read_usage(43)[0] == 10 * PAGE_SIZE
@@ -0,0 +1,91 @@
+import json
+import os
+
+import find_electron_apps as fea
+
+
+def make_app(root, name):
+    """在 root 下创建一个最小的 macOS 应用包布局"""
+    app = root / f'{name}.app'
+    (app / 'Contents' / 'MacOS').mkdir(parents=True)
+    (app / 'Contents' / 'Resources').mkdir()
+    (app / 'Contents' / 'Info.plist').write_bytes(b'<plist/>')
+    (app / 'Contents' / 'Resources' / 'app.asar').write_bytes(b'asar')
+    (app / 'Contents' / 'MacOS' / name).write_bytes(b'bin')
+    return str(app)
+
+
+def test_lookup_hits_only_with_the_same_fingerprint(tmp_path):
+    app = make_app(tmp_path, 'Foo')
+    fingerprint = fea.bundle_fingerprint(app)
+    cache = fea.ScanCache(str(tmp_path / 'cache.json'))
+    assert cache.lookup(app, fingerprint) is None
+    cache.store(app, fingerprint, True, {'path': app, 'version': '1.0'})
+    cache.save()
+
+    reloaded = fea.ScanCache(str(tmp_path / 'cache.json'))
+    assert reloaded.lookup(app, fingerprint)['info']['version'] == '1.0'
+    assert reloaded.lookup(app, fingerprint[:-1] + [0]) is None
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+
+def test_fingerprint_changes_when_a_key_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(fea, 'IS_WINDOWS', False)
+    monkeypatch.setattr(fea, 'IS_LINUX', False)
+    app = make_app(tmp_path, 'Foo')
+    before = fea.bundle_fingerprint(app)
+    asar = os.path.join(app, 'Contents', 'Resources', 'app.asar')
+    os.utime(asar, ns=(0, os.stat(asar).st_mtime_ns + 10 ** 9))
+    assert fea.bundle_fingerprint(app) != before
+    assert fea.bundle_fingerprint(str(tmp_path / 'missing.app')) is None
+
+
+def test_evict_stale_only_touches_scanned_directories(tmp_path):
+    scanned = tmp_path / 'scanned'
+    other = tmp_path / 'other'
+    scanned.mkdir()
+    other.mkdir()
+    cache = fea.ScanCache(str(tmp_path / 'cache.json'))
+    for path in (scanned / 'Kept.app', scanned / 'Removed.app', other / 'Elsewhere.app'):
+        cache.store(str(path), [1, 2], False)
+
+    rescanned = fea.ScanCache(str(tmp_path / 'cache.json'))
+    rescanned._entries = dict(cache._entries)
+    rescanned.lookup(str(scanned / 'Kept.app'), [1, 2])
+    rescanned.evict_stale([str(scanned)])
+    assert rescanned.evicted == 1
+    assert sorted(os.path.basename(key) for key in rescanned._entries) == ['Elsewhere.app', 'Kept.app']
+
+
+def test_save_replaces_the_file_atomically(tmp_path):
+    path = tmp_path / 'cache' / 'scan.json'
+    cache = fea.ScanCache(str(path))
+    cache.store(str(tmp_path / 'Foo.app'), [1, 2], False)
+    cache.save()
+    assert os.listdir(path.parent) == ['scan.json']
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['version'] == fea.ScanCache.FORMAT_VERSION
+    assert len(data['entries']) == 1
+
+
+def test_old_format_version_is_ignored(tmp_path):
+    path = tmp_path / 'cache.json'
+    path.write_text(json.dumps({'version': fea.ScanCache.FORMAT_VERSION - 1,
+                                'entries': {'/Applications/Foo.app': {'fingerprint': [1], 'is_electron': True}}}),
+                    encoding='utf-8')
+    assert len(fea.ScanCache(str(path))) == 0
+    path.write_text('not json', encoding='utf-8')
+    assert len(fea.ScanCache(str(path))) == 0
+
+
+def test_evict_stale_without_directories_drops_every_unseen_entry(tmp_path):
+    cache = fea.ScanCache(str(tmp_path / 'cache.json'))
+    for path in ('/opt/Kept', '/usr/share/removed', '/opt/Removed'):
+        cache.store(path, [1, 2], True)
+
+    rescanned = fea.ScanCache(str(tmp_path / 'cache.json'))
+    rescanned._entries = dict(cache._entries)
+    rescanned.lookup('/opt/Kept', [1, 2])
+    rescanned.evict_stale()
+    assert list(rescanned._entries) == [os.path.realpath('/opt/Kept')]
+    assert rescanned.evicted == 2
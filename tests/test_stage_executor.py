@@ -0,0 +1,37 @@
+import pytest
+
+import find_electron_apps as fea
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    (tmp_path / 'resources').mkdir()
+    (tmp_path / 'resources' / 'app.asar').write_bytes(b'x' * 2048)
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize('mode, sized_in_main', [('thread', True), ('hybrid', True), ('process', False)])
+def test_sizing_runs_in_the_main_process_except_in_process_mode(app_dir, monkeypatch, mode, sized_in_main):
+    sized = []
+
+    def get_bundle_size(app_path, timings=None):
+        sized.append(app_path)
+        timings['sizing'] = 0.0
+        return {'size': 1.0, 'allocated_size': 2.0}
+
+    monkeypatch.setattr(fea, 'get_bundle_size', get_bundle_size)
+    stages = fea.StageExecutor(mode, max_workers=1)
+    try:
+        timings = {}
+        bundle_info = stages.bundle_info(app_dir, timings)
+    finally:
+        stages.shutdown()
+
+    assert bundle_info['path'] == app_dir
+    assert set(timings) == {'version', 'sizing'}
+    if sized_in_main:
+        assert sized == [app_dir]
+        assert (bundle_info['size'], bundle_info['allocated_size']) == (1.0, 2.0)
+    else:
+        assert sized == []
+        assert bundle_info['size'] == 2048 / (1024 * 1024)
@@ -0,0 +1,56 @@
+import os
+import time
+
+import find_electron_apps as fea
+
+
+def fill(store, seconds, apps=('a', 'b'), start=None):
+    start = time.time() - seconds if start is None else start
+    for offset in range(seconds):
+        for app in apps:
+            store.append(app, start + offset, 1000 + offset, 1.5, 3)
+    return start
+
+
+def test_raw_retention_in_memory():
+    store = fea.TimeSeriesStore(raw_retention=60)
+    fill(store, 3600, start=600000.0)
+    timestamps = store.raw('a')['timestamp']
+    assert timestamps[-1] - timestamps[0] <= 60 * 1.1
+    assert len(store.rollups('a', '1m')['start']) == 59
+
+
+def test_rollup_bucket_statistics():
+    store = fea.TimeSeriesStore()
+    for offset, memory in enumerate((100, 300, 200)):
+        store.append('a', 60.0 + offset, memory, float(offset), 1)
+    store.append('a', 120.0, 50, 0.0, 1)
+    rollups = store.rollups('a', '1m')
+    assert list(rollups['start']) == [60.0]
+    assert (rollups['memory_min'][0], rollups['memory_max'][0], rollups['memory_last'][0]) == (100, 300, 200)
+    assert rollups['memory_avg'][0] == 200
+    assert rollups['count'][0] == 3
+
+
+def test_raw_file_is_compacted_while_running(tmp_path):
+    store = fea.TimeSeriesStore(str(tmp_path), raw_retention=60, flush_interval=0)
+    fill(store, 20000)
+    store.flush()
+    raw_size = os.path.getsize(tmp_path / 'raw.tsdb')
+    # 文件大小与保留期而不是运行时长成正比
+    limit = fea.TS_HEADER.size + fea.TS_RAW_RECORD.size * max(fea.TS_COMPACT_MIN_RECORDS, 2 * 70 * fea.TS_COMPACT_RATIO)
+    assert raw_size <= limit
+    store.close()
+
+
+def test_reopen_loads_retained_samples(tmp_path):
+    store = fea.TimeSeriesStore(str(tmp_path), raw_retention=60)
+    start = fill(store, 600)
+    store.close()
+
+    reopened = fea.TimeSeriesStore(str(tmp_path), raw_retention=60)
+    timestamps = reopened.raw('b')['timestamp']
+    assert timestamps[-1] == start + 599
+    assert timestamps[0] >= time.time() - 60
+    assert len(reopened.rollups('b', '1m')['start']) >= 9
+    reopened.close()
@@ -43,6 +43,7 @@ import webbrowser
 import threading
 import time
 from flask import Flask, render_template, request, jsonify
+from api.columnar import is_columnar_file, load_columnar
 
 # 检查必要的依赖包
 try:
@@ -67,6 +68,9 @@ def load_data(json_file=None):
             json_file = 'electron_apps.json'
     
     try:
+        # 列式导出文件按文件头的魔数识别，与 JSON 文件使用同一个参数
+        if is_columnar_file(json_file):
+            return load_columnar(json_file)
         with open(json_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
         return data
@@ -76,6 +80,9 @@ def load_data(json_file=None):
     except json.JSONDecodeError:
         print(f"错误：JSON格式不正确 {json_file}")
         return []
+    except ValueError as e:
+        print(f"错误：无法读取列式文件 {json_file}: {str(e)}")
+        return []
 
 # 创建HTML模板目录
 os.makedirs('templates', exist_ok=True)
@@ -120,6 +127,11 @@ def memory_chart():
         'avg_memory': running_apps['memory_mb'].mean(),
     }
     
+    # 使用 --pss 导出的数据同时提供 PSS 和 USS（未采集到的应用为 null）
+    for column, key in (('memory_pss_mb', 'pss_usage'), ('memory_uss_mb', 'uss_usage')):
+        if column in running_apps and running_apps[column].notna().any():
+            chart_data[key] = [None if pd.isna(value) else value for value in running_apps[column]]
+    
     return jsonify(chart_data)
 
 # API路由 - 获取CPU使用图表数据
@@ -425,17 +437,44 @@ def create_templates():
                             return;
                         }
                         
-                        const trace = {
+                        const traces = [{
                             x: data.app_names,
                             y: data.memory_usage,
+                            name: 'RSS',
                             type: 'bar',
                             marker: {
                                 color: 'rgba(54, 162, 235, 0.8)'
                             }
-                        };
+                        }];
+                        
+                        // 导出数据包含 PSS/USS 时与 RSS 分组显示
+                        if (data.pss_usage) {
+                            traces.push({
+                                x: data.app_names,
+                                y: data.pss_usage,
+                                name: 'PSS',
+                                type: 'bar',
+                                marker: {
+                                    color: 'rgba(75, 192, 192, 0.8)'
+                                }
+                            });
+                        }
+                        if (data.uss_usage) {
+                            traces.push({
+                                x: data.app_names,
+                                y: data.uss_usage,
+                                name: 'USS',
+                                type: 'bar',
+                                marker: {
+                                    color: 'rgba(153, 102, 255, 0.8)'
+                                }
+                            });
+                        }
                         
                         const layout = {
                             margin: { t: 10, l: 70, r: 10, b: 120 },
+                            barmode: 'group',
+                            showlegend: traces.length > 1,
                             xaxis: {
                                 tickangle: -45
                             },
@@ -444,7 +483,7 @@ def create_templates():
                             }
                         };
                         
-                        Plotly.newPlot('memoryChart', [trace], layout);
+                        Plotly.newPlot('memoryChart', traces, layout);
                     } catch (error) {
                         console.error('Error loading memory chart:', error);
                         this.memoryError = '加载内存使用图表时出错';
@@ -605,7 +644,7 @@ def parse_arguments():
     parser = argparse.ArgumentParser(description='可视化展示Electron应用程序资源使用情况')
     
     parser.add_argument('--json-file', default='electron_apps.json',
-                      help='指定JSON数据文件路径 (默认: electron_apps.json)')
+                      help='指定JSON数据文件路径，也可以是 --columnar-file 导出的列式文件 (默认: electron_apps.json)')
     parser.add_argument('--port', type=int, default=8080,
                       help='指定Web服务器端口 (默认: 8080)')
     parser.add_argument('--host', default='127.0.0.1',